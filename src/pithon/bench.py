@@ -0,0 +1,229 @@
+"""
+Banc d'essai de l'interpréteur : `pithon bench`.
+
+Les programmes de référence se trouvent dans le dossier `workloads` du paquet.
+Chaque programme est exécuté de bout en bout (analyse, optimisation,
+résolution, évaluation) quelques fois pour réchauffer, puis mesuré :
+- le temps réel de chaque répétition (min, médiane, moyenne, écart type);
+- la mémoire maximale allouée (tracemalloc), lors d'une exécution séparée;
+- le nombre d'allocations de valeurs et de cadres de l'interpréteur, lors
+  d'une autre exécution séparée pour ne pas fausser les temps.
+
+Le rapport est produit en JSON. Le mode `compare` compare deux rapports et
+signale les régressions au-delà d'un seuil relatif (10 % par défaut); la
+sortie des programmes est aussi comparée.
+
+    pithon bench [--vm] [--warmup N] [--repeat N] [--output FICHIER] [PROGRAMME ...]
+    pithon bench compare AVANT.json APRES.json [--threshold 0.1]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from pithon import __version__
+from pithon.evaluator.compiler import evaluate_compiled
+from pithon.evaluator.envframe import EnvFrame, SlotFrame
+from pithon.evaluator.envvalue import (
+    VNumber, VString, VRope, VList, VTuple, VDict, VSet, VRange, VListView, VTupleView, VStringView, VObject,
+    VFunctionClosure, VMethodClosure, VClassDef
+)
+from pithon.evaluator.evaluator import initial_env, Completion
+from pithon.optimizer import optimize
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.vm.machine import evaluate_vm, Frame
+
+WORKLOAD_DIR = Path(__file__).parent / "workloads"
+
+# Classes dont les créations sont comptées comme allocations.
+COUNTED_TYPES = (
+    VNumber, VString, VRope, VList, VTuple, VDict, VSet, VRange, VListView, VTupleView, VStringView, VObject,
+    VFunctionClosure, VMethodClosure, VClassDef,
+    EnvFrame, SlotFrame, Frame, Completion
+)
+
+# Seuil relatif de régression par défaut du mode compare.
+DEFAULT_THRESHOLD = 0.10
+
+
+def list_workloads() -> dict[str, Path]:
+    """Retourne les programmes de référence, par nom."""
+    return {path.stem: path for path in sorted(WORKLOAD_DIR.glob("*.py"))}
+
+def run_source(source: str, use_vm=False, dynamic_operators=False, optimized=True) -> str:
+    """Exécute un programme de bout en bout et retourne ce qu'il a affiché."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        tree = SimpleParser().parse(source)
+        if optimized:
+            tree = optimize(tree, dynamic_operators)
+        tree = resolve(tree, dynamic_operators)
+        evaluate = evaluate_vm if use_vm else evaluate_compiled
+        evaluate(tree, initial_env())
+    return output.getvalue()
+
+@contextlib.contextmanager
+def counting_allocations(counts: Counter):
+    """Compte, par type, les instances de COUNTED_TYPES créées dans le bloc."""
+    originals = {cls: cls.__dict__["__init__"] for cls in COUNTED_TYPES}
+
+    def counting(cls, init):
+        name = cls.__name__
+
+        def __init__(self, *args, **kwargs):
+            counts[name] += 1
+            init(self, *args, **kwargs)
+        return __init__
+
+    try:
+        for cls, init in originals.items():
+            cls.__init__ = counting(cls, init)
+        yield counts
+    finally:
+        for cls, init in originals.items():
+            cls.__init__ = init
+
+def measure(source: str, warmup=1, repeat=5, **options) -> dict:
+    """Mesure un programme; retourne les résultats sous forme de dictionnaire."""
+    for _ in range(warmup):
+        run_source(source, **options)
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        output = run_source(source, **options)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_source(source, **options)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    counts: Counter = Counter()
+    with counting_allocations(counts):
+        run_source(source, **options)
+
+    return {
+        "output": output,
+        "wall_time": {
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+            "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "runs": times,
+        },
+        "peak_memory": peak,
+        "allocations": sum(counts.values()),
+        "allocations_by_type": dict(sorted(counts.items())),
+    }
+
+def run_benchmarks(names=None, warmup=1, repeat=5, use_vm=False, dynamic_operators=False, optimized=True) -> dict:
+    """Mesure les programmes demandés (tous par défaut) et retourne le rapport."""
+    workloads = list_workloads()
+    names = names or list(workloads)
+    unknown = [name for name in names if name not in workloads]
+    if unknown:
+        raise ValueError(f"Programme(s) de référence inconnu(s) : {', '.join(unknown)}")
+    options = {"use_vm": use_vm, "dynamic_operators": dynamic_operators, "optimized": optimized}
+    results = {}
+    for name in names:
+        source = workloads[name].read_text(encoding="utf-8")
+        results[name] = measure(source, warmup, repeat, **options)
+    return {
+        "pithon_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "engine": "vm" if use_vm else "compiled",
+        "options": options,
+        "warmup": warmup,
+        "repeat": repeat,
+        "workloads": results,
+    }
+
+def compare_reports(before: dict, after: dict, threshold=DEFAULT_THRESHOLD) -> tuple[list[str], list[str]]:
+    """
+    Compare deux rapports. Retourne les lignes du tableau de comparaison et la
+    liste des régressions (temps médian, mémoire ou allocations en hausse de
+    plus de `threshold`, ou sortie différente).
+    """
+    lines = [f"{'programme':<18}{'temps':>10}{'mémoire':>10}{'allocations':>13}"]
+    regressions = []
+    old_results, new_results = before["workloads"], after["workloads"]
+    for name in sorted(set(old_results) | set(new_results)):
+        if name not in old_results or name not in new_results:
+            lines.append(f"{name:<18}absent de l'un des rapports")
+            continue
+        old, new = old_results[name], new_results[name]
+        ratios = {
+            "temps": _ratio(old["wall_time"]["median"], new["wall_time"]["median"]),
+            "mémoire": _ratio(old["peak_memory"], new["peak_memory"]),
+            "allocations": _ratio(old["allocations"], new["allocations"]),
+        }
+        lines.append(
+            f"{name:<18}{ratios['temps']:>9.2f}x{ratios['mémoire']:>9.2f}x{ratios['allocations']:>12.2f}x"
+        )
+        for metric, ratio in ratios.items():
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} : {metric} x{ratio:.2f}")
+        if old["output"] != new["output"]:
+            regressions.append(f"{name} : sortie différente")
+    return lines, regressions
+
+def _ratio(old: float, new: float) -> float:
+    if old == 0:
+        return 1.0 if new == 0 else float("inf")
+    return new / old
+
+def bench_main(args: list[str], use_vm=False, dynamic_operators=False, optimized=True) -> int:
+    """Point d'entrée de `pithon bench`; retourne le code de sortie."""
+    if args and args[0] == "compare":
+        parser = argparse.ArgumentParser(prog="pithon bench compare")
+        parser.add_argument("before")
+        parser.add_argument("after")
+        parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+        ns = parser.parse_args(args[1:])
+        with open(ns.before, encoding="utf-8") as f:
+            before = json.load(f)
+        with open(ns.after, encoding="utf-8") as f:
+            after = json.load(f)
+        lines, regressions = compare_reports(before, after, ns.threshold)
+        print("\n".join(lines))
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}")
+        return 1 if regressions else 0
+
+    parser = argparse.ArgumentParser(prog="pithon bench")
+    parser.add_argument("workloads", nargs="*", help=f"parmi : {', '.join(list_workloads())}")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", "-o", help="fichier du rapport JSON (sortie standard par défaut)")
+    ns = parser.parse_args(args)
+    try:
+        report = run_benchmarks(
+            ns.workloads, ns.warmup, max(ns.repeat, 1),
+            use_vm=use_vm, dynamic_operators=dynamic_operators, optimized=optimized,
+        )
+    except ValueError as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 2
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if ns.output:
+        with open(ns.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
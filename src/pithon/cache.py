@@ -0,0 +1,137 @@
+"""
+Cache sur disque des programmes Pithon analysés.
+
+Comme `__pycache__` pour Python, le programme analysé (et optimisé, le cas
+échéant) est conservé dans un dossier `__pithoncache__` à côté du fichier
+source, ce qui évite de refaire l'analyse tant que la source ne change pas.
+
+Une entrée est valide seulement si elle a été produite par la même version de
+Pithon, avec le même format et les mêmes options (`variant`), à partir d'une
+source de même empreinte SHA-256. Une entrée invalide ou illisible est
+ignorée : le programme est alors analysé de nouveau et l'entrée remplacée.
+
+L'arbre est sérialisé avec `marshal` sous forme de tuples, de listes et de
+valeurs simples. Le chargement ne reconstruit que les classes de nœuds et de
+valeurs connues : contrairement à `pickle`, une entrée modifiée ne peut pas
+exécuter de code.
+"""
+
+import hashlib
+import marshal
+import os
+import tempfile
+from dataclasses import fields, is_dataclass
+from typing import Callable
+
+from pithon import __version__, syntax
+from pithon.evaluator.envvalue import VNumber, VBool, VNone, VString, VTuple, VNoneValue, make_bool, make_number
+from pithon.syntax import PiProgram, PiNode
+
+CACHE_DIR = "__pithoncache__"
+
+# À incrémenter quand la forme sérialisée de l'arbre change.
+CACHE_FORMAT = 2
+
+_NODE_CLASSES = {
+    name: cls for name, cls in vars(syntax).items()
+    if isinstance(cls, type) and issubclass(cls, PiNode) and cls is not PiNode
+}
+_VALUE_CLASSES = {cls.__name__: cls for cls in (VNumber, VBool, VNone, VString, VTuple)}
+_TUPLE = "tuple"
+
+
+def cached_parse(filename: str, source: str, parse: Callable[[str], PiProgram], variant: str = "") -> PiProgram:
+    """
+    Retourne le programme de `filename` depuis le cache s'il est valide;
+    sinon l'obtient avec `parse(source)` et l'enregistre dans le cache.
+    """
+    path = cache_path(filename, variant)
+    digest = hashlib.sha256(source.encode("utf-8")).digest()
+    program = _load(path, digest, variant)
+    if program is None:
+        program = parse(source)
+        _store(path, digest, variant, program)
+    return program
+
+def cache_path(filename: str, variant: str = "") -> str:
+    """Retourne le chemin de l'entrée de cache d'un fichier source."""
+    directory, name = os.path.split(os.path.abspath(filename))
+    suffix = f".{variant}" if variant else ""
+    return os.path.join(directory, CACHE_DIR, f"{name}.pithon-{__version__}{suffix}.pic")
+
+def _header(digest: bytes, variant: str) -> tuple:
+    return (CACHE_FORMAT, __version__, variant, digest)
+
+def _load(path: str, digest: bytes, variant: str) -> PiProgram | None:
+    """Lit une entrée du cache; retourne None si elle est absente ou invalide."""
+    try:
+        with open(path, "rb") as f:
+            header, payload = marshal.load(f)
+        if header != _header(digest, variant):
+            return None
+        return decode(payload)
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        return None
+
+def _store(path: str, digest: bytes, variant: str, program: PiProgram) -> None:
+    """Écrit une entrée du cache de façon atomique; les erreurs sont ignorées."""
+    try:
+        data = marshal.dumps((_header(digest, variant), encode(program)))
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, ValueError):
+        # Dossier en lecture seule, valeur non sérialisable... : pas de cache.
+        pass
+
+# --- Sérialisation ---
+
+def encode(node):
+    """Convertit un arbre en tuples, listes et valeurs simples acceptés par marshal."""
+    if isinstance(node, list):
+        return [encode(n) for n in node]
+    if isinstance(node, tuple):
+        return (_TUPLE, [encode(n) for n in node])
+    if isinstance(node, PiNode):
+        # Nœud : (nom, position, champs...)
+        values = (encode(getattr(node, f.name)) for f in fields(node) if f.init and not f.kw_only)
+        return (type(node).__name__, node.pos, *values)
+    if isinstance(node, VString):
+        # Une corde (VRope) est enregistrée comme une chaîne ordinaire.
+        return ("VString", node.value)
+    if is_dataclass(node):
+        name = type(node).__name__
+        if name not in _VALUE_CLASSES:
+            raise ValueError(f"Valeur non sérialisable : {name}")
+        return (name, *(encode(getattr(node, f.name)) for f in fields(node) if f.init))
+    return node
+
+def decode(data):
+    """Reconstruit un arbre à partir de sa forme sérialisée."""
+    if isinstance(data, list):
+        return [decode(d) for d in data]
+    if isinstance(data, tuple):
+        tag, *args = data
+        if tag == _TUPLE:
+            return tuple(decode(d) for d in args[0])
+        if tag in _NODE_CLASSES:
+            pos, *args = args
+            node = _NODE_CLASSES[tag](*(decode(a) for a in args))
+            node.pos = pos
+            return node
+        args = [decode(a) for a in args]
+        if tag == "VNumber":
+            return make_number(*args)
+        if tag == "VBool":
+            return make_bool(*args)
+        if tag == "VNone":
+            return VNoneValue
+        return _VALUE_CLASSES[tag](*args)
+    return data
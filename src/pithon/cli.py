@@ -1,15 +1,54 @@
 from pathlib import Path
 import sys
-import os
-from pithon.evaluator.evaluator import initial_env, evaluate
+from pithon.bench import bench_main
+from pithon.cache import cached_parse
+from pithon.evaluator.evaluator import initial_env
+from pithon.evaluator.compiler import evaluate_compiled
+from pithon.evaluator.limits import Limits, LimitExceeded, limited
 from pithon.parser.simpleparser import SimpleParser
+from pithon.optimizer import optimize
+from pithon.profiler import Profiler, LineSampler
+from pithon.purity import DEFAULT_MEMO_SIZE, memoize, memo_report
+from pithon.resolver import resolve
+from pithon.server import serve_main
 from pithon.syntax import PiAssignment
+from pithon.testrunner import runner_main
+from pithon.vm.compiler import compile_program, disassemble
+from pithon.vm.machine import evaluate_vm
 
-def run_cli(ast_only=False):
+def parse_program(source, dynamic_operators=False, optimized=True):
+    """Analyse puis optimise (au besoin) un programme source."""
+    tree = SimpleParser().parse(source)
+    if optimized:
+        tree = optimize(tree, dynamic_operators)
+    return tree
+
+def load_program(filename, source, dynamic_operators=False, optimized=True):
+    """Comme parse_program, en passant par le cache __pithoncache__ (voir pithon.cache)."""
+    variant = ("opt-dynops" if dynamic_operators else "opt") if optimized else "noopt"
+    return cached_parse(
+        filename, source, lambda src: parse_program(src, dynamic_operators, optimized), variant
+    )
+
+def prepare(tree, dynamic_operators=False, optimized=True):
+    """Optimise puis résout l'arbre syntaxique avant son évaluation."""
+    if optimized:
+        tree = optimize(tree, dynamic_operators)
+    return resolve(tree, dynamic_operators)
+
+def show_tree(tree, use_vm=False, dynamic_operators=False, optimized_ast=False):
+    """Affiche l'arbre syntaxique (optimisé au besoin) ou son bytecode."""
+    if optimized_ast:
+        tree = optimize(tree, dynamic_operators)
+    print(disassemble(compile_program(tree)) if use_vm else tree)
+
+def run_cli(ast_only=False, use_vm=False, dynamic_operators=False, optimized=True, optimized_ast=False):
     parser = SimpleParser()
     env = initial_env()
+    evaluate = evaluate_vm if use_vm else evaluate_compiled
     
     mode = " (mode AST)" if ast_only else ""
+    mode += " (mode VM)" if use_vm else ""
     print(f"🐍 Pithon CLI!{mode}")
 
     while True:
@@ -22,49 +61,144 @@ def run_cli(ast_only=False):
                 continue
             tree = parser.parse(line)
             if ast_only:
-                print(tree)
+                show_tree(tree, use_vm, dynamic_operators, optimized_ast)
                 continue
-            result = evaluate(tree, env)
+            result = evaluate(prepare(tree, dynamic_operators, optimized), env)
             if not isinstance(tree, PiAssignment):
                 print(result)
         except Exception as e:
             print(f"Erreur: {e}")
 
-def run_file(filename, ast_only=False):
-    parser = SimpleParser()
+def run_file(filename, ast_only=False, use_vm=False, dynamic_operators=False, optimized=True, optimized_ast=False,
+             use_cache=True, profile=False, profile_lines=False, memo_size=0, memo_stats=False, limits=None):
     env = initial_env()
     with open(filename, "r", encoding="utf-8") as f:
         source = f.read()
-    tree = parser.parse(source)
     if ast_only:
-        print(tree)
+        show_tree(SimpleParser().parse(source), use_vm, dynamic_operators, optimized_ast)
         return
-    evaluate(tree, env)
+    if use_cache:
+        tree = load_program(filename, source, dynamic_operators, optimized)
+    else:
+        tree = parse_program(source, dynamic_operators, optimized)
+    tree = resolve(tree, dynamic_operators)
+    memo_tables = memoize(tree, memo_size) if memo_size else {}
+    try:
+        with limited(limits):
+            if profile:
+                run_profiled(filename, tree, env)
+            elif profile_lines:
+                run_sampled(filename, source, tree, env)
+            elif use_vm:
+                evaluate_vm(tree, env)
+            else:
+                evaluate_compiled(tree, env)
+    finally:
+        if memo_stats:
+            # Compteurs des fonctions mémoïsées, sur la sortie d'erreur (voir pithon.purity).
+            print(memo_report(memo_tables), file=sys.stderr)
 
-def run_tests():
-    test_dir = Path("tests/fixtures/programs")
-    files = [f for f in os.listdir(test_dir) if f.endswith(".py")]
-    if not files:
-        print("Aucun fichier de test trouvé.")
-        return
-    for fname in sorted(files):
-        path = os.path.join(test_dir, fname)
-        print(f"--- Test : {fname} ---")
-        try:
-            run_file(path)
-        except Exception as e:
-            print(f"Erreur dans {fname}: {e}")
+def run_sampled(filename, source, tree, env):
+    """Évalue le programme en échantillonnant les lignes, puis affiche les plus coûteuses sur la sortie d'erreur."""
+    sampler = LineSampler()
+    try:
+        evaluate_compiled(tree, env, sampler)
+    finally:
+        print(sampler.report(source, filename), file=sys.stderr)
+
+def run_profiled(filename, tree, env):
+    """
+    Évalue le programme sous le profileur, puis affiche le rapport sur la
+    sortie d'erreur et écrit les piles d'appels dans <fichier>.folded.
+    """
+    profiler = Profiler()
+    try:
+        evaluate_compiled(tree, env, profiler)
+    finally:
+        folded = Path(filename).name + ".folded"
+        with open(folded, "w", encoding="utf-8") as f:
+            f.write(profiler.collapsed_stacks())
+        print(profiler.report(filename), file=sys.stderr)
+        print(f"\nPiles d'appels : {folded}", file=sys.stderr)
+
+def _pop_flag(args, flag):
+    """Retire une option de la liste des arguments; indique si elle était présente."""
+    present = flag in args
+    args[:] = [arg for arg in args if arg != flag]
+    return present
+
+def _pop_option(args, option, convert=int):
+    """
+    Retire une option suivie de sa valeur, un nombre positif; retourne la
+    valeur convertie par `convert`, ou None si l'option est absente.
+    """
+    if option not in args:
+        return None
+    i = args.index(option)
+    try:
+        value = convert(args[i + 1])
+        if value <= 0:
+            raise ValueError
+    except (IndexError, ValueError):
+        print(f"Erreur: {option} attend un nombre positif.", file=sys.stderr)
+        sys.exit(2)
+    del args[i:i + 2]
+    return value
 
 def main():
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--test":
-            run_tests()
-        elif sys.argv[1] == "--ast":
-            if len(sys.argv) > 2:
-                run_file(sys.argv[2], ast_only=True)
+    args = sys.argv[1:]
+    options = {
+        # --vm : exécute avec la machine virtuelle à bytecode (voir pithon.vm)
+        "use_vm": _pop_flag(args, "--vm"),
+        # --dynamic-operators : les opérateurs sont cherchés dans l'environnement
+        # et peuvent donc être redéfinis (voir pithon.resolver)
+        "dynamic_operators": _pop_flag(args, "--dynamic-operators"),
+        # --no-optimize : évalue l'arbre tel qu'analysé (voir pithon.optimizer)
+        "optimized": not _pop_flag(args, "--no-optimize"),
+    }
+    # --no-cache : analyse le fichier sans passer par __pithoncache__ (voir pithon.cache)
+    use_cache = not _pop_flag(args, "--no-cache")
+    # --profile : profile l'exécution du fichier (voir pithon.profiler)
+    profile = _pop_flag(args, "--profile")
+    # --profile-lines : échantillonne les lignes les plus coûteuses (voir pithon.profiler)
+    profile_lines = _pop_flag(args, "--profile-lines")
+    # --memoize [--memo-size N] : mémoïse les fonctions pures (voir pithon.purity)
+    memoized = _pop_flag(args, "--memoize")
+    memo_size = _pop_option(args, "--memo-size") or DEFAULT_MEMO_SIZE
+    if not memoized:
+        memo_size = 0
+    # --fuel N, --time-limit S, --max-size N : limites de ressources (voir pithon.evaluator.limits)
+    limits = Limits(
+        fuel=_pop_option(args, "--fuel"),
+        time_limit=_pop_option(args, "--time-limit", float),
+        max_size=_pop_option(args, "--max-size"),
+    )
+    if (profile or profile_lines) and options["use_vm"]:
+        print("Erreur: --profile et --profile-lines ne sont pas disponibles avec --vm.", file=sys.stderr)
+        sys.exit(2)
+    if len(args) > 0:
+        if args[0] == "--test":
+            # --test : exécute les programmes de test en parallèle (voir pithon.testrunner)
+            sys.exit(runner_main(args[1:], memo_size=memo_size, limits=limits, **options))
+        elif args[0] == "bench":
+            # bench : banc d'essai de l'interpréteur (voir pithon.bench)
+            sys.exit(bench_main(args[1:], **options))
+        elif args[0] == "serve":
+            # serve : exécute les programmes reçus dans des processus préchargés (voir pithon.server)
+            sys.exit(serve_main(args[1:], memo_size=memo_size, limits=limits, **options))
+        elif args[0] in ("--ast", "--ast-opt"):
+            # --ast-opt : affiche l'arbre après optimisation
+            optimized_ast = args[0] == "--ast-opt"
+            if len(args) > 1:
+                run_file(args[1], ast_only=True, optimized_ast=optimized_ast, **options)
             else:
-                run_cli(ast_only=True)
+                run_cli(ast_only=True, optimized_ast=optimized_ast, **options)
         else:
-            run_file(sys.argv[1], ast_only=False)
+            try:
+                run_file(args[0], ast_only=False, use_cache=use_cache, profile=profile, profile_lines=profile_lines,
+                         memo_size=memo_size, memo_stats=memoized, limits=limits, **options)
+            except LimitExceeded as e:
+                print(f"Erreur: {e}", file=sys.stderr)
+                sys.exit(3)
     else:
-        run_cli()
\ No newline at end of file
+        run_cli(**options)
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Accès aux attributs des objets, avec caches en ligne.
+
+Un objet range ses attributs dans une liste (`VObject.slots`), à la position
+donnée par sa forme (voir `Shape`). Chaque lecture (`obj.attr`) ou écriture
+(`obj.attr = v`) du programme compilé reçoit son propre cache, qui retient la
+dernière forme rencontrée et ce qu'elle a permis de trouver :
+- en lecture : la position de l'attribut, ou la méthode de la classe; un
+  appel `obj.méthode(...)` utilise la méthode directement, sans la lier;
+- en écriture : la position de l'attribut, ou la forme suivante quand
+  l'écriture crée l'attribut (comme dans `__init__`).
+
+Une forme n'étant jamais modifiée, une entrée reste exacte pour toujours :
+elle n'est remplacée que lorsqu'un objet d'une autre forme passe par le site.
+Tant que les objets rencontrés ont la même forme, un accès ne coûte qu'une
+comparaison d'identité et une indexation.
+"""
+
+from pithon.evaluator.envvalue import EnvValue, Shape, VObject, VFunctionClosure, VMethodClosure
+
+
+class AttributeCache:
+    """Cache d'un site de lecture d'attribut : une entrée pour un attribut, une pour une méthode."""
+    __slots__ = ("attr", "shape", "index", "method_shape", "method")
+
+    def __init__(self, attr: str):
+        self.attr = attr
+        # Dernière forme où l'attribut a été trouvé, et sa position.
+        self.shape: Shape | None = None
+        self.index = 0
+        # Dernière forme sans l'attribut, et la méthode de sa classe.
+        self.method_shape: Shape | None = None
+        self.method = None
+
+    def load(self, obj: VObject) -> EnvValue:
+        """Lit l'attribut d'un objet et remplit l'entrée correspondante du cache."""
+        shape = obj.shape
+        index = shape.offsets.get(self.attr)
+        if index is not None:
+            self.shape, self.index = shape, index
+            return obj.slots[index]
+        method = shape.class_def.methods.get(self.attr)
+        if method is None:
+            raise AttributeError(f"Attribut ou méthode '{self.attr}' non trouvé dans l'objet {obj}.")
+        self.method_shape, self.method = shape, method
+        return VMethodClosure(function=method, instance=obj)
+
+    def find_method(self, obj: VObject) -> VFunctionClosure | None:
+        """Pour un appel `obj.attr(...)` : retourne la méthode sans la lier à l'objet,
+        ou None si l'objet a un attribut de ce nom (lu ensuite avec `load`)."""
+        shape = obj.shape
+        if self.attr in shape.offsets:
+            return None
+        method = shape.class_def.methods.get(self.attr)
+        if method is not None:
+            self.method_shape, self.method = shape, method
+        return method
+
+    def __repr__(self) -> str:
+        return f"<attribute {self.attr}>"
+
+
+class AttributeStoreCache:
+    """Cache d'un site d'écriture d'attribut : une entrée pour un attribut existant, une pour sa création."""
+    __slots__ = ("attr", "shape", "index", "new_shape", "next_shape")
+
+    def __init__(self, attr: str):
+        self.attr = attr
+        # Dernière forme où l'attribut existait, et sa position.
+        self.shape: Shape | None = None
+        self.index = 0
+        # Dernière forme sans l'attribut, et la forme obtenue en le créant.
+        self.new_shape: Shape | None = None
+        self.next_shape: Shape | None = None
+
+    def store(self, obj: VObject, value: EnvValue) -> None:
+        """Écrit l'attribut d'un objet et remplit l'entrée correspondante du cache."""
+        shape = obj.shape
+        index = shape.offsets.get(self.attr)
+        if index is not None:
+            self.shape, self.index = shape, index
+            obj.slots[index] = value
+            return
+        self.new_shape = shape
+        obj.shape = self.next_shape = shape.with_attribute(self.attr)
+        obj.slots.append(value)
+
+    def __repr__(self) -> str:
+        return f"<attribute {self.attr}>"
+
+
+def get_attribute(obj: VObject, attr: str) -> EnvValue:
+    """Lit un attribut sans cache (attribut de l'instance, sinon méthode liée)."""
+    return AttributeCache(attr).load(obj)
+
+def find_method(obj: VObject, attr: str) -> VFunctionClosure | None:
+    """Retourne sans cache la méthode appelée par `obj.attr(...)`, None si c'est un attribut de l'objet."""
+    return AttributeCache(attr).find_method(obj)
+
+def set_attribute(obj: VObject, attr: str, value: EnvValue) -> None:
+    """Écrit un attribut sans cache, en le créant au besoin."""
+    AttributeStoreCache(attr).store(obj, value)
@@ -0,0 +1,636 @@
+"""
+Compilation de l'AST Pithon en fermetures Python.
+
+Au lieu de parcourir la cascade de `isinstance` de `evaluate_stmt` à chaque
+visite d'un nœud, chaque nœud est transformé une seule fois en une fonction
+Python spécialisée `code(env) -> EnvValue`. Les sous-nœuds sont compilés à
+l'avance et capturés dans la fermeture : l'exécution ne fait plus aucun test
+sur le type des nœuds.
+
+La sémantique est exactement celle de `pithon.evaluator.evaluator`, y compris
+pour return, break et continue qui retournent une `Completion`.
+"""
+
+from typing import Callable
+from pithon.evaluator.envframe import EnvFrame, UNBOUND
+from pithon.evaluator.limits import step
+from pithon.evaluator.attributes import AttributeCache, AttributeStoreCache
+from pithon.evaluator.primitive import (
+    check_type, range_contains, set_item, build_dict, build_set, contains_key, get_item, iterate, make_slice
+)
+from pithon.evaluator.evaluator import (
+    _check_valid_piandor_type, bind_arguments, release_frame, new_object, BINARY_OPERATORS,
+    Completion, BREAK, CONTINUE, return_value, raise_completion
+)
+from pithon.syntax import (
+    PiAssignment, PiBinaryOperation, PiNumber, PiBool, PiStatement, PiProgram, PiSubscript, PiSlice, PiVariable,
+    PiIfThenElse, PiNot, PiAnd, PiOr, PiWhile, PiNone, PiList, PiTuple, PiDict, PiSet, PiString,
+    PiFunctionDef, PiFunctionCall, PiFor, PiBreak, PiContinue, PiIn, PiReturn, PiClassDef, PiAttribute, PiAttributeAssignment,
+    PiSubscriptAssignment, PiLocalVariable, PiGlobalVariable, PiLocalAssignment, PiConstant
+)
+from pithon.profiler import Instrument
+from pithon.evaluator.envvalue import EnvValue, VFunctionClosure, VList, VTuple, VDict, VSet, VRange, VNumber, VBool, VString, VClassDef, VMethodClosure, VTrue, VFalse, VNoneValue, make_bool, make_number
+
+Code = Callable[[EnvFrame], EnvValue]
+
+
+def evaluate_compiled(node: PiProgram, env: EnvFrame, profiler: Instrument | None = None) -> EnvValue:
+    """Compile puis évalue un programme ou une instruction, sous le profileur s'il est donné."""
+    if isinstance(node, PiStatement):
+        node = [node]
+    elif not isinstance(node, list):
+        raise TypeError(f"Type de nœud non supporté : {type(node)}")
+    code = compile_program(node, profiler)
+    result = code(env) if profiler is None else profiler.run(code, env)
+    if type(result) is Completion:
+        raise_completion(result)
+    return result
+
+# Profileur de la compilation en cours (voir compile_program).
+_profiler: Instrument | None = None
+
+def compile_program(program: PiProgram, profiler: Instrument | None = None) -> Code:
+    """
+    Compile un programme (liste d'instructions) en une seule fonction.
+    Avec un profileur, chaque nœud et chaque corps de fonction est instrumenté.
+    """
+    global _profiler
+    previous, _profiler = _profiler, profiler
+    try:
+        return _compile_block(program)
+    finally:
+        _profiler = previous
+
+def compile_node(node: PiStatement) -> Code:
+    """Compile une instruction ou expression Pithon."""
+    compiler = _COMPILERS.get(type(node))
+    if compiler is None:
+        raise TypeError(f"Type de nœud non supporté : {type(node)}")
+    code = compiler(node)
+    if _profiler is not None:
+        code = _profiler.wrap_node(node, code)
+    return code
+
+def _compile_body(funcdef: PiFunctionDef, name: str) -> Code:
+    """Compile le corps d'une fonction; `name` la désigne dans le profil."""
+    body = _compile_block(funcdef.body)
+    if _profiler is not None:
+        body = _profiler.wrap_function(name, body)
+    return body
+
+def _compile_block(stmts: list[PiStatement]) -> Code:
+    """Compile une suite d'instructions; retourne la valeur de la dernière."""
+    codes = [compile_node(stmt) for stmt in stmts]
+    if not codes:
+        def empty(env):
+            return VNoneValue
+        return empty
+    if len(codes) == 1:
+        return codes[0]
+    init, last = tuple(codes[:-1]), codes[-1]
+
+    if not any(_may_complete(stmt) for stmt in stmts[:-1]):
+        def block(env):
+            for code in init:
+                code(env)
+            return last(env)
+        return block
+
+    # Une instruction peut retourner une complétion : on s'arrête dessus.
+    def completing_block(env):
+        for code in init:
+            result = code(env)
+            if type(result) is Completion:
+                return result
+        return last(env)
+    return completing_block
+
+def _may_complete(node: PiStatement) -> bool:
+    """Indique si une instruction peut retourner une complétion (return, break, continue)."""
+    if isinstance(node, (PiReturn, PiBreak, PiContinue)):
+        return True
+    if isinstance(node, PiIfThenElse):
+        return any(_may_complete(s) for s in node.then_branch + node.else_branch)
+    if isinstance(node, (PiWhile, PiFor)):
+        # Une boucle traite ses break et continue, mais propage les return.
+        return _contains_return(node.body)
+    return False
+
+def _contains_return(stmts: list[PiStatement]) -> bool:
+    for stmt in stmts:
+        if isinstance(stmt, PiReturn):
+            return True
+        if isinstance(stmt, PiIfThenElse) and _contains_return(stmt.then_branch + stmt.else_branch):
+            return True
+        if isinstance(stmt, (PiWhile, PiFor)) and _contains_return(stmt.body):
+            return True
+    return False
+
+# --- Littéraux et variables ---
+
+def _compile_number(node: PiNumber) -> Code:
+    value = make_number(node.value)
+    return lambda env: value
+
+def _compile_bool(node: PiBool) -> Code:
+    value = make_bool(node.value)
+    return lambda env: value
+
+def _compile_none(node: PiNone) -> Code:
+    value = VNoneValue
+    return lambda env: value
+
+def _compile_string(node: PiString) -> Code:
+    value = VString(node.value)
+    return lambda env: value
+
+def _compile_constant(node: PiConstant) -> Code:
+    value = node.value
+    return lambda env: value
+
+def _compile_list(node: PiList) -> Code:
+    elements = [compile_node(e) for e in node.elements]
+
+    def list_(env):
+        return VList([e(env) for e in elements])
+    return list_
+
+def _compile_tuple(node: PiTuple) -> Code:
+    elements = [compile_node(e) for e in node.elements]
+
+    def tuple_(env):
+        return VTuple(tuple([e(env) for e in elements]))
+    return tuple_
+
+def _compile_dict(node: PiDict) -> Code:
+    pairs = [(compile_node(k), compile_node(v)) for k, v in zip(node.keys, node.values)]
+
+    def dict_(env):
+        return build_dict((k(env), v(env)) for k, v in pairs)
+    return dict_
+
+def _compile_set(node: PiSet) -> Code:
+    elements = [compile_node(e) for e in node.elements]
+
+    def set_(env):
+        return build_set([e(env) for e in elements])
+    return set_
+
+def _compile_variable(node: PiVariable) -> Code:
+    name = node.name
+
+    def variable(env):
+        return env.lookup(name)
+    return variable
+
+def _compile_local_variable(node: PiLocalVariable) -> Code:
+    name, depth, slot = node.name, node.depth, node.slot
+    if depth == 0:
+        def local_variable(env):
+            value = env.slots[slot]
+            if value is UNBOUND:
+                return env.parent.lookup(name)
+            return value
+        return local_variable
+
+    def outer_variable(env):
+        return env.lookup_slot(depth, slot, name)
+    return outer_variable
+
+def _compile_global_variable(node: PiGlobalVariable) -> Code:
+    name, depth = node.name, node.depth
+    if depth == 1:
+        def global_variable(env):
+            return env.parent.lookup(name)
+        return global_variable
+
+    def outer_global_variable(env):
+        return env.lookup_global(depth, name)
+    return outer_global_variable
+
+def _compile_assignment(node: PiAssignment) -> Code:
+    name = node.name
+    value = compile_node(node.value)
+
+    def assignment(env):
+        result = value(env)
+        env.vars[name] = result
+        return result
+    return assignment
+
+def _compile_local_assignment(node: PiLocalAssignment) -> Code:
+    slot = node.slot
+    value = compile_node(node.value)
+
+    def local_assignment(env):
+        result = value(env)
+        env.slots[slot] = result
+        return result
+    return local_assignment
+
+# --- Opérateurs ---
+
+def _compile_binary_operation(node: PiBinaryOperation) -> Code:
+    left = compile_node(node.left)
+    operator = BINARY_OPERATORS.get(node.operator)
+    if operator is not None:
+        if isinstance(node.right, (PiNumber, PiString)):
+            # Opérande droite constante (i + 1, n < 10) : un appel de moins.
+            constant = make_number(node.right.value) if isinstance(node.right, PiNumber) else VString(node.right.value)
+
+            def constant_operation(env):
+                return operator(left(env), constant)
+            return constant_operation
+
+        right = compile_node(node.right)
+
+        def binary_operation(env):
+            return operator(left(env), right(env))
+        return binary_operation
+
+    # Opérateur inconnu : comme dans l'évaluateur, c'est une fonction de l'environnement.
+    operator_name = node.operator
+    right = compile_node(node.right)
+
+    def dynamic_operation(env):
+        func_val = env.lookup(operator_name)
+        args = [left(env), right(env)]
+        if callable(func_val):
+            return func_val(args)
+        return _apply(func_val, args)
+    return dynamic_operation
+
+def _compile_not(node: PiNot) -> Code:
+    operand = compile_node(node.operand)
+
+    def not_(env):
+        value = operand(env)
+        _check_valid_piandor_type(value)
+        return VFalse if value.value else VTrue # type: ignore
+    return not_
+
+def _compile_and(node: PiAnd) -> Code:
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+
+    def and_(env):
+        value = left(env)
+        _check_valid_piandor_type(value)
+        if not value.value: # type: ignore
+            return value
+        value = right(env)
+        _check_valid_piandor_type(value)
+        return value
+    return and_
+
+def _compile_or(node: PiOr) -> Code:
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+
+    def or_(env):
+        value = left(env)
+        _check_valid_piandor_type(value)
+        if value.value: # type: ignore
+            return value
+        value = right(env)
+        _check_valid_piandor_type(value)
+        return value
+    return or_
+
+def _compile_in(node: PiIn) -> Code:
+    element = compile_node(node.element)
+    container = compile_node(node.container)
+
+    def in_(env):
+        container_val = container(env)
+        element_val = element(env)
+        if isinstance(container_val, (VList, VTuple)):
+            return VTrue if element_val in container_val.value else VFalse
+        elif isinstance(container_val, VString):
+            if isinstance(element_val, VString):
+                return VTrue if element_val.value in container_val.value else VFalse
+            else:
+                return VFalse
+        elif isinstance(container_val, (VDict, VSet)):
+            return VTrue if contains_key(container_val, element_val) else VFalse
+        elif isinstance(container_val, VRange):
+            return VTrue if range_contains(container_val, element_val) else VFalse
+        else:
+            raise TypeError("'in' n'est supporté que pour les listes, chaînes, dictionnaires et ensembles.")
+    return in_
+
+def _compile_subscript(node: PiSubscript) -> Code:
+    collection = compile_node(node.collection)
+    index = compile_node(node.index)
+
+    def subscript(env):
+        collection_val = collection(env)
+        idx = index(env)
+        cls = type(collection_val)
+        if (cls is VList or cls is VTuple) and type(idx) is VNumber:
+            return collection_val.value[int(idx.value)]
+        return get_item(collection_val, idx)
+    return subscript
+
+def _compile_slice(node: PiSlice) -> Code:
+    lower = compile_node(node.lower)
+    upper = compile_node(node.upper)
+    step_ = compile_node(node.step)
+
+    def slice_(env):
+        return make_slice(lower(env), upper(env), step_(env))
+    return slice_
+
+def _compile_subscript_assignment(node: PiSubscriptAssignment) -> Code:
+    collection = compile_node(node.collection)
+    index = compile_node(node.index)
+    value = compile_node(node.value)
+
+    def subscript_assignment(env):
+        value_val = value(env)
+        collection_val = collection(env)
+        idx = index(env)
+        if type(collection_val) is VList and collection_val.views is None and type(idx) is VNumber:
+            collection_val.value[int(idx.value)] = value_val
+        else:
+            set_item(collection_val, idx, value_val)
+        return value_val
+    return subscript_assignment
+
+# --- Structures de contrôle ---
+
+def _compile_if(node: PiIfThenElse) -> Code:
+    condition = compile_node(node.condition)
+    then_branch = _compile_block(node.then_branch)
+    else_branch = _compile_block(node.else_branch)
+
+    def if_(env):
+        cond = check_type(condition(env), VBool)
+        if cond.value:
+            return then_branch(env)
+        return else_branch(env)
+    return if_
+
+def _compile_while(node: PiWhile) -> Code:
+    condition = compile_node(node.condition)
+    body = _compile_block(node.body)
+
+    if not any(_may_complete(stmt) for stmt in node.body):
+        def simple_while(env):
+            last_value = VNoneValue
+            while check_type(condition(env), VBool).value:
+                step()
+                last_value = body(env)
+            return last_value
+        return simple_while
+
+    def while_(env):
+        last_value = VNoneValue
+        while True:
+            cond = check_type(condition(env), VBool)
+            if not cond.value:
+                break
+            step()
+            result = body(env)
+            if type(result) is Completion:
+                if result is BREAK:
+                    break
+                if result is CONTINUE:
+                    continue
+                return result
+            last_value = result
+        return last_value
+    return while_
+
+def _compile_for(node: PiFor) -> Code:
+    var = node.var
+    iterable = compile_node(node.iterable)
+    body = _compile_block(node.body)
+
+    may_complete = any(_may_complete(stmt) for stmt in node.body)
+
+    def for_(env):
+        items = iterate(iterable(env))
+        last_value = VNoneValue
+        insert = env.insert
+        if not may_complete:
+            for item in items:
+                step()
+                insert(var, item)
+                last_value = body(env)
+            return last_value
+        for item in items:
+            step()
+            insert(var, item)
+            result = body(env)
+            if type(result) is Completion:
+                if result is BREAK:
+                    break
+                if result is CONTINUE:
+                    continue
+                return result
+            last_value = result
+        return last_value
+    return for_
+
+def _compile_break(node: PiBreak) -> Code:
+    def break_(env):
+        return BREAK
+    return break_
+
+def _compile_continue(node: PiContinue) -> Code:
+    def continue_(env):
+        return CONTINUE
+    return continue_
+
+def _compile_return(node: PiReturn) -> Code:
+    value = compile_node(node.value)
+
+    def return_(env):
+        return Completion(value(env))
+    return return_
+
+# --- Fonctions, classes et objets ---
+
+def _compile_function_def(node: PiFunctionDef) -> Code:
+    name = node.name
+    body = _compile_body(node, name)
+
+    def function_def(env):
+        env.insert(name, VFunctionClosure(node, env, code=body))
+        return VNoneValue
+    return function_def
+
+def _compile_class_def(node: PiClassDef) -> Code:
+    name = node.name
+    methods = [(method, _compile_body(method, f"{name}.{method.name}")) for method in node.methods]
+
+    def class_def(env):
+        class_methodes = {
+            method.name: VFunctionClosure(method, env, code=body)
+            for method, body in methods
+        }
+        env.insert(name, VClassDef(name=name, methods=class_methodes))
+        return VNoneValue
+    return class_def
+
+def _compile_function_call(node: PiFunctionCall) -> Code:
+    if isinstance(node.function, PiAttribute):
+        return _compile_method_call(node)
+    function = compile_node(node.function)
+    args = [compile_node(arg) for arg in node.args]
+
+    def function_call(env):
+        func_val = function(env)
+        arg_vals = [arg(env) for arg in args]
+        if callable(func_val):
+            return func_val(arg_vals)
+        return _apply(func_val, arg_vals)
+    return function_call
+
+def _compile_method_call(node: PiFunctionCall) -> Code:
+    """Compile un appel `obj.m(...)` : la méthode est appelée sans être liée à l'objet."""
+    obj = compile_node(node.function.object)
+    args = [compile_node(arg) for arg in node.args]
+    cache = AttributeCache(node.function.attr)
+    method_shape = method = None
+
+    def method_call(env):
+        nonlocal method_shape, method
+        obj_val = obj(env)
+        if obj_val.shape is method_shape:
+            function = method
+        else:
+            function = cache.find_method(obj_val)
+            if function is None:
+                # Attribut de l'objet : appel ordinaire de sa valeur.
+                func_val = cache.load(obj_val)
+                arg_vals = [arg(env) for arg in args]
+                if callable(func_val):
+                    return func_val(arg_vals)
+                return _apply(func_val, arg_vals)
+            method_shape, method = cache.method_shape, cache.method
+        arg_vals = [obj_val]
+        for arg in args:
+            arg_vals.append(arg(env))
+        return _call_method(function, arg_vals)
+    return method_call
+
+def _compile_attribute(node: PiAttribute) -> Code:
+    obj = compile_node(node.object)
+    cache = AttributeCache(node.attr)
+    # Copie des entrées du cache dans des variables de la fermeture, plus rapides à lire.
+    shape = method_shape = method = None
+    index = 0
+
+    def attribute(env):
+        nonlocal shape, index, method_shape, method
+        obj_val = obj(env)
+        if obj_val.shape is shape:
+            return obj_val.slots[index]
+        if obj_val.shape is method_shape:
+            return VMethodClosure(function=method, instance=obj_val)
+        value = cache.load(obj_val)
+        shape, index, method_shape, method = cache.shape, cache.index, cache.method_shape, cache.method
+        return value
+    return attribute
+
+def _compile_attribute_assignment(node: PiAttributeAssignment) -> Code:
+    obj = compile_node(node.object)
+    value = compile_node(node.value)
+    cache = AttributeStoreCache(node.attr)
+    shape = new_shape = next_shape = None
+    index = 0
+
+    def attribute_assignment(env):
+        nonlocal shape, index, new_shape, next_shape
+        obj_val = obj(env)
+        value_val = value(env)
+        if obj_val.shape is shape:
+            obj_val.slots[index] = value_val
+        elif obj_val.shape is new_shape:
+            obj_val.shape = next_shape
+            obj_val.slots.append(value_val)
+        else:
+            cache.store(obj_val, value_val)
+            shape, index, new_shape, next_shape = cache.shape, cache.index, cache.new_shape, cache.next_shape
+        return value_val
+    return attribute_assignment
+
+def _function_code(function: VFunctionClosure) -> Code:
+    """Retourne le corps compilé d'une fermeture, en le compilant au besoin."""
+    code = function.code
+    if code is None:
+        code = function.code = _compile_block(function.funcdef.body)
+    return code
+
+def _call_method(method: VFunctionClosure, args: list[EnvValue]) -> EnvValue:
+    """Appelle une méthode; `args` commence par l'instance (voir `evaluator._call_method`)."""
+    if callable(method):
+        return method(args)
+    step()
+    call_env = bind_arguments(method, args)
+    result = _function_code(method)(call_env)
+    release_frame(method, call_env)
+    if type(result) is Completion:
+        return return_value(result)
+    return VNoneValue
+
+def _call_function(function: VFunctionClosure, args: list[EnvValue]) -> EnvValue:
+    step()
+    call_env = bind_arguments(function, args)
+    result = _function_code(function)(call_env)
+    release_frame(function, call_env)
+    if type(result) is Completion:
+        return return_value(result)
+    return result
+
+def _apply(func_val: EnvValue, args: list[EnvValue]) -> EnvValue:
+    """Applique une valeur appelable qui n'est pas une primitive."""
+    if isinstance(func_val, VFunctionClosure):
+        memo = func_val.funcdef.memo
+        if memo is not None:
+            return memo.call(args, lambda: _call_function(func_val, args))
+        return _call_function(func_val, args)
+
+    elif isinstance(func_val, VClassDef):
+        return new_object(func_val, args, _call_method)
+
+    elif isinstance(func_val, VMethodClosure):
+        return _call_method(func_val.function, [func_val.instance, *args])
+
+_COMPILERS: dict[type, Callable[..., Code]] = {
+    PiNumber: _compile_number,
+    PiBool: _compile_bool,
+    PiNone: _compile_none,
+    PiString: _compile_string,
+    PiConstant: _compile_constant,
+    PiList: _compile_list,
+    PiTuple: _compile_tuple,
+    PiDict: _compile_dict,
+    PiSet: _compile_set,
+    PiVariable: _compile_variable,
+    PiLocalVariable: _compile_local_variable,
+    PiGlobalVariable: _compile_global_variable,
+    PiLocalAssignment: _compile_local_assignment,
+    PiBinaryOperation: _compile_binary_operation,
+    PiAssignment: _compile_assignment,
+    PiIfThenElse: _compile_if,
+    PiNot: _compile_not,
+    PiAnd: _compile_and,
+    PiOr: _compile_or,
+    PiWhile: _compile_while,
+    PiFunctionDef: _compile_function_def,
+    PiReturn: _compile_return,
+    PiFunctionCall: _compile_function_call,
+    PiFor: _compile_for,
+    PiBreak: _compile_break,
+    PiContinue: _compile_continue,
+    PiIn: _compile_in,
+    PiSubscript: _compile_subscript,
+    PiSlice: _compile_slice,
+    PiSubscriptAssignment: _compile_subscript_assignment,
+    PiClassDef: _compile_class_def,
+    PiAttribute: _compile_attribute,
+    PiAttributeAssignment: _compile_attribute_assignment,
+}
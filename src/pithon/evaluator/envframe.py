@@ -31,5 +31,131 @@ class EnvFrame:
         Retourne une copie superficielle de l'environnement (variables copiées, même parent).
         """
         newf = EnvFrame(self.parent)
-        newf.vars = self.vars.copy()
-        return newf
\ No newline at end of file
+        newf.vars = None if self.vars is None else self.vars.copy()
+        return newf
+
+class _Unbound:
+    """Marque un emplacement de variable locale pas encore affecté."""
+    def __repr__(self):
+        return "<unbound>"
+
+UNBOUND = _Unbound()
+
+class SlotFrame(EnvFrame):
+    """
+    Cadre d'appel d'une fonction résolue (voir pithon.resolver) : les variables
+    locales sont rangées dans un tableau de taille fixe plutôt que dans un dictionnaire.
+    """
+    def __init__(self, layout, parent=None, slots=None):
+        """
+        Initialise un cadre dont les emplacements suivent la disposition `layout`
+        (tous non affectés si `slots` n'est pas donné).
+        """
+        self.layout = layout
+        self.slots = [UNBOUND] * len(layout.names) if slots is None else slots
+        self.vars = None  # variables hors disposition, créé au besoin
+        self.parent: EnvFrame | None = parent
+
+    def lookup(self, name):
+        """
+        Recherche une variable par son nom : emplacement local, puis parents.
+        """
+        frame = self
+        while isinstance(frame, SlotFrame):
+            slot = frame.layout.slots.get(name)
+            if slot is not None:
+                value = frame.slots[slot]
+                if value is not UNBOUND:
+                    return value
+            elif frame.vars is not None and name in frame.vars:
+                return frame.vars[name]
+            frame = frame.parent
+        if frame is None:
+            raise NameError(f"Variable '{name}' non définie.")
+        return frame.lookup(name)
+
+    def lookup_global(self, depth, name):
+        """
+        Recherche une variable par son nom à partir du cadre situé `depth` niveaux plus haut.
+        """
+        frame = self
+        for _ in range(depth):
+            frame = frame.parent
+        return frame.lookup(name)
+
+    def lookup_slot(self, depth, slot, name):
+        """
+        Lit l'emplacement `slot` du cadre situé `depth` niveaux plus haut.
+        Si la variable n'y est pas encore affectée, la recherche continue par nom
+        dans les parents de ce cadre, comme le ferait `lookup`.
+        """
+        frame = self
+        for _ in range(depth):
+            frame = frame.parent
+        value = frame.slots[slot]
+        if value is UNBOUND:
+            return frame.parent.lookup(name)
+        return value
+
+    def insert(self, name, value):
+        """
+        Insère ou met à jour une variable dans le cadre courant.
+        """
+        slot = self.layout.slots.get(name)
+        if slot is not None:
+            self.slots[slot] = value
+        else:
+            if self.vars is None:
+                self.vars = {}
+            self.vars[name] = value
+
+    def copy_shallow(self):
+        """
+        Retourne une copie superficielle du cadre (emplacements copiés, même parent).
+        """
+        newf = SlotFrame(self.layout, self.parent)
+        newf.slots = self.slots.copy()
+        newf.vars = None if self.vars is None else self.vars.copy()
+        return newf
+
+# Nombre maximal de cadres gardés en réserve par fonction.
+FRAME_POOL_SIZE = 64
+
+class BindingPlan:
+    """
+    Plan de liaison des arguments d'une fonction résolue, calculé une fois par
+    le résolveur : nombre de paramètres, présence d'un paramètre variadique et
+    emplacements restants, initialement non affectés.
+
+    Si le corps de la fonction ne définit ni fonction ni classe, aucune
+    fermeture ne peut garder son cadre après l'appel : le cadre est alors rendu
+    à la réserve (`pool`) à la fin de l'appel et réutilisé par l'appel suivant.
+    """
+    __slots__ = ("layout", "arity", "vararg", "padding", "pool")
+
+    def __init__(self, layout, arity, vararg, recyclable):
+        self.layout = layout
+        self.arity = arity
+        self.vararg = vararg
+        self.padding = [UNBOUND] * (len(layout.names) - arity - vararg)
+        # Cadres libérés, None si les cadres de la fonction ne sont pas recyclés.
+        self.pool = [] if recyclable else None
+
+    def new_frame(self, slots, parent):
+        """Retourne un cadre aux emplacements donnés, recyclé si possible."""
+        pool = self.pool
+        if not pool:
+            return SlotFrame(self.layout, parent, slots)
+        frame = pool.pop()
+        frame.slots = slots
+        frame.vars = None
+        frame.parent = parent
+        return frame
+
+    def release(self, frame):
+        """Rend le cadre d'un appel terminé à la réserve, si la fonction recycle ses cadres."""
+        pool = self.pool
+        if pool is not None and len(pool) < FRAME_POOL_SIZE:
+            # Les valeurs du cadre ne doivent pas rester vivantes dans la réserve.
+            frame.slots = frame.parent = None
+            pool.append(frame)
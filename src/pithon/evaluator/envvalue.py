@@ -1,37 +1,80 @@
 """Définitions des valeurs pour l'évaluateur Pithon."""
 
-from typing import Union,  Callable
-from dataclasses import dataclass
+import reprlib
+import weakref
+from typing import Any, Union,  Callable
+from dataclasses import dataclass, field
 from pithon.syntax import ( PiFunctionDef,
 )
 from pithon.evaluator.envframe import EnvFrame
+from pithon.evaluator.limits import check_size
 
 PrimitiveFunction = Callable[..., 'EnvValue']
 
-@dataclass
+@dataclass(slots=True)
 class VFunctionClosure:
     """Représente une fermeture de fonction avec son environnement."""
     funcdef: PiFunctionDef
     closure_env: EnvFrame
+    # Corps précompilé (voir pithon.evaluator.compiler), None si pas encore compilé.
+    code: Any = field(default=None, repr=False, compare=False)
 
     def __str__(self) -> str:
         return f"<function {self.funcdef.name} at {id(self)}>"
 
-@dataclass
+@dataclass(slots=True)
 class VList:
     """Représente une liste de valeurs."""
     value: list['EnvValue']
+    # Références faibles aux tranches (VListView) qui partagent `value`; voir `share_list`.
+    views: list | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __eq__(self, other) -> bool:
+        # Sans le tuple intermédiaire du __eq__ généré; voir aussi `values_equal`.
+        if not isinstance(other, VList):
+            return NotImplemented
+        return self.value == other.value
 
     def __str__(self) -> str:
-        return str(self.value)
+        return self.__repr__()
 
+    @reprlib.recursive_repr("[...]")
     def __repr__(self) -> str:
+        # Une liste qui se contient elle-même s'affiche `[...]`, comme en Python.
         return repr(self.value)
 
-@dataclass
+@dataclass(slots=True)
 class VTuple:
     """Représente un tuple de valeurs."""
     value: tuple['EnvValue', ...]
+    # Hachage des éléments, calculé à la première utilisation comme clé.
+    cached_hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VTuple):
+            return NotImplemented
+        return self.value == other.value
+
+    def __hash__(self) -> int:
+        h = self.cached_hash
+        if h is None:
+            h = self.cached_hash = hash(self.value)
+        return h
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+@dataclass(slots=True)
+class VDict:
+    """
+    Représente un dictionnaire. Les clés sont des valeurs immuables (nombres,
+    chaînes, booléens, None et tuples de telles valeurs), hachées comme la
+    valeur Python sous-jacente; les autres valeurs ne sont pas hachables.
+    """
+    value: dict['EnvValue', 'EnvValue']
 
     def __str__(self) -> str:
         return str(self.value)
@@ -39,65 +82,288 @@ class VTuple:
     def __repr__(self) -> str:
         return repr(self.value)
 
-@dataclass
+@dataclass(slots=True)
+class VSet:
+    """Représente un ensemble de valeurs immuables (voir VDict)."""
+    value: set['EnvValue']
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+@dataclass(slots=True)
+class VRange:
+    """Représente un intervalle d'entiers dont les éléments sont créés à la demande."""
+    value: range
+
+    def __str__(self) -> str:
+        # S'affiche comme la liste de ses éléments, construite seulement si sa taille le permet.
+        check_size(len(self.value))
+        return str(list(self.value))
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, VRange):
+            return self.value == other.value
+        if isinstance(other, VList):
+            # Sans créer les éléments de l'intervalle.
+            items = other.value
+            if len(items) != len(self.value):
+                return False
+            return all(type(x) is VNumber and x.value == i for i, x in zip(self.value, items))
+        return NotImplemented
+
+@dataclass(slots=True)
 class VNumber:
     """Représente un nombre (float)."""
     value: float
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not VNumber:
+            return NotImplemented
+        return self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
     def __str__(self) -> str:
         return str(self.value)
 
-
     def __repr__(self) -> str:
         return repr(self.value)
 
-@dataclass
+@dataclass(slots=True)
 class VBool:
     """Représente une valeur booléenne."""
     value: bool
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not VBool:
+            return NotImplemented
+        return self.value is other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
     def __str__(self) -> str:
         return str(self.value)
 
     def __repr__(self) -> str:
         return repr(self.value)
 
-@dataclass
+@dataclass(slots=True)
 class VNone:
     """Représente la valeur None."""
     value: None = None
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not VNone:
+            return NotImplemented
+        return True
+
+    def __hash__(self) -> int:
+        return hash(None)
+
     def __str__(self) -> str:
         return str(None)
 
     def __repr__(self) -> str:
         return repr(self.value)
 
-@dataclass
+@dataclass(slots=True)
 class VString:
     """Représente une chaîne de caractères."""
     value: str
 
+    def __eq__(self, other) -> bool:
+        # Une chaîne et une corde (VRope) de même texte sont égales.
+        if isinstance(other, VString):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+class VRope(VString):
+    """
+    Chaîne produite par concaténation, dont le texte n'est assemblé qu'à la lecture de `value`.
+
+    Les morceaux sont rangés dans une liste partagée par les cordes successives
+    d'une même suite de concaténations (`s = s + t`) : une corde ne voit que
+    ses `count` premiers morceaux, et `s + t` ajoute t au bout de la liste de s
+    si aucune autre corde ne l'a déjà prolongée (voir `concat_strings`). Le
+    texte est assemblé une seule fois, à la première lecture (affichage,
+    indexation, comparaison...), puis conservé.
+    """
+    __slots__ = ("pieces", "count", "length", "text")
+
+    def __init__(self, pieces: list[str], count: int, length: int):
+        self.pieces: list[str] | None = pieces
+        self.count = count
+        self.length = length
+        self.text: str | None = None
+
+    @property
+    def value(self) -> str:
+        text = self.text
+        if text is None:
+            pieces = self.pieces
+            text = self.text = "".join(pieces if len(pieces) == self.count else pieces[:self.count])
+            self.pieces = None
+        return text
+
+# Tranches (`xs[a:b:c]`). Une tranche d'une liste, d'un tuple ou d'une chaîne
+# ne copie pas les éléments : elle retient le stockage Python de la valeur
+# d'origine (`items`) et les positions qu'elle en voit (`indices`, un range).
+# L'indexation, le parcours par `for` et les tranches d'une tranche lisent
+# directement ce stockage (voir `view_item` et `view_iter`); la copie n'est
+# faite qu'à la lecture de `value`, puis conservée.
+
+class VListView(VList):
+    """
+    Tranche d'une liste. La tranche est copiée avant que la liste d'origine ne
+    soit modifiée (voir `mutable_items`), ou quand elle est modifiée elle-même,
+    puisque toute modification passe par `value`.
+    """
+    __slots__ = ("items", "indices", "base", "owned", "__weakref__")
+
+    def __init__(self, items: list['EnvValue'], indices: range, base: VList):
+        self.items: list['EnvValue'] | None = items
+        self.indices = indices
+        # Liste dont `items` est le stockage, auprès de laquelle la tranche est inscrite.
+        self.base: VList | None = base
+        self.owned: list['EnvValue'] | None = None
+        self.views = None
+
+    @property
+    def value(self) -> list['EnvValue']:
+        owned = self.owned
+        if owned is None:
+            owned = self.owned = slice_items(self.items, self.indices)
+            self.items = self.base = None
+        return owned
+
+class VTupleView(VTuple):
+    """Tranche d'un tuple."""
+    __slots__ = ("items", "indices", "owned")
+
+    def __init__(self, items: tuple['EnvValue', ...], indices: range):
+        self.items: tuple['EnvValue', ...] | None = items
+        self.indices = indices
+        self.owned: tuple['EnvValue', ...] | None = None
+        self.cached_hash = None
+
+    @property
+    def value(self) -> tuple['EnvValue', ...]:
+        owned = self.owned
+        if owned is None:
+            owned = self.owned = slice_items(self.items, self.indices)
+            self.items = None
+        return owned
+
+class VStringView(VString):
+    """Tranche d'une chaîne."""
+    __slots__ = ("items", "indices", "owned")
+
+    def __init__(self, items: str, indices: range):
+        self.items: str | None = items
+        self.indices = indices
+        self.owned: str | None = None
+
+    @property
+    def value(self) -> str:
+        owned = self.owned
+        if owned is None:
+            owned = self.owned = slice_items(self.items, self.indices)
+            self.items = None
+        return owned
+
+@dataclass(slots=True)
+class VSlice:
+    """Bornes d'une tranche (`a:b:c`), entières ou None, comme l'objet slice de Python."""
+    value: slice
+
     def __str__(self) -> str:
         return str(self.value)
 
     def __repr__(self) -> str:
         return repr(self.value)
 
-@dataclass
+@dataclass(slots=True)
 class VClassDef:
     """Représente une définition de classe avec ses méthodes."""
     name: str
     methods: dict[str, VFunctionClosure]
+    # Forme des instances sans attribut, racine des formes de la classe.
+    shape: 'Shape' = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.shape = Shape(self)
 
     def __str__(self) -> str:
         return f"<class {self.name} at {id(self)}>"
 
-@dataclass
+class Shape:
+    """
+    Forme d'objets : leur classe et la position de chaque attribut dans `VObject.slots`.
+
+    Les instances d'une classe dont les attributs ont été créés dans le même
+    ordre partagent la même forme. Une forme n'est jamais modifiée : créer un
+    attribut fait passer l'objet à la forme suivante, conservée dans
+    `transitions` pour que les objets suivants la réutilisent. Une forme
+    désigne donc aussi sa classe, ce qui permet de mémoriser une méthode par
+    forme (voir pithon.evaluator.attributes).
+    """
+    __slots__ = ("class_def", "names", "offsets", "transitions")
+
+    def __init__(self, class_def: VClassDef, names: tuple[str, ...] = ()):
+        self.class_def = class_def
+        self.names = names
+        self.offsets = {name: i for i, name in enumerate(names)}
+        self.transitions: dict[str, Shape] = {}
+
+    def with_attribute(self, name: str) -> 'Shape':
+        """Retourne la forme obtenue en ajoutant un attribut."""
+        shape = self.transitions.get(name)
+        if shape is None:
+            shape = self.transitions[name] = Shape(self.class_def, self.names + (name,))
+        return shape
+
+    def __repr__(self) -> str:
+        return f"<shape {self.class_def.name}{self.names}>"
+
+@dataclass(slots=True, eq=False)
 class VObject:
-    """Représente une instance d'une classe avec ses attributs."""
-    class_def: VClassDef
-    attributes: dict[str, 'EnvValue']
+    """Représente une instance d'une classe; ses attributs sont rangés selon sa forme."""
+    shape: Shape
+    slots: list['EnvValue'] = field(default_factory=list)
+
+    @property
+    def class_def(self) -> VClassDef:
+        return self.shape.class_def
+
+    @property
+    def attributes(self) -> dict[str, 'EnvValue']:
+        """Copie des attributs de l'objet, par nom."""
+        return dict(zip(self.shape.names, self.slots))
+
+    def __eq__(self, other) -> bool:
+        # Même comparaison qu'avec un dictionnaire d'attributs : l'ordre de création ne compte pas.
+        if not isinstance(other, VObject):
+            return NotImplemented
+        if self.shape is other.shape:
+            return self.slots == other.slots
+        return self.class_def == other.class_def and self.attributes == other.attributes
 
     def __str__(self) -> str:
         return f"<{self.class_def.name} object at {id(self)}>"
@@ -105,18 +371,228 @@ class VObject:
     def __repr__(self) -> str:
         return self.__str__()
 
-@dataclass
+@dataclass(slots=True)
 class VMethodClosure:
     """Représente une méthode liée à une instance."""
     function: VFunctionClosure
     instance: VObject
 
     def __str__(self) -> str:
-        return f"<method {self.function.funcdef.name} of {self.instance.class_def.name} at {id(self)}>"
+        class_def = self.instance.shape.class_def
+        if callable(self.function):
+            # Méthode native d'une pseudo-classe (str, list...).
+            name = next(name for name, method in class_def.methods.items() if method is self.function)
+        else:
+            name = self.function.funcdef.name
+        return f"<method {name} of {class_def.name} at {id(self)}>"
 
     def __repr__(self) -> str:
         return self.__str__()
 
+# Valeurs partagées. Les valeurs VNumber, VBool et VNone ne sont jamais
+# modifiées : une même instance peut donc être utilisée partout.
+VTrue = VBool(True)
+VFalse = VBool(False)
+VNoneValue = VNone()
+
+# Entiers conservés en cache par make_number.
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 1024
+_SMALL_INTS = tuple(VNumber(i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX + 1))
+
+def make_bool(value: bool) -> VBool:
+    """Retourne la valeur booléenne partagée correspondante."""
+    return VTrue if value else VFalse
+
+def make_number(value: float) -> VNumber:
+    """Retourne un VNumber; les petits entiers sont pris dans un cache."""
+    if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return _SMALL_INTS[value - SMALL_INT_MIN]
+    return VNumber(value)
+
+def values_equal(a: 'EnvValue', b: 'EnvValue') -> bool:
+    """
+    Égalité structurelle de deux valeurs (opérateur `==`).
+
+    Les nombres sont comparés directement. Pour deux listes ou deux tuples,
+    des longueurs différentes concluent sans parcours; sinon les éléments sont
+    comparés par Python, qui considère égaux deux éléments identiques sans les
+    examiner. Cette comparaison native est récursive : si l'imbrication est
+    trop profonde pour elle, `_sequences_equal` reprend sans récursion. Les
+    autres valeurs (chaînes, dictionnaires, objets...) utilisent leur propre
+    `__eq__`.
+    """
+    cls = type(a)
+    if cls is VNumber:
+        return type(b) is VNumber and a.value == b.value
+    if a is b:
+        return True
+    if (cls is not VList and cls is not VTuple) or type(b) is not cls:
+        return a == b
+    if len(a.value) != len(b.value):
+        return False
+    try:
+        return a.value == b.value
+    except RecursionError:
+        return _sequences_equal(a, b)
+
+def _sequences_equal(a: 'VList | VTuple', b: 'VList | VTuple') -> bool:
+    """Compare deux séquences de même type et de même longueur sans récursion.
+
+    Une pile garde, pour chaque niveau d'imbrication, la position atteinte
+    dans les deux séquences.
+    """
+    # Paires de séquences en cours de comparaison, pour détecter une valeur
+    # qui se contient elle-même (Python lève alors aussi RecursionError).
+    path = {(id(a), id(b))}
+    stack = [(zip(a.value, b.value), (id(a), id(b)))]
+    while stack:
+        for x, y in stack[-1][0]:
+            if x is y:
+                continue
+            cls = type(x)
+            if cls is VNumber:
+                if type(y) is not VNumber or x.value != y.value:
+                    return False
+            elif (cls is VList or cls is VTuple) and type(y) is cls:
+                if len(x.value) != len(y.value):
+                    return False
+                key = (id(x), id(y))
+                if key in path:
+                    raise RecursionError("Comparaison de valeurs qui se contiennent elles-mêmes.")
+                path.add(key)
+                stack.append((zip(x.value, y.value), key))
+                break
+            elif not x == y:
+                return False
+        else:
+            path.discard(stack.pop()[1])
+    return True
+
+# En deçà de ROPE_MIN_LENGTH caractères, une concaténation est faite directement :
+# une corde coûterait plus cher.
+ROPE_MIN_LENGTH = 128
+
+def string_length(value: VString) -> int:
+    """Longueur d'une chaîne, sans assembler le texte d'une corde ni copier une tranche."""
+    if type(value) is VRope and value.text is None:
+        return value.length
+    if type(value) is VStringView and value.items is not None:
+        return len(value.indices)
+    return len(value.value)
+
+def concat_strings(a: VString, b: VString) -> VString:
+    """Concatène deux chaînes; le résultat est une corde à partir de ROPE_MIN_LENGTH caractères."""
+    if type(a) is VRope and a.text is None:
+        length = a.length + string_length(b)
+        check_size(length)
+        pieces = a.pieces
+        if len(pieces) != a.count:
+            # Une autre corde a déjà prolongé la liste : on en copie le début.
+            pieces = pieces[:a.count]
+        pieces.append(b.value)
+        return VRope(pieces, a.count + 1, length)
+    text = a.value
+    length = len(text) + string_length(b)
+    check_size(length)
+    if length < ROPE_MIN_LENGTH:
+        return VString(text + b.value)
+    return VRope([text, b.value], 2, length)
+
+# En deçà de VIEW_MIN_LENGTH éléments, une tranche est copiée directement :
+# une vue coûterait plus cher, et retiendrait tout le stockage d'origine.
+VIEW_MIN_LENGTH = 32
+
+_VIEWS = (VListView, VTupleView, VStringView)
+
+def slice_items(items, indices: range):
+    """Copie les éléments de `items` aux positions `indices` (un range obtenu par tranche)."""
+    stop = indices.stop
+    # Avec un pas négatif, une fin négative désigne le début du stockage.
+    return items[indices.start:stop if stop >= 0 else None:indices.step]
+
+def is_view(value: 'EnvValue') -> bool:
+    """Vrai pour une tranche qui partage encore le stockage de sa valeur d'origine."""
+    return type(value) in _VIEWS and value.items is not None
+
+def share_list(base: VList, view: VListView) -> None:
+    """Inscrit une tranche auprès de la liste dont elle partage les éléments."""
+    views = base.views
+    if views is None:
+        base.views = [weakref.ref(view)]
+        return
+    views.append(weakref.ref(view))
+    n = len(views)
+    # Les tranches disparues sont retirées quand la liste double de taille.
+    if n >= 64 and n & (n - 1) == 0:
+        views[:] = [r for r in views if r() is not None]
+
+def mutable_items(xs: VList) -> list['EnvValue']:
+    """Retourne les éléments d'une liste avant de la modifier : ses tranches en font d'abord leur propre copie."""
+    views = xs.views
+    if views is not None:
+        xs.views = None
+        for ref in views:
+            view = ref()
+            if view is not None and view.items is not None:
+                view.value
+    return xs.value
+
+def slice_sequence(seq: 'VList | VTuple | VString', bounds: slice) -> 'VList | VTuple | VString':
+    """Retourne la tranche `seq[bounds]`, une vue sur le stockage de seq à partir de VIEW_MIN_LENGTH éléments."""
+    if is_view(seq):
+        # Tranche d'une tranche : une vue sur le même stockage.
+        items, indices = seq.items, seq.indices[bounds]
+    else:
+        items = seq.value
+        indices = range(len(items))[bounds]
+    small = len(indices) < VIEW_MIN_LENGTH
+    if isinstance(seq, VList):
+        if small:
+            return VList(slice_items(items, indices))
+        view = VListView(items, indices, seq.base if is_view(seq) else seq)
+        share_list(view.base, view)
+        return view
+    if isinstance(seq, VTuple):
+        return VTuple(slice_items(items, indices)) if small else VTupleView(items, indices)
+    return VString(slice_items(items, indices)) if small else VStringView(items, indices)
+
+def view_item(view: 'VListView | VTupleView | VStringView', index: int) -> 'EnvValue':
+    """Élément `view[index]` d'une tranche, lu dans le stockage partagé."""
+    item = view.items[view.indices[index]]
+    return VString(item) if type(view) is VStringView else item
+
+def view_iter(view: 'VListView | VTupleView'):
+    """Parcourt les éléments d'une tranche sans la copier."""
+    if type(view) is VTupleView:
+        return map(view.items.__getitem__, view.indices)
+    return _list_view_iter(view, view.items)
+
+def _list_view_iter(view: VListView, items: list['EnvValue']):
+    # La liste d'origine peut être modifiée pendant le parcours : la tranche en
+    # a alors fait sa copie, que le parcours suit comme celui d'une liste.
+    for position, index in enumerate(view.indices):
+        if view.items is None:
+            owned = view.value
+            while position < len(owned):
+                yield owned[position]
+                position += 1
+            return
+        yield items[index]
+
+# Pseudo-classes des chaînes et des listes : leurs méthodes natives (join,
+# append...) sont ajoutées par pithon.evaluator.primitive. Comme les objets,
+# ces valeurs ont une forme (sans attribut), ce qui permet d'appeler leurs
+# méthodes par `valeur.méthode(...)`.
+STR_CLASS = VClassDef("str", {})
+VString.shape = STR_CLASS.shape
+LIST_CLASS = VClassDef("list", {})
+VList.shape = LIST_CLASS.shape
+DICT_CLASS = VClassDef("dict", {})
+VDict.shape = DICT_CLASS.shape
+SET_CLASS = VClassDef("set", {})
+VSet.shape = SET_CLASS.shape
+
 EnvValue = Union[
     VNumber,
     VBool,
@@ -124,6 +600,10 @@ EnvValue = Union[
     VString,
     VList,
     VTuple,
+    VDict,
+    VSet,
+    VRange,
+    VSlice,
     VObject,
     VFunctionClosure,
     VMethodClosure,
@@ -1,12 +1,20 @@
-from pithon.evaluator.envframe import EnvFrame
-from pithon.evaluator.primitive import check_type, get_primitive_dict
+from pithon.evaluator.envframe import EnvFrame, BindingPlan
+from pithon.evaluator.limits import step
+from pithon.evaluator.attributes import find_method, get_attribute, set_attribute
+from pithon.evaluator.primitive import (
+    check_type, range_contains, set_item, build_dict, build_set, contains_key, get_item, iterate, make_slice,
+    get_primitive_dict, get_binary_operator_dict
+)
 from pithon.syntax import (
-    PiAssignment, PiBinaryOperation, PiNumber, PiBool, PiStatement, PiProgram, PiSubscript, PiVariable,
-    PiIfThenElse, PiNot, PiAnd, PiOr, PiWhile, PiNone, PiList, PiTuple, PiString,
-    PiFunctionDef, PiFunctionCall, PiFor, PiBreak, PiContinue, PiIn, PiReturn, PiClassDef,PiAttribute,PiAttributeAssignment
+    PiAssignment, PiBinaryOperation, PiNumber, PiBool, PiStatement, PiProgram, PiSubscript, PiSlice, PiVariable,
+    PiIfThenElse, PiNot, PiAnd, PiOr, PiWhile, PiNone, PiList, PiTuple, PiDict, PiSet, PiString,
+    PiFunctionDef, PiFunctionCall, PiFor, PiBreak, PiContinue, PiIn, PiReturn, PiClassDef,PiAttribute,PiAttributeAssignment,
+    PiSubscriptAssignment, PiLocalVariable, PiGlobalVariable, PiLocalAssignment, PiConstant
 )
-from pithon.evaluator.envvalue import EnvValue, VFunctionClosure, VList, VNone, VTuple, VNumber, VBool, VString, VClassDef, VMethodClosure, VObject
+from pithon.evaluator.envvalue import EnvValue, VFunctionClosure, VList, VNone, VTuple, VDict, VSet, VRange, VNumber, VBool, VString, VClassDef, VMethodClosure, VObject, VTrue, VFalse, VNoneValue, make_number
+
 
+BINARY_OPERATORS = get_binary_operator_dict()
 
 def initial_env() -> EnvFrame:
     """Crée et retourne l'environnement initial avec les primitives."""
@@ -25,30 +33,46 @@ def insert(env: EnvFrame, name: str, value: EnvValue) -> None:
 def evaluate(node: PiProgram, env: EnvFrame) -> EnvValue:
     """Évalue un programme ou une liste d'instructions."""
     if isinstance(node, list):
-        last_value = VNone(value=None)
-        for stmt in node:
-            last_value = evaluate_stmt(stmt, env)
-        return last_value
+        result = _evaluate_block(node, env)
     elif isinstance(node, PiStatement):
-        return evaluate_stmt(node, env)
+        result = evaluate_stmt(node, env)
     else:
         raise TypeError(f"Type de nœud non supporté : {type(node)}")
+    if type(result) is Completion:
+        raise_completion(result)
+    return result
+
+def _evaluate_block(stmts: list[PiStatement], env: EnvFrame) -> EnvValue | 'Completion':
+    """Évalue une suite d'instructions; s'arrête à la première complétion."""
+    last_value = VNoneValue
+    for stmt in stmts:
+        last_value = evaluate_stmt(stmt, env)
+        if type(last_value) is Completion:
+            break
+    return last_value
+
+def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue | 'Completion':
+    """Évalue une instruction ou expression Pithon.
 
-def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
-    """Évalue une instruction ou expression Pithon."""
+    Les instructions return, break et continue (ou les blocs qui les contiennent)
+    retournent une `Completion` au lieu d'une valeur.
+    """
 
     if isinstance(node, PiNumber):
-        return VNumber(node.value)
+        return make_number(node.value)
 
     elif isinstance(node, PiBool):
-        return VBool(node.value)
+        return VTrue if node.value else VFalse
 
     elif isinstance(node, PiNone):
-        return VNone(node.value)
+        return VNoneValue
 
     elif isinstance(node, PiString):
         return VString(node.value)
 
+    elif isinstance(node, PiConstant):
+        return node.value
+
     elif isinstance(node, PiList):
         elements = [evaluate_stmt(e, env) for e in node.elements]
         return VList(elements)
@@ -57,11 +81,26 @@ def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
         elements = tuple(evaluate_stmt(e, env) for e in node.elements)
         return VTuple(elements)
 
+    elif isinstance(node, PiDict):
+        return build_dict((evaluate_stmt(k, env), evaluate_stmt(v, env)) for k, v in zip(node.keys, node.values))
+
+    elif isinstance(node, PiSet):
+        return build_set([evaluate_stmt(e, env) for e in node.elements])
+
     elif isinstance(node, PiVariable):
         return lookup(env, node.name)
 
+    elif isinstance(node, PiLocalVariable):
+        return env.lookup_slot(node.depth, node.slot, node.name)
+
+    elif isinstance(node, PiGlobalVariable):
+        return env.lookup_global(node.depth, node.name)
+
     elif isinstance(node, PiBinaryOperation):
-        # Traite l'opération binaire comme un appel de fonction
+        operator = BINARY_OPERATORS.get(node.operator)
+        if operator is not None:
+            return operator(evaluate_stmt(node.left, env), evaluate_stmt(node.right, env))
+        # Opérateur inconnu : traité comme un appel de fonction
         fct_call = PiFunctionCall(
             function=PiVariable(name=node.operator),
             args=[node.left, node.right]
@@ -73,18 +112,22 @@ def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
         insert(env, node.name, value)
         return value
 
+    elif isinstance(node, PiLocalAssignment):
+        value = evaluate_stmt(node.value, env)
+        env.slots[node.slot] = value
+        return value
+
     elif isinstance(node, PiIfThenElse):
         cond = evaluate_stmt(node.condition, env)
         cond = check_type(cond, VBool)
         branch = node.then_branch if cond.value else node.else_branch
-        last_value = evaluate(branch, env)
-        return last_value
+        return _evaluate_block(branch, env)
 
     elif isinstance(node, PiNot):
         operand = evaluate_stmt(node.operand, env)
         # Vérifie le type pour l'opérateur 'not'
         _check_valid_piandor_type(operand)
-        return VBool(not operand.value) # type: ignore
+        return VFalse if operand.value else VTrue # type: ignore
 
     elif isinstance(node, PiAnd):
         left = evaluate_stmt(node.left, env)
@@ -110,11 +153,11 @@ def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
     elif isinstance(node, PiFunctionDef):
         closure = VFunctionClosure(node, env)
         insert(env, node.name, closure)
-        return VNone(value=None)
+        return VNoneValue
 
     elif isinstance(node, PiReturn):
         value = evaluate_stmt(node.value, env)
-        raise ReturnException(value)
+        return Completion(value)
 
     elif isinstance(node, PiFunctionCall):
         return _evaluate_function_call(node, env)
@@ -123,16 +166,19 @@ def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
         return _evaluate_for(node, env)
 
     elif isinstance(node, PiBreak):
-        raise BreakException()
+        return BREAK
 
     elif isinstance(node, PiContinue):
-        raise ContinueException()
+        return CONTINUE
 
     elif isinstance(node, PiIn):
         return _evaluate_in(node, env)
 
     elif isinstance(node, PiSubscript):
         return _evaluate_subscript(node, env)
+
+    elif isinstance(node, PiSlice):
+        return make_slice(evaluate_stmt(node.lower, env), evaluate_stmt(node.upper, env), evaluate_stmt(node.step, env))
     
     elif isinstance(node, PiClassDef):
         class_methodes = {}
@@ -142,27 +188,26 @@ def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
         class_def = VClassDef(name=node.name, methods=class_methodes)
         # Insère la classe dans l'environnement
         insert(env, node.name, class_def)
-        return VNone(value=None)
+        return VNoneValue
     
     elif isinstance(node, PiAttribute):            # lecture d'attribut
+        # attribut d’instance, sinon méthode de classe liée (VMethodClosure)
         obj_val = evaluate_stmt(node.object, env)
-
-        # attribut d’instance
-        if node.attr in obj_val.attributes:
-            return obj_val.attributes[node.attr]
-        # Sinon : méthode de classe -> on renvoie une VMethodClosure liée
-        if node.attr in obj_val.class_def.methods:
-            meth = obj_val.class_def.methods[node.attr]
-            return VMethodClosure(function=meth, instance=obj_val)
-
-        raise AttributeError(f"Attribut ou méthode '{node.attr}' non trouvé dans l'objet {obj_val}.")
+        return get_attribute(obj_val, node.attr)
         
     elif isinstance(node, PiAttributeAssignment):  # écriture d'attribut
 
         obj_val = evaluate_stmt(node.object, env)
         value_val = evaluate_stmt(node.value, env)
 
-        obj_val.attributes[node.attr] = value_val
+        set_attribute(obj_val, node.attr, value_val)
+        return value_val
+
+    elif isinstance(node, PiSubscriptAssignment):  # écriture d'élément
+        # Comme en Python : la valeur, puis la collection, puis l'indice.
+        value_val = evaluate_stmt(node.value, env)
+        collection = evaluate_stmt(node.collection, env)
+        set_item(collection, evaluate_stmt(node.index, env), value_val)
         return value_val
 
     else:
@@ -171,98 +216,151 @@ def evaluate_stmt(node: PiStatement, env: EnvFrame) -> EnvValue:
 
 def _check_valid_piandor_type(obj):
     """Vérifie que le type est valide pour 'and'/'or'."""
-    if not isinstance(obj, VBool | VNumber | VString | VNone | VList | VTuple):
+    if not isinstance(obj, VBool | VNumber | VString | VNone | VList | VTuple | VDict | VSet | VRange):
         raise TypeError(f"Type non supporté pour l'opérateur 'and': {type(obj).__name__}")
 
 def _evaluate_while(node: PiWhile, env: EnvFrame) -> EnvValue:
     """Évalue une boucle while."""
-    last_value = VNone(value=None)
+    last_value = VNoneValue
     while True:
         cond = evaluate_stmt(node.condition, env)
         cond = check_type(cond, VBool)
         if not cond.value:
             break
-        try:
-            last_value = evaluate(node.body, env)
-        except BreakException:
-            break
-        except ContinueException:
-            continue
+        step()
+        result = _evaluate_block(node.body, env)
+        if type(result) is Completion:
+            if result is BREAK:
+                break
+            if result is CONTINUE:
+                continue
+            return result
+        last_value = result
     return last_value
 
 def _evaluate_for(node: PiFor, env: EnvFrame) -> EnvValue:
     """Évalue une boucle for."""
-    iterable_val = evaluate_stmt(node.iterable, env)
-    if not isinstance(iterable_val, (VList, VTuple)):
-        raise TypeError("La boucle for attend une liste ou un tuple.")
-    last_value = VNone(value=None)
-    iterable = iterable_val.value
+    iterable = iterate(evaluate_stmt(node.iterable, env))
+    last_value = VNoneValue
     for item in iterable:
+        step()
         env.insert(node.var, item)  # Pas de nouvel environnement pour la variable de boucle
-        try:
-            last_value = evaluate(node.body, env)
-        except BreakException:
-            break
-        except ContinueException:
-            continue
+        result = _evaluate_block(node.body, env)
+        if type(result) is Completion:
+            if result is BREAK:
+                break
+            if result is CONTINUE:
+                continue
+            return result
+        last_value = result
     return last_value
 
 def _evaluate_subscript(node: PiSubscript, env: EnvFrame) -> EnvValue:
     """Évalue une opération d'indexation (subscript)."""
     collection = evaluate_stmt(node.collection, env)
     index = evaluate_stmt(node.index, env)
-    # Indexation pour liste, tuple ou chaîne
-    if isinstance(collection, VList):
-        idx = check_type(index, VNumber)
-        return collection.value[int(idx.value)]
-    elif isinstance(collection, VTuple):
-        idx = check_type(index, VNumber)
-        return collection.value[int(idx.value)]
-    elif isinstance(collection, VString):
-        idx = check_type(index, VNumber)
-        return VString(collection.value[int(idx.value)])
-    else:
-        raise TypeError("L'indexation n'est supportée que pour les listes, tuples et chaînes.")
+    return get_item(collection, index)
 
 def _evaluate_in(node: PiIn, env: EnvFrame) -> EnvValue:
     """Évalue l'opérateur 'in'."""
     container = evaluate_stmt(node.container, env)
     element = evaluate_stmt(node.element, env)
     if isinstance(container, (VList, VTuple)):
-        return VBool(element in container.value)
+        return VTrue if element in container.value else VFalse
     elif isinstance(container, VString):
         if isinstance(element, VString):
-            return VBool(element.value in container.value)
+            return VTrue if element.value in container.value else VFalse
         else:
-            return VBool(False)
+            return VFalse
+    elif isinstance(container, (VDict, VSet)):
+        return VTrue if contains_key(container, element) else VFalse
+    elif isinstance(container, VRange):
+        return VTrue if range_contains(container, element) else VFalse
     else:
-        raise TypeError("'in' n'est supporté que pour les listes et chaînes.")
+        raise TypeError("'in' n'est supporté que pour les listes, chaînes, dictionnaires et ensembles.")
 
-def _call_method(method: VMethodClosure) -> EnvValue:
-    """Appelle une méthode d'un objet.
+def _call_method(method: VFunctionClosure, args: list[EnvValue]) -> EnvValue:
+    """Appelle une méthode d'un objet; `args` commence par l'instance, liée au premier paramètre.
     utilisée également pour la fonction __init__ d'une classe."""
-    funcdef     = method.function.funcdef
-    closure_env = method.function.closure_env
-    self_obj    = method.instance
-
-    call_env = EnvFrame(parent=closure_env)
-    call_env.insert("self", self_obj)
+    if callable(method):
+        # Méthode native (voir STR_CLASS).
+        return method(args)
+    step()
+    call_env = bind_arguments(method, args)
 
     # exécution du corps de la méthode
-    # si une instruction return est rencontrée, il faut intercepter l'exception
-    try:
-        for stmt in funcdef.body:
-            evaluate_stmt(stmt, call_env)
-    except ReturnException as ret:
-        return ret.value          # on récupère la valeur retournée
-    
+    # si une instruction return est rencontrée, on récupère la valeur retournée
+    result = _evaluate_block(method.funcdef.body, call_env)
+    release_frame(method, call_env)
+    if type(result) is Completion:
+        return return_value(result)
+
     # aucune instruction retournée comme pour les appels de fonction
-    return VNone(value=None)      
+    return VNoneValue
+
+def bind_arguments(function: VFunctionClosure, args: list[EnvValue]) -> EnvFrame:
+    """Crée l'environnement d'appel d'une fonction et y lie les arguments."""
+    funcdef = function.funcdef
+    plan = funcdef.plan
+    if plan is not None:
+        if len(args) == plan.arity and not plan.vararg:
+            # Cas courant : les arguments, suivis des autres variables locales non affectées.
+            return plan.new_frame(args + plan.padding, function.closure_env)
+        return plan.new_frame(_vararg_slots(plan, args), function.closure_env)
+    call_env = EnvFrame(parent=function.closure_env)
+    arity = len(funcdef.arg_names)
+    if len(args) < arity:
+        raise TypeError("Argument manquant pour la fonction.")
+    call_env.vars.update(zip(funcdef.arg_names, args))
+    if funcdef.vararg:
+        varargs = VList(args[arity:])
+        call_env.insert(funcdef.vararg, varargs)
+    elif len(args) > arity:
+        raise TypeError("Trop d'arguments pour la fonction.")
+    return call_env
+
+def _vararg_slots(plan: BindingPlan, args: list[EnvValue]) -> list[EnvValue]:
+    """Emplacements d'un appel avec paramètre variadique (ou nombre d'arguments erroné)."""
+    arity = plan.arity
+    if len(args) < arity:
+        raise TypeError("Argument manquant pour la fonction.")
+    if not plan.vararg:
+        raise TypeError("Trop d'arguments pour la fonction.")
+    slots = args[:arity]
+    slots.append(VList(args[arity:]))
+    slots += plan.padding
+    return slots
+
+def release_frame(function: VFunctionClosure, call_env: EnvFrame) -> None:
+    """Rend le cadre d'un appel terminé à la réserve de la fonction (voir BindingPlan)."""
+    plan = function.funcdef.plan
+    if plan is not None:
+        plan.release(call_env)
+
+def _call_function(function: VFunctionClosure, args: list[EnvValue]) -> EnvValue:
+    """Exécute le corps d'une fonction utilisateur avec les arguments donnés."""
+    step()
+    call_env = bind_arguments(function, args)
+    result = _evaluate_block(function.funcdef.body, call_env)
+    release_frame(function, call_env)
+    if type(result) is Completion:
+        return return_value(result)
+    return result
 
 def _evaluate_function_call(node: PiFunctionCall, env: EnvFrame) -> EnvValue:
     """Évalue un appel de fonction (primitive ou définie par l'utilisateur)."""
 
-    func_val = evaluate_stmt(node.function, env)
+    if isinstance(node.function, PiAttribute):
+        # Appel de méthode obj.m(...) : la méthode est appelée directement, sans VMethodClosure.
+        obj_val = evaluate_stmt(node.function.object, env)
+        method = find_method(obj_val, node.function.attr)
+        if method is not None:
+            args = [obj_val]
+            args.extend(evaluate_stmt(arg, env) for arg in node.args)
+            return _call_method(method, args)
+        func_val = get_attribute(obj_val, node.function.attr)
+    else:
+        func_val = evaluate_stmt(node.function, env)
     args = [evaluate_stmt(arg, env) for arg in node.args]
 
     # Fonction primitive
@@ -271,54 +369,68 @@ def _evaluate_function_call(node: PiFunctionCall, env: EnvFrame) -> EnvValue:
     # Fonction utilisateur
 
     if isinstance(func_val, VFunctionClosure):
-        funcdef = func_val.funcdef
-        closure_env = func_val.closure_env
-        call_env = EnvFrame(parent=closure_env)
-        for i, arg_name in enumerate(funcdef.arg_names):
-            if i < len(args):
-                call_env.insert(arg_name, args[i])
-            else:
-                raise TypeError("Argument manquant pour la fonction.")
-        if funcdef.vararg:
-            varargs = VList(args[len(funcdef.arg_names):])
-            call_env.insert(funcdef.vararg, varargs)
-        elif len(args) > len(funcdef.arg_names):
-            raise TypeError("Trop d'arguments pour la fonction.")
-        result = VNone(value=None)
-        try:
-            for stmt in funcdef.body:
-                result = evaluate_stmt(stmt, call_env)
-        except ReturnException as ret:
-            return ret.value
-        return result
+        memo = func_val.funcdef.memo
+        if memo is not None:
+            return memo.call(args, lambda: _call_function(func_val, args))
+        return _call_function(func_val, args)
     
     elif isinstance(func_val, VClassDef):
-        # création de l'instance
-        new_instance = VObject(class_def=func_val, attributes={})
-
-        # appel de la méthode __init__ si elle existe
-        init_closure = func_val.methods.get("__init__")
-        if init_closure:
-            init_methodclosure = VMethodClosure(
-                function      = init_closure,
-                instance     = new_instance
-            )
-            _call_method(init_methodclosure)   # on ignore la valeur retournée
-
-        return new_instance
+        return new_object(func_val, args, _call_method)
     
     elif isinstance(func_val, VMethodClosure):
-        return _call_method(func_val)
+        return _call_method(func_val.function, [func_val.instance, *args])
+
+def new_object(class_def: VClassDef, args: list[EnvValue], call_method) -> VObject:
+    """Crée une instance et appelle sa méthode __init__ avec `call_method(méthode, arguments)`."""
+    new_instance = VObject(class_def.shape)
+    init_closure = class_def.methods.get("__init__")
+    if init_closure:
+        call_method(init_closure, [new_instance, *args])   # on ignore la valeur retournée
+    elif args:
+        raise TypeError(f"La classe {class_def.name} ne prend pas d'arguments.")
+    return new_instance
+
+class Completion:
+    """
+    Fin anormale d'une instruction : return, break ou continue.
+
+    Plutôt que de lever une exception, l'instruction retourne une complétion
+    que les blocs propagent jusqu'à la boucle ou l'appel de fonction qui la
+    traite. `BREAK` et `CONTINUE` sont des instances uniques; toute autre
+    complétion est un return qui porte la valeur retournée.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value=None):
+        self.value = value
+
+BREAK = Completion()
+CONTINUE = Completion()
+
+def return_value(completion: Completion) -> EnvValue:
+    """Valeur d'une complétion qui atteint la fin d'un appel de fonction."""
+    if completion is BREAK or completion is CONTINUE:
+        # break/continue hors d'une boucle de la fonction
+        raise_completion(completion)
+    return completion.value
+
+def raise_completion(completion: Completion):
+    """Lève l'exception correspondant à une complétion qui n'a pas été traitée."""
+    if completion is BREAK:
+        raise BreakException()
+    if completion is CONTINUE:
+        raise ContinueException()
+    raise ReturnException(completion.value)
 
 class ReturnException(Exception):
-    """Exception pour retourner une valeur depuis une fonction."""
+    """Exception levée pour un return hors d'une fonction."""
     def __init__(self, value):
         self.value = value
 
 class BreakException(Exception):
-    """Exception pour sortir d'une boucle (break)."""
+    """Exception levée pour un break hors d'une boucle."""
     pass
 
 class ContinueException(Exception):
-    """Exception pour passer à l'itération suivante (continue)."""
+    """Exception levée pour un continue hors d'une boucle."""
     pass
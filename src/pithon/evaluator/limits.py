@@ -0,0 +1,100 @@
+"""
+Limites de ressources de l'évaluation, pour exécuter des programmes non fiables.
+
+Trois limites peuvent être fixées avec `limited(Limits(...))` :
+- le carburant (`fuel`) : nombre maximal de pas d'exécution. Un pas est une
+  itération de boucle ou un appel de fonction, les seuls moyens pour un
+  programme de s'exécuter longtemps; le reste du travail entre deux pas est
+  borné par la taille du programme et par la taille des valeurs;
+- le délai (`time_limit`, en secondes), vérifié tous les CHECK_INTERVAL pas;
+- la taille maximale (`max_size`) des listes, tuples et chaînes construits
+  par concaténation, répétition, `join` ou `format`, et des intervalles
+  convertis en texte, vérifiée avant de construire la valeur.
+
+Un dépassement lève une sous-classe de `LimitExceeded`.
+
+Les moteurs appellent `step()` à chaque pas, même sans limite : le compteur
+n'est qu'une variable globale décrémentée, et le travail de vérification
+n'est fait qu'une fois tous les CHECK_INTERVAL pas.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+# Nombre de pas entre deux vérifications du carburant et du délai.
+CHECK_INTERVAL = 1024
+
+
+class LimitExceeded(Exception):
+    """Base des erreurs de dépassement d'une limite de ressources."""
+
+class FuelExhausted(LimitExceeded):
+    """Le programme a fait plus de pas que son carburant ne le permet."""
+
+class DeadlineExceeded(LimitExceeded):
+    """Le programme s'exécute depuis plus longtemps que son délai."""
+
+class SizeLimitExceeded(LimitExceeded):
+    """Le programme construit une valeur plus grande que la taille maximale."""
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Limites d'une évaluation; None : pas de limite."""
+    fuel: int | None = None
+    time_limit: float | None = None
+    max_size: int | None = None
+
+
+# État de l'évaluation en cours. Le carburant est consommé par fenêtres d'au
+# plus CHECK_INTERVAL pas : `_countdown` compte les pas restants de la fenêtre
+# courante, `_reserve` le carburant pas encore attribué à une fenêtre.
+_countdown = CHECK_INTERVAL
+_reserve: int | None = None
+_deadline: float | None = None
+_time_limit: float | None = None
+_max_size: int | None = None
+
+
+def step() -> None:
+    """Compte un pas d'exécution (itération de boucle ou appel)."""
+    global _countdown
+    _countdown -= 1
+    if _countdown < 0:
+        _checkpoint()
+
+def _checkpoint() -> None:
+    """Ouvre une nouvelle fenêtre de pas, après avoir vérifié le carburant et le délai."""
+    global _countdown, _reserve
+    if _deadline is not None and time.monotonic() > _deadline:
+        raise DeadlineExceeded(f"Délai de {_time_limit:g} s dépassé.")
+    window = CHECK_INTERVAL
+    if _reserve is not None:
+        if _reserve == 0:
+            raise FuelExhausted("Carburant épuisé : trop de pas d'exécution.")
+        window = min(window, _reserve)
+        _reserve -= window
+    # Le pas en cours est le premier de la nouvelle fenêtre.
+    _countdown = window - 1
+
+def check_size(size: int) -> None:
+    """Vérifie qu'une valeur de `size` éléments peut être construite."""
+    if _max_size is not None and size > _max_size:
+        raise SizeLimitExceeded(f"Valeur de taille {size} plus grande que la limite ({_max_size}).")
+
+@contextmanager
+def limited(limits: Limits | None):
+    """Applique des limites pendant l'exécution du bloc (aucune si `limits` est None)."""
+    global _countdown, _reserve, _deadline, _time_limit, _max_size
+    saved = (_countdown, _reserve, _deadline, _time_limit, _max_size)
+    limits = limits or Limits()
+    _reserve = limits.fuel
+    _countdown = 0
+    _time_limit = limits.time_limit
+    _deadline = None if limits.time_limit is None else time.monotonic() + limits.time_limit
+    _max_size = limits.max_size
+    try:
+        yield
+    finally:
+        _countdown, _reserve, _deadline, _time_limit, _max_size = saved
@@ -3,8 +3,16 @@ Fonctions primitives pour l'évaluateur Pithon.
 Contient les opérations arithmétiques, comparaisons et fonctions utilitaires de base.
 """
 
+import re
+import string
 from typing import Any, Type, TypeVar
-from pithon.evaluator.envvalue import EnvValue, VList, VNone, VTuple, VNumber, VBool, VString
+from pithon.evaluator.limits import check_size
+from pithon.evaluator.envvalue import (
+    EnvValue, VList, VNone, VTuple, VDict, VSet, VRange, VSlice, VNumber, VBool, VString, VTrue, VFalse, VNoneValue,
+    STR_CLASS, LIST_CLASS, DICT_CLASS, SET_CLASS,
+    concat_strings, is_view, make_number, mutable_items, slice_sequence, string_length, values_equal, view_item,
+    view_iter
+)
 
 T = TypeVar('T')
 def check_type(obj: Any, mytype: Type[T]) -> T:
@@ -13,32 +21,35 @@ def check_type(obj: Any, mytype: Type[T]) -> T:
         raise TypeError(f"Type attendu : {mytype.__name__}, obtenu : {type(obj).__name__}")
     return obj
 
-def primitive_add(args: list[EnvValue]):
+def binary_add(a: EnvValue, b: EnvValue):
     """Additionne deux valeurs (nombres, listes, tuples ou chaînes)."""
-    a, b = args
+    if type(a) is VNumber and type(b) is VNumber:
+        return make_number(a.value + b.value)
+    if isinstance(a, VString) and isinstance(b, VString):
+        return concat_strings(a, b)
+    if isinstance(a, (VList, VTuple, VRange)) and isinstance(b, (VList, VTuple, VRange)):
+        check_size(len(a.value) + len(b.value))
+    a, b = range_to_list(a), range_to_list(b)
     if isinstance(a, VList) and isinstance(b, VList):
         return VList(a.value + b.value)
     if isinstance(a, VTuple) and isinstance(b, VTuple):
         return VTuple(a.value + b.value)
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VNumber(a.value + b.value)
-    if isinstance(a, VString) and isinstance(b, VString):
-        return VString(a.value + b.value)
     raise TypeError(f"Addition non supportée entre {type(a).__name__} et {type(b).__name__}")
 
-def primitive_sub(args: list[EnvValue]):
+def binary_sub(a: EnvValue, b: EnvValue):
     """Soustrait deux nombres."""
-    a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VNumber(a.value - b.value)
+    if type(a) is VNumber and type(b) is VNumber:
+        return make_number(a.value - b.value)
     raise TypeError(f"Soustraction non supportée entre {type(a).__name__} et {type(b).__name__}")
 
-def primitive_mul(args: list[EnvValue]):
+def binary_mul(a: EnvValue, b: EnvValue):
     """Multiplie deux nombres ou répète une séquence (liste, tuple, chaîne)."""
-    a, b = args
-    # String/List/Tuple repetition: str * int, list * int, tuple * int
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VNumber(a.value * b.value)
+    if type(a) is VNumber and type(b) is VNumber:
+        return make_number(a.value * b.value)
+    seq, count = (b, a) if isinstance(a, VNumber) else (a, b)
+    if isinstance(seq, (VList, VTuple, VString, VRange)) and isinstance(count, VNumber):
+        check_size(len(seq.value) * max(int(count.value), 0))
+    a, b = range_to_list(a), range_to_list(b)
     # Support for repetition operations
     if isinstance(a, VList) and isinstance(b, VNumber):
         return VList(a.value * int(b.value))
@@ -54,87 +65,197 @@ def primitive_mul(args: list[EnvValue]):
         return VString(b.value * int(a.value))
     raise TypeError(f"Multiplication non supportée entre {type(a).__name__} et {type(b).__name__}")
 
-def primitive_div(args: list[EnvValue]):
+def binary_div(a: EnvValue, b: EnvValue):
     """Divise deux nombres, lève une erreur si division par zéro."""
-    a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
+    if type(a) is VNumber and type(b) is VNumber:
         if b.value == 0:
             raise ZeroDivisionError("Division par zéro")
-        return VNumber(a.value / b.value)
+        return make_number(a.value / b.value)
     raise TypeError(f"Division non supportée entre {type(a).__name__} et {type(b).__name__}")
 
-def primitive_mod(args: list[EnvValue]):
+def binary_mod(a: EnvValue, b: EnvValue):
     """Calcule le modulo de deux nombres, lève une erreur si division par zéro."""
-    a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
+    if type(a) is VNumber and type(b) is VNumber:
         if b.value == 0:
             raise ZeroDivisionError("Modulo par zéro")
-        return VNumber(a.value % b.value)
+        return make_number(a.value % b.value)
     raise TypeError(f"Modulo non supporté entre {type(a).__name__} et {type(b).__name__}")
 
+def binary_eq(a: EnvValue, b: EnvValue):
+    """Teste l'égalité entre deux valeurs."""
+    if type(a) is VNumber and type(b) is VNumber:
+        return VTrue if a.value == b.value else VFalse
+    return VTrue if values_equal(a, b) else VFalse
+
+def binary_neq(a: EnvValue, b: EnvValue):
+    """Teste la différence entre deux valeurs."""
+    if type(a) is VNumber and type(b) is VNumber:
+        return VTrue if a.value != b.value else VFalse
+    return VFalse if values_equal(a, b) else VTrue
+
+def binary_lt(a: EnvValue, b: EnvValue):
+    """Teste si la première valeur est inférieure à la seconde (nombres ou chaînes)."""
+    if (type(a) is VNumber and type(b) is VNumber) or (isinstance(a, VString) and isinstance(b, VString)):
+        return VTrue if a.value < b.value else VFalse
+    raise TypeError(f"Comparaison '<' non supportée entre {type(a).__name__} et {type(b).__name__}")
+
+def binary_lte(a: EnvValue, b: EnvValue):
+    """Teste si la première valeur est inférieure ou égale à la seconde (nombres ou chaînes)."""
+    if (type(a) is VNumber and type(b) is VNumber) or (isinstance(a, VString) and isinstance(b, VString)):
+        return VTrue if a.value <= b.value else VFalse
+    raise TypeError(f"Comparaison '<=' non supportée entre {type(a).__name__} et {type(b).__name__}")
+
+def binary_gt(a: EnvValue, b: EnvValue):
+    """Teste si la première valeur est supérieure à la seconde (nombres ou chaînes)."""
+    if (type(a) is VNumber and type(b) is VNumber) or (isinstance(a, VString) and isinstance(b, VString)):
+        return VTrue if a.value > b.value else VFalse
+    raise TypeError(f"Comparaison '>' non supportée entre {type(a).__name__} et {type(b).__name__}")
+
+def binary_gte(a: EnvValue, b: EnvValue):
+    """Teste si la première valeur est supérieure ou égale à la seconde (nombres ou chaînes)."""
+    if (type(a) is VNumber and type(b) is VNumber) or (isinstance(a, VString) and isinstance(b, VString)):
+        return VTrue if a.value >= b.value else VFalse
+    raise TypeError(f"Comparaison '>=' non supportée entre {type(a).__name__} et {type(b).__name__}")
+
+# Versions appelables depuis Pithon (liste d'arguments) des opérateurs binaires.
+
+def primitive_add(args: list[EnvValue]):
+    """Additionne deux valeurs (nombres, listes, tuples ou chaînes)."""
+    a, b = args
+    return binary_add(a, b)
+
+def primitive_sub(args: list[EnvValue]):
+    """Soustrait deux nombres."""
+    a, b = args
+    return binary_sub(a, b)
+
+def primitive_mul(args: list[EnvValue]):
+    """Multiplie deux nombres ou répète une séquence (liste, tuple, chaîne)."""
+    a, b = args
+    return binary_mul(a, b)
+
+def primitive_div(args: list[EnvValue]):
+    """Divise deux nombres, lève une erreur si division par zéro."""
+    a, b = args
+    return binary_div(a, b)
+
+def primitive_mod(args: list[EnvValue]):
+    """Calcule le modulo de deux nombres, lève une erreur si division par zéro."""
+    a, b = args
+    return binary_mod(a, b)
+
 def primitive_eq(args: list[EnvValue]):
     """Teste l'égalité entre deux valeurs."""
     a, b = args
-    return VBool(a == b)
+    return binary_eq(a, b)
 
 def primitive_neq(args: list[EnvValue]):
     """Teste la différence entre deux valeurs."""
     a, b = args
-    return VBool(a != b)
+    return binary_neq(a, b)
 
 def primitive_lt(args: list[EnvValue]):
     """Teste si la première valeur est inférieure à la seconde (nombres ou chaînes)."""
     a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VBool(a.value < b.value)
-    if isinstance(a, VString) and isinstance(b, VString):
-        return VBool(a.value < b.value)
-    raise TypeError(f"Comparaison '<' non supportée entre {type(a).__name__} et {type(b).__name__}")
+    return binary_lt(a, b)
 
 def primitive_lte(args: list[EnvValue]):
     """Teste si la première valeur est inférieure ou égale à la seconde (nombres ou chaînes)."""
     a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VBool(a.value <= b.value)
-    if isinstance(a, VString) and isinstance(b, VString):
-        return VBool(a.value <= b.value)
-    raise TypeError(f"Comparaison '<=' non supportée entre {type(a).__name__} et {type(b).__name__}")
+    return binary_lte(a, b)
 
 def primitive_gt(args: list[EnvValue]):
     """Teste si la première valeur est supérieure à la seconde (nombres ou chaînes)."""
     a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VBool(a.value > b.value)
-    if isinstance(a, VString) and isinstance(b, VString):
-        return VBool(a.value > b.value)
-    raise TypeError(f"Comparaison '>' non supportée entre {type(a).__name__} et {type(b).__name__}")
+    return binary_gt(a, b)
 
 def primitive_gte(args: list[EnvValue]):
     """Teste si la première valeur est supérieure ou égale à la seconde (nombres ou chaînes)."""
     a, b = args
-    if isinstance(a, VNumber) and isinstance(b, VNumber):
-        return VBool(a.value >= b.value)
-    if isinstance(a, VString) and isinstance(b, VString):
-        return VBool(a.value >= b.value)
-    raise TypeError(f"Comparaison '>=' non supportée entre {type(a).__name__} et {type(b).__name__}")
+    return binary_gte(a, b)
 
 def primitive_print(args: list[EnvValue]):
     """Affiche la valeur passée en argument."""
     v, = args
     print(v)
-    return VNone(value=None)
+    return VNoneValue
 
 def primitive_range(args: list[EnvValue]):
-    """Crée une liste de nombres dans un intervalle spécifié."""
+    """Crée un intervalle de nombres, dont les éléments sont calculés à la demande."""
+    step = 1
     if len(args) == 1:
         start = 0
         end = check_type(args[0], VNumber).value
-    elif len(args) == 2:
+    elif len(args) in (2, 3):
         start = check_type(args[0], VNumber).value
         end = check_type(args[1], VNumber).value
+        if len(args) == 3:
+            step = check_type(args[2], VNumber).value
+    else:
+        raise TypeError("La fonction 'range' attend 1, 2 ou 3 arguments.")
+    if int(step) == 0:
+        raise ValueError("Le pas de 'range' ne doit pas être zéro.")
+    return VRange(range(int(start), int(end), int(step)))
+
+def range_to_list(value: EnvValue) -> EnvValue:
+    """Convertit un intervalle en liste; retourne les autres valeurs telles quelles."""
+    if type(value) is VRange:
+        return VList([make_number(i) for i in value.value])
+    return value
+
+def range_contains(container: VRange, element: EnvValue) -> bool:
+    """Teste en temps constant si un nombre fait partie d'un intervalle."""
+    if type(element) is not VNumber:
+        return False
+    number = element.value
+    if isinstance(number, float) and not number.is_integer():
+        return False
+    return int(number) in container.value
+
+def range_item(container: VRange, index: EnvValue) -> VNumber:
+    """Retourne l'élément d'un intervalle à l'indice donné."""
+    idx = check_type(index, VNumber)
+    return make_number(container.value[int(idx.value)])
+
+def make_slice(lower: EnvValue, upper: EnvValue, step: EnvValue) -> VSlice:
+    """Construit les bornes d'une tranche `a:b:c`; chaque borne est un nombre ou None."""
+    bounds = [None if isinstance(b, VNone) else int(check_type(b, VNumber).value) for b in (lower, upper, step)]
+    if bounds[2] == 0:
+        raise ValueError("Le pas d'une tranche ne doit pas être zéro.")
+    return VSlice(slice(*bounds))
+
+def get_item(collection: EnvValue, index: EnvValue) -> EnvValue:
+    """Retourne `collection[index]`, où index est un indice, une clé ou une tranche (VSlice)."""
+    if type(index) is VSlice:
+        if isinstance(collection, (VList, VTuple, VString)):
+            return slice_sequence(collection, index.value)
+        if isinstance(collection, VRange):
+            return VRange(collection.value[index.value])
+        raise TypeError("Les tranches ne sont supportées que pour les listes, tuples et chaînes.")
+    if isinstance(collection, (VList, VTuple, VString)):
+        idx = int(check_type(index, VNumber).value)
+        if is_view(collection):
+            return view_item(collection, idx)
+        if isinstance(collection, VString):
+            return VString(collection.value[idx])
+        return collection.value[idx]
+    elif isinstance(collection, VDict):
+        return dict_item(collection, index)
+    elif isinstance(collection, VRange):
+        return range_item(collection, index)
+    else:
+        raise TypeError("L'indexation n'est supportée que pour les listes, tuples, chaînes et dictionnaires.")
+
+def iterate(value: EnvValue):
+    """Retourne l'itérable Python parcouru par `for x in value`."""
+    if isinstance(value, VRange):
+        return map(make_number, value.value)
+    elif isinstance(value, (VList, VTuple)):
+        return view_iter(value) if is_view(value) else value.value
+    elif isinstance(value, (VDict, VSet)):
+        return value.value
     else:
-        raise TypeError("La fonction 'range' attend 1 ou 2 arguments.")
-    return VList([VNumber(i) for i in range(int(start), int(end))])
+        raise TypeError("La boucle for attend une liste, un tuple, un dictionnaire ou un ensemble.")
 
 def primitive_str(args: list[EnvValue]):
     """Convertit une valeur en chaîne de caractères."""
@@ -143,11 +264,241 @@ def primitive_str(args: list[EnvValue]):
     value = args[0]
     if isinstance(value, VString):
         return value
-    if isinstance(value, (VNumber, VBool, VNone, VList, VTuple)):
+    if isinstance(value, (VNumber, VBool, VNone, VList, VTuple, VDict, VSet)):
         return VString(str(value.value))
+    if isinstance(value, VRange):
+        return VString(str(value))
     else:
         raise TypeError(f"Type non supporté pour 'str': {type(value).__name__}")
 
+# Méthodes natives des chaînes. Comme une méthode Pithon, elles reçoivent
+# l'instance (la chaîne) en premier argument.
+
+def str_join(args: list[EnvValue]):
+    """Concatène les chaînes d'une séquence, séparées par la chaîne : `sep.join(seq)`."""
+    if len(args) != 2:
+        raise TypeError("La méthode 'join' attend exactement 1 argument.")
+    sep, seq = check_type(args[0], VString), args[1]
+    if not isinstance(seq, (VList, VTuple, VRange)):
+        raise TypeError(f"La méthode 'join' attend une séquence, obtenu : {type(seq).__name__}")
+    items = []
+    size = 0
+    for item in seq.value:
+        if not isinstance(item, VString):
+            raise TypeError(f"La méthode 'join' attend des chaînes, obtenu : {type(item).__name__}")
+        items.append(item.value)
+        size += string_length(item)
+    check_size(size + string_length(sep) * max(len(items) - 1, 0))
+    return VString(sep.value.join(items))
+
+# Largeur et précision d'une spécification de format (`{:>10}`, `{:.3f}`).
+_FORMAT_SIZES = re.compile(r"\d+")
+
+class _Formatter(string.Formatter):
+    """Formateur de `str.format` restreint aux champs positionnels : pas d'accès
+    aux attributs (`{0.x}`) ni aux indices (`{0[1]}`) des valeurs Python sous-jacentes."""
+
+    def get_field(self, field_name, args, kwargs):
+        if field_name and not field_name.isdigit():
+            raise ValueError(f"Champ de format non supporté : '{field_name}'")
+        return super().get_field(field_name, args, kwargs)
+
+    def format_field(self, value, format_spec):
+        for size in _FORMAT_SIZES.findall(format_spec):
+            check_size(int(size))
+        if isinstance(value, (VNumber, VString, VBool, VNone)):
+            return format(value.value, format_spec)
+        return format(str(value), format_spec)
+
+_FORMATTER = _Formatter()
+
+def str_format(args: list[EnvValue]):
+    """Remplace les champs `{}` de la chaîne par les arguments : `"{} = {:.2f}".format(nom, x)`."""
+    template = check_type(args[0], VString)
+    return VString(_FORMATTER.vformat(template.value, args[1:], {}))
+
+STR_CLASS.methods.update({
+    'join': str_join,
+    'format': str_format,
+})
+
+def set_item(collection: EnvValue, index: EnvValue, value: EnvValue) -> None:
+    """Affecte un élément d'une liste ou d'un dictionnaire : `collection[index] = value`."""
+    if isinstance(collection, VList):
+        idx = check_type(index, VNumber)
+        mutable_items(collection)[int(idx.value)] = value
+    elif isinstance(collection, VDict):
+        if not contains_key(collection, index):
+            check_size(len(collection.value) + 1)
+        collection.value[index] = value
+    else:
+        raise TypeError("L'affectation par indice n'est supportée que pour les listes et dictionnaires.")
+
+# Dictionnaires et ensembles. Les clés sont hachées par le dictionnaire Python
+# sous-jacent; une clé non hachable (liste, objet...) y lève TypeError, que
+# `_unhashable` remplace par un message propre à Pithon.
+
+def _unhashable(key: EnvValue) -> TypeError:
+    return TypeError(f"Type non hachable : {type(key).__name__}")
+
+def build_dict(pairs) -> VDict:
+    """Construit le dictionnaire d'un littéral `{k: v, ...}` à partir de ses paires (clé, valeur);
+    la dernière valeur d'une clé l'emporte."""
+    items = {}
+    for key, value in pairs:
+        try:
+            items[key] = value
+        except TypeError:
+            raise _unhashable(key) from None
+    return VDict(items)
+
+def build_set(elements) -> VSet:
+    """Construit l'ensemble d'un littéral `{x, ...}` ou de `set(séquence)`."""
+    items = set()
+    for element in elements:
+        try:
+            items.add(element)
+        except TypeError:
+            raise _unhashable(element) from None
+    return VSet(items)
+
+def dict_item(container: VDict, key: EnvValue) -> EnvValue:
+    """Retourne la valeur d'une clé : `d[key]`; lève KeyError si elle est absente."""
+    try:
+        return container.value[key]
+    except TypeError:
+        raise _unhashable(key) from None
+
+def contains_key(container: VDict | VSet, key: EnvValue) -> bool:
+    """Teste en temps constant si une clé fait partie d'un dictionnaire ou d'un ensemble."""
+    try:
+        return key in container.value
+    except TypeError:
+        raise _unhashable(key) from None
+
+def primitive_set(args: list[EnvValue]):
+    """Crée un ensemble, vide ou formé des éléments d'une séquence."""
+    if not args:
+        return VSet(set())
+    if len(args) != 1:
+        raise TypeError("La fonction 'set' attend au plus 1 argument.")
+    seq = args[0]
+    if isinstance(seq, VRange):
+        check_size(len(seq.value))
+        return VSet({make_number(i) for i in seq.value})
+    if isinstance(seq, (VList, VTuple, VSet, VDict)):
+        return build_set(seq.value)
+    if isinstance(seq, VString):
+        return VSet({VString(c) for c in seq.value})
+    raise TypeError(f"La fonction 'set' attend une séquence, obtenu : {type(seq).__name__}")
+
+def dict_get(args: list[EnvValue]):
+    """Retourne la valeur d'une clé, ou la valeur par défaut (None) : `d.get(k, défaut)`."""
+    if len(args) not in (2, 3):
+        raise TypeError("La méthode 'get' attend 1 ou 2 arguments.")
+    items = check_type(args[0], VDict).value
+    default = args[2] if len(args) == 3 else VNoneValue
+    try:
+        return items.get(args[1], default)
+    except TypeError:
+        raise _unhashable(args[1]) from None
+
+def dict_keys(args: list[EnvValue]):
+    """Retourne la liste des clés : `d.keys()`."""
+    if len(args) != 1:
+        raise TypeError("La méthode 'keys' n'attend pas d'argument.")
+    return VList(list(check_type(args[0], VDict).value))
+
+def dict_values(args: list[EnvValue]):
+    """Retourne la liste des valeurs : `d.values()`."""
+    if len(args) != 1:
+        raise TypeError("La méthode 'values' n'attend pas d'argument.")
+    return VList(list(check_type(args[0], VDict).value.values()))
+
+def dict_items(args: list[EnvValue]):
+    """Retourne la liste des paires (clé, valeur) : `d.items()`."""
+    if len(args) != 1:
+        raise TypeError("La méthode 'items' n'attend pas d'argument.")
+    return VList([VTuple(item) for item in check_type(args[0], VDict).value.items()])
+
+def set_add(args: list[EnvValue]):
+    """Ajoute un élément à l'ensemble : `s.add(x)`."""
+    if len(args) != 2:
+        raise TypeError("La méthode 'add' attend exactement 1 argument.")
+    items = check_type(args[0], VSet).value
+    element = args[1]
+    if not contains_key(args[0], element):
+        check_size(len(items) + 1)
+        items.add(element)
+    return VNoneValue
+
+DICT_CLASS.methods.update({
+    'get': dict_get,
+    'keys': dict_keys,
+    'values': dict_values,
+    'items': dict_items,
+})
+
+SET_CLASS.methods.update({
+    'add': set_add,
+})
+
+# Méthodes natives des listes. Elles modifient la liste en place : toutes les
+# variables qui désignent la même liste voient la modification, mais pas ses
+# tranches (voir `mutable_items`).
+
+def list_append(args: list[EnvValue]):
+    """Ajoute un élément à la fin de la liste : `xs.append(x)`."""
+    if len(args) != 2:
+        raise TypeError("La méthode 'append' attend exactement 1 argument.")
+    items = mutable_items(check_type(args[0], VList))
+    check_size(len(items) + 1)
+    items.append(args[1])
+    return VNoneValue
+
+def list_extend(args: list[EnvValue]):
+    """Ajoute les éléments d'une séquence à la fin de la liste : `xs.extend(seq)`."""
+    if len(args) != 2:
+        raise TypeError("La méthode 'extend' attend exactement 1 argument.")
+    items = mutable_items(check_type(args[0], VList))
+    seq = args[1]
+    if isinstance(seq, (VList, VTuple, VRange)):
+        check_size(len(items) + len(seq.value))
+        items.extend(range_to_list(seq).value)
+    elif isinstance(seq, VString):
+        check_size(len(items) + string_length(seq))
+        items.extend(VString(c) for c in seq.value)
+    else:
+        raise TypeError(f"La méthode 'extend' attend une séquence, obtenu : {type(seq).__name__}")
+    return VNoneValue
+
+def list_insert(args: list[EnvValue]):
+    """Insère un élément avant l'indice donné : `xs.insert(i, x)`."""
+    if len(args) != 3:
+        raise TypeError("La méthode 'insert' attend exactement 2 arguments.")
+    items = mutable_items(check_type(args[0], VList))
+    idx = check_type(args[1], VNumber)
+    check_size(len(items) + 1)
+    items.insert(int(idx.value), args[2])
+    return VNoneValue
+
+def list_pop(args: list[EnvValue]):
+    """Retire et retourne l'élément à l'indice donné, le dernier par défaut : `xs.pop()`."""
+    if len(args) not in (1, 2):
+        raise TypeError("La méthode 'pop' attend au plus 1 argument.")
+    items = mutable_items(check_type(args[0], VList))
+    index = int(check_type(args[1], VNumber).value) if len(args) == 2 else -1
+    if not items:
+        raise IndexError("pop sur une liste vide.")
+    return items.pop(index)
+
+LIST_CLASS.methods.update({
+    'append': list_append,
+    'extend': list_extend,
+    'insert': list_insert,
+    'pop': list_pop,
+})
+
 def get_primitive_dict():
     """Retourne le dictionnaire des fonctions primitives."""
     return {
@@ -164,5 +515,22 @@ def get_primitive_dict():
         '>=': primitive_gte,
         'print': primitive_print,
         'range': primitive_range,
+        'set': primitive_set,
         'str': primitive_str,
-    }
\ No newline at end of file
+    }
+
+def get_binary_operator_dict():
+    """Retourne le dictionnaire des opérateurs binaires (fonctions à deux arguments)."""
+    return {
+        '+': binary_add,
+        '-': binary_sub,
+        '*': binary_mul,
+        '/': binary_div,
+        '%': binary_mod,
+        '==': binary_eq,
+        '!=': binary_neq,
+        '<': binary_lt,
+        '<=': binary_lte,
+        '>': binary_gt,
+        '>=': binary_gte,
+    }
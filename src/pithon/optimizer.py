@@ -0,0 +1,203 @@
+"""
+Optimisation de l'arbre syntaxique Pithon, entre l'analyse et l'évaluation.
+
+Les transformations conservent le comportement observable des programmes :
+- les opérations arithmétiques et les comparaisons entre littéraux sont
+  calculées une fois pour toutes (`2 * 3` devient `6`); une opération qui
+  échouerait (division par zéro, types incompatibles) est laissée telle quelle
+  pour que l'erreur survienne à l'exécution;
+- `not`, `and` et `or` sur des littéraux sont simplifiés;
+- les branches d'un `if` dont la condition est un booléen littéral, et les
+  boucles `while False`, sont éliminées;
+- les tuples de constantes deviennent des `PiConstant` partagés au lieu d'être
+  reconstruits à chaque évaluation (les listes, modifiables, ne le sont pas);
+- les expressions pures dont le résultat est ignoré sont retirées. La dernière
+  instruction d'un bloc est toujours conservée, car sa valeur peut être
+  utilisée (valeur implicite d'une fonction, du programme ou de la REPL).
+
+Avec `dynamic_operators=True`, les opérateurs binaires peuvent être redéfinis
+par le programme : ils ne sont alors pas précalculés.
+"""
+
+from dataclasses import replace
+from pithon.evaluator.envvalue import EnvValue, VNumber, VBool, VNone, VString, VTuple, VNoneValue, make_bool, make_number
+from pithon.evaluator.evaluator import BINARY_OPERATORS, _check_valid_piandor_type
+from pithon.evaluator.limits import Limits, limited
+from pithon.syntax import (
+    PiProgram, PiStatement, PiNumber, PiBool, PiNone, PiString, PiConstant, PiList, PiTuple,
+    PiBinaryOperation, PiNot, PiAnd, PiOr, PiIfThenElse, PiWhile, PiFor, PiFunctionDef, PiClassDef,
+    map_children, located
+)
+
+# Taille maximale d'une chaîne ou d'un tuple produit par le précalcul, pour ne
+# pas gonfler l'arbre (par ex. `"a" * 1000000`).
+MAX_FOLDED_SIZE = 1000
+
+_LITERALS = (PiNumber, PiBool, PiNone, PiString, PiConstant)
+_FOLDING_LIMITS = Limits(max_size=MAX_FOLDED_SIZE)
+
+
+def optimize(program: PiProgram, dynamic_operators: bool = False) -> PiProgram:
+    """Retourne le programme optimisé."""
+    return _Optimizer(dynamic_operators).block(program)
+
+
+class _Optimizer:
+    def __init__(self, dynamic_operators: bool):
+        self.dynamic_operators = dynamic_operators
+
+    # --- Instructions ---
+
+    def block(self, stmts: list[PiStatement]) -> list[PiStatement]:
+        """Optimise un bloc; les branches éliminées sont remplacées par leur contenu."""
+        result = []
+        for stmt in stmts:
+            result.extend(self.statement(stmt))
+        last = len(result) - 1
+        return [stmt for i, stmt in enumerate(result) if i == last or not _is_pure(stmt)]
+
+    def statement(self, node: PiStatement) -> list[PiStatement]:
+        """Optimise une instruction; retourne les instructions qui la remplacent."""
+        if isinstance(node, PiIfThenElse):
+            condition = self.expr(node.condition)
+            then_branch = self.block(node.then_branch)
+            else_branch = self.block(node.else_branch)
+            if isinstance(condition, PiBool):
+                branch = then_branch if condition.value else else_branch
+                # Une branche vide vaut None.
+                return branch or [located(PiNone(value=None), node)]
+            return [replace(node, condition=condition, then_branch=then_branch, else_branch=else_branch)]
+
+        if isinstance(node, PiWhile):
+            condition = self.expr(node.condition)
+            if isinstance(condition, PiBool) and not condition.value:
+                return [located(PiNone(value=None), node)]
+            return [replace(node, condition=condition, body=self.block(node.body))]
+
+        if isinstance(node, PiFor):
+            return [replace(node, iterable=self.expr(node.iterable), body=self.block(node.body))]
+
+        if isinstance(node, PiFunctionDef):
+            return [self.function(node)]
+
+        if isinstance(node, PiClassDef):
+            return [replace(node, methods=[self.function(m) for m in node.methods])]
+
+        return [self.expr(node)]
+
+    def function(self, funcdef: PiFunctionDef) -> PiFunctionDef:
+        return replace(funcdef, body=self.block(funcdef.body))
+
+    # --- Expressions ---
+
+    def expr(self, node: PiStatement) -> PiStatement:
+        """Optimise une expression (ou une instruction simple) et ses sous-expressions."""
+        if isinstance(node, PiIfThenElse):
+            # Expression conditionnelle : chaque branche contient une expression.
+            condition = self.expr(node.condition)
+            then_branch = [self.expr(e) for e in node.then_branch]
+            else_branch = [self.expr(e) for e in node.else_branch]
+            if isinstance(condition, PiBool):
+                branch = then_branch if condition.value else else_branch
+                if len(branch) == 1:
+                    return branch[0]
+            return replace(node, condition=condition, then_branch=then_branch, else_branch=else_branch)
+
+        node = map_children(node, self.expr)
+
+        if isinstance(node, PiBinaryOperation):
+            return self.fold_binary(node)
+
+        if isinstance(node, PiTuple):
+            value = _constant_value(node)
+            if value is not None:
+                return located(PiConstant(value=value), node)
+            return node
+
+        if isinstance(node, PiNot):
+            value = _constant_value(node.operand)
+            if _is_logic_operand(value):
+                return located(PiBool(value=not value.value), node)
+            return node
+
+        if isinstance(node, (PiAnd, PiOr)):
+            left = _constant_value(node.left)
+            if not _is_logic_operand(left):
+                return node
+            if bool(left.value) == isinstance(node, PiOr):
+                # Court-circuit : l'opérande droite n'est pas évaluée.
+                return node.left
+            if _is_logic_operand(_constant_value(node.right)):
+                return node.right
+            return node
+
+        return node
+
+    def fold_binary(self, node: PiBinaryOperation) -> PiStatement:
+        if self.dynamic_operators or node.operator not in BINARY_OPERATORS:
+            return node
+        left = _constant_value(node.left)
+        right = _constant_value(node.right)
+        if left is None or right is None:
+            return node
+        try:
+            # La limite de taille évite de construire une valeur trop grande pour être gardée.
+            with limited(_FOLDING_LIMITS):
+                result = BINARY_OPERATORS[node.operator](left, right)
+        except Exception:
+            # L'erreur doit se produire à l'exécution, au bon moment.
+            return node
+        literal = _literal(result)
+        return node if literal is None else located(literal, node)
+
+
+def _constant_value(node: PiStatement) -> EnvValue | None:
+    """Retourne la valeur d'un littéral immuable, ou None si le nœud n'en est pas un."""
+    if isinstance(node, PiNumber):
+        return make_number(node.value)
+    if isinstance(node, PiBool):
+        return make_bool(node.value)
+    if isinstance(node, PiNone):
+        return VNoneValue
+    if isinstance(node, PiString):
+        return VString(node.value)
+    if isinstance(node, PiConstant):
+        return node.value
+    if isinstance(node, PiTuple):
+        elements = tuple(_constant_value(e) for e in node.elements)
+        if any(e is None for e in elements):
+            return None
+        return VTuple(elements)
+    return None
+
+def _literal(value: EnvValue) -> PiStatement | None:
+    """Retourne le nœud qui représente une valeur précalculée, ou None."""
+    if isinstance(value, VBool):
+        return PiBool(value=value.value)
+    if isinstance(value, VNumber):
+        return PiNumber(value=value.value)
+    if isinstance(value, VNone):
+        return PiNone(value=None)
+    if isinstance(value, VString) and len(value.value) <= MAX_FOLDED_SIZE:
+        return PiString(value=value.value)
+    if isinstance(value, VTuple) and len(value.value) <= MAX_FOLDED_SIZE:
+        return PiConstant(value=value)
+    return None
+
+def _is_logic_operand(value: EnvValue | None) -> bool:
+    """Indique si une valeur connue est acceptée par not/and/or."""
+    if value is None:
+        return False
+    try:
+        _check_valid_piandor_type(value)
+    except TypeError:
+        return False
+    return True
+
+def _is_pure(node: PiStatement) -> bool:
+    """Indique si l'évaluation d'une expression n'a ni effet ni erreur possible."""
+    if isinstance(node, _LITERALS):
+        return True
+    if isinstance(node, (PiList, PiTuple)):
+        return all(_is_pure(e) for e in node.elements)
+    return False
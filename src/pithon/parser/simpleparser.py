@@ -1,10 +1,12 @@
 import ast
+from dataclasses import fields
 
 from pithon.syntax import (
     PiAssignment, PiBinaryOperation, PiNumber, PiBool, PiVariable, PiIfThenElse,
-    PiNot, PiAnd, PiOr, PiWhile, PiExpression, PiNone, PiList, PiTuple,
+    PiNot, PiAnd, PiOr, PiWhile, PiExpression, PiNone, PiList, PiTuple, PiDict, PiSet,
     PiString, PiFunctionDef, PiFunctionCall, PiFor, PiBreak, PiContinue, PiIn,
-    PiReturn, PiSubscript, PiClassDef, PiAttribute, PiAttributeAssignment
+    PiReturn, PiSubscript, PiSlice, PiSubscriptAssignment, PiClassDef, PiAttribute, PiAttributeAssignment,
+    PiNode, make_position
 )
 
 class SimpleParser(ast.NodeVisitor):
@@ -17,10 +19,16 @@ class SimpleParser(ast.NodeVisitor):
         tree = ast.parse(source_code)
         return [self.visit(stmt) for stmt in tree.body]
 
+    def visit(self, node: ast.AST):
+        result = super().visit(node)
+        if isinstance(result, PiNode) and hasattr(node, "lineno"):
+            _locate(result, make_position(node.lineno, node.col_offset))
+        return result
+
     def visit_Expr(self, node: ast.Expr) -> PiExpression:
         return self.visit(node.value)
 
-    def visit_Assign(self, node: ast.Assign) -> PiAssignment | PiAttributeAssignment:
+    def visit_Assign(self, node: ast.Assign) -> PiAssignment | PiAttributeAssignment | PiSubscriptAssignment:
         if len(node.targets) != 1:
             raise ValueError("Seule l'affectation simple est prise en charge.")
         target = node.targets[0]
@@ -33,8 +41,13 @@ class SimpleParser(ast.NodeVisitor):
             # Attribute assignment
             obj = self.visit(target.value)
             return PiAttributeAssignment(object=obj, attr=target.attr, value=value)
+        elif isinstance(target, ast.Subscript):
+            # Item assignment
+            collection = self.visit(target.value)
+            index = self.visit(target.slice)
+            return PiSubscriptAssignment(collection=collection, index=index, value=value)
         else:
-            raise ValueError("Les affectations ne peuvent être faites qu'à des variables ou des attributs.")
+            raise ValueError("Les affectations ne peuvent être faites qu'à des variables, des attributs ou des éléments.")
 
     def visit_BinOp(self, node: ast.BinOp) -> PiBinaryOperation:
         left = self.visit(node.left)
@@ -65,6 +78,17 @@ class SimpleParser(ast.NodeVisitor):
         elements = tuple(self.visit(elt) for elt in node.elts)
         return PiTuple(elements=elements)
 
+    def visit_Dict(self, node: ast.Dict) -> PiDict:
+        if any(key is None for key in node.keys):
+            raise ValueError("Le dépaquetage (**) n'est pas supporté dans les dictionnaires.")
+        keys = [self.visit(key) for key in node.keys]
+        values = [self.visit(value) for value in node.values]
+        return PiDict(keys=keys, values=values)
+
+    def visit_Set(self, node: ast.Set) -> PiSet:
+        elements = [self.visit(elt) for elt in node.elts]
+        return PiSet(elements=elements)
+
     def visit_If(self, node: ast.If) -> PiIfThenElse:
         condition = self.visit(node.test)
         then_branch = [self.visit(stmt) for stmt in node.body]
@@ -157,12 +181,19 @@ class SimpleParser(ast.NodeVisitor):
         index = self.visit(node.slice)
         return PiSubscript(collection=collection, index=index)
 
+    def visit_Slice(self, node: ast.Slice) -> PiSlice:
+        lower, upper, step = (
+            self.visit(bound) if bound is not None else PiNone(value=None)
+            for bound in (node.lower, node.upper, node.step)
+        )
+        return PiSlice(lower=lower, upper=upper, step=step)
+
     def visit_ClassDef(self, node: ast.ClassDef) -> PiClassDef:
         name = node.name
         methods = []
         for stmt in node.body:
             if isinstance(stmt, ast.FunctionDef):
-                methods.append(self.visit_FunctionDef(stmt))
+                methods.append(self.visit(stmt))
             else:
                 raise ValueError("Seules les définitions de méthodes sont autorisées dans les classes.")
         return PiClassDef(name=name, methods=methods)
@@ -203,3 +234,17 @@ class SimpleParser(ast.NodeVisitor):
     def generic_visit(self, node):
         raise ValueError(f"Type de nœud AST non supporté : {type(node).__name__}")
 
+
+def _locate(node: PiNode, pos: int) -> None:
+    """Donne la position `pos` au nœud et aux sous-nœuds créés sans position."""
+    if node.pos:
+        return
+    node.pos = pos
+    for f in fields(node):
+        child = getattr(node, f.name)
+        if isinstance(child, PiNode):
+            _locate(child, pos)
+        elif isinstance(child, (list, tuple)):
+            for c in child:
+                if isinstance(c, PiNode):
+                    _locate(c, pos)
@@ -0,0 +1,209 @@
+"""
+Profileurs de programmes Pithon (`pithon --profile` et `pithon --profile-lines`).
+
+L'instrumentation se fait à la compilation (voir pithon.evaluator.compiler) :
+quand un instrument est fourni, chaque nœud compilé et chaque corps de
+fonction ou de méthode peut être enveloppé dans une autre fonction. Sans
+instrument, le code compilé est identique à l'ordinaire : aucun coût par nœud.
+
+`Profiler` mesure le temps d'exécution de chaque nœud et de chaque appel. Il relève :
+- par fonction et par méthode (`Classe.méthode`) : le nombre d'appels, le
+  temps total (appels récursifs comptés une seule fois) et le temps propre
+  (sans les fonctions appelées);
+- par type de nœud : le nombre d'exécutions et le temps propre (sans les
+  sous-nœuds);
+- par pile d'appels : le temps propre, exporté au format « collapsed stacks »
+  lu par les outils de flamegraph (`flamegraph.pl`, speedscope, ...).
+
+`LineSampler` est un profileur par échantillonnage : un minuteur interrompt
+régulièrement le programme et note la ligne Pithon en cours d'exécution, ce
+qui donne les lignes les plus coûteuses sans mesurer chaque nœud.
+"""
+
+import signal
+import time
+from collections import Counter
+from typing import Callable
+
+from pithon.syntax import PiNode, position
+
+MODULE = "<module>"
+
+
+class Instrument:
+    """Base des instruments de compilation : par défaut, le code est inchangé."""
+
+    def wrap_node(self, node: PiNode, code: Callable) -> Callable:
+        """Retourne le code compilé d'un nœud, instrumenté au besoin."""
+        return code
+
+    def wrap_function(self, name: str, code: Callable) -> Callable:
+        """Retourne le corps compilé d'une fonction, instrumenté au besoin."""
+        return code
+
+    def run(self, code: Callable, env):
+        """Exécute le code compilé d'un programme."""
+        return code(env)
+
+
+class Profiler(Instrument):
+    """Accumule les mesures d'une exécution profilée."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        # nom -> [appels, temps total, temps propre]
+        self.functions: dict[str, list] = {}
+        # type de nœud -> [exécutions, temps propre]
+        self.nodes: dict[str, list] = {}
+        # pile d'appels (tuple de noms) -> temps propre
+        self.stacks: Counter = Counter()
+        self.total_time = 0.0
+        self._path: list[str] = []
+        self._function_children: list[float] = []
+        self._node_children: list[float] = []
+        self._depth: Counter = Counter()
+
+    def wrap_node(self, node: PiNode, code: Callable) -> Callable:
+        """Enveloppe le code compilé d'un nœud pour mesurer ses exécutions."""
+        stats = self.nodes.setdefault(type(node).__name__, [0, 0.0])
+        children = self._node_children
+        clock = self.clock
+
+        def profiled_node(env):
+            children.append(0.0)
+            start = clock()
+            try:
+                return code(env)
+            finally:
+                elapsed = clock() - start
+                stats[0] += 1
+                stats[1] += elapsed - children.pop()
+                if children:
+                    children[-1] += elapsed
+        return profiled_node
+
+    def wrap_function(self, name: str, code: Callable) -> Callable:
+        """Enveloppe le corps compilé d'une fonction pour mesurer ses appels."""
+        stats = self.functions.setdefault(name, [0, 0.0, 0.0])
+
+        def profiled_function(env):
+            return self._call(name, stats, code, env)
+        return profiled_function
+
+    def run(self, code: Callable, env):
+        """Exécute le code compilé d'un programme sous le profileur."""
+        stats = self.functions.setdefault(MODULE, [0, 0.0, 0.0])
+        start = self.clock()
+        try:
+            return self._call(MODULE, stats, code, env)
+        finally:
+            self.total_time += self.clock() - start
+
+    def _call(self, name, stats, code, env):
+        path, children, depth = self._path, self._function_children, self._depth
+        path.append(name)
+        children.append(0.0)
+        depth[name] += 1
+        start = self.clock()
+        try:
+            return code(env)
+        finally:
+            elapsed = self.clock() - start
+            own = elapsed - children.pop()
+            depth[name] -= 1
+            stats[0] += 1
+            stats[2] += own
+            if depth[name] == 0:
+                stats[1] += elapsed
+            self.stacks[tuple(path)] += own
+            path.pop()
+            if children:
+                children[-1] += elapsed
+
+    # --- Rapports ---
+
+    def report(self, title: str = "") -> str:
+        """Retourne le rapport texte, trié par temps propre décroissant."""
+        lines = []
+        if title:
+            lines.append(f"Profil de {title} ({self.total_time:.3f} s)")
+            lines.append("")
+        lines.append(f"{'fonction':<30}{'appels':>10}{'total (s)':>12}{'propre (s)':>12}")
+        for name, (calls, total, own) in sorted(self.functions.items(), key=lambda item: -item[1][2]):
+            lines.append(f"{name:<30}{calls:>10}{total:>12.4f}{own:>12.4f}")
+        lines.append("")
+        lines.append(f"{'nœud':<30}{'exécutions':>10}{'propre (s)':>12}")
+        for name, (hits, own) in sorted(self.nodes.items(), key=lambda item: -item[1][1]):
+            if hits:
+                lines.append(f"{name:<30}{hits:>10}{own:>12.4f}")
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> str:
+        """Retourne les piles d'appels au format « collapsed » (temps en microsecondes)."""
+        lines = []
+        for path, own in sorted(self.stacks.items()):
+            micros = round(own * 1_000_000)
+            if micros > 0:
+                lines.append(f"{';'.join(path)} {micros}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _line_marker(line: int, code: Callable) -> Callable:
+    """Enveloppe le code d'un nœud : le cadre de `sampled_line` porte sa ligne."""
+    # `line` en argument par défaut : c'est alors une variable locale du cadre.
+    def sampled_line(env, line=line):
+        return code(env)
+    return sampled_line
+
+_LINE_MARKER_CODE = _line_marker(0, lambda env: None).__code__
+
+
+class LineSampler(Instrument):
+    """Profileur par échantillonnage des lignes, piloté par un minuteur (SIGPROF)."""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        # ligne -> nombre d'échantillons
+        self.samples: Counter = Counter()
+        self.total = 0
+
+    def wrap_node(self, node: PiNode, code: Callable) -> Callable:
+        pos = position(node)
+        if pos is None:
+            return code
+        return _line_marker(pos[0], code)
+
+    def run(self, code: Callable, env):
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("L'échantillonnage des lignes n'est pas disponible sur ce système.")
+        previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return code(env)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def _sample(self, signum, frame) -> None:
+        """Note la ligne du nœud le plus interne en cours d'exécution."""
+        self.total += 1
+        while frame is not None:
+            if frame.f_code is _LINE_MARKER_CODE:
+                self.samples[frame.f_locals["line"]] += 1
+                return
+            frame = frame.f_back
+
+    def report(self, source: str, title: str = "", top: int = 20) -> str:
+        """Retourne les `top` lignes les plus échantillonnées, avec leur source."""
+        lines = source.splitlines()
+        report = []
+        if title:
+            report.append(f"Lignes les plus coûteuses de {title} "
+                          f"({self.total} échantillons, intervalle {self.interval * 1000:g} ms)")
+            report.append("")
+        report.append(f"{'ligne':>6}{'échantillons':>14}{'%':>7}   source")
+        for line, count in self.samples.most_common(top):
+            text = lines[line - 1].strip() if 0 < line <= len(lines) else ""
+            share = 100 * count / self.total if self.total else 0.0
+            report.append(f"{line:>6}{count:>14}{share:>7.1f}   {text}")
+        return "\n".join(report)
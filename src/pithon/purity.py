@@ -0,0 +1,172 @@
+"""
+Analyse de pureté et mémoïsation des fonctions Pithon (`pithon --memoize`).
+
+Une fonction définie au niveau principal est pure si son résultat ne dépend
+que de ses arguments et si son appel n'a aucun effet observable :
+- son corps n'affecte ni attribut ni élément de liste, ne définit ni
+  fonction ni classe, et n'appelle aucune méthode (`xs.append(x)` modifie xs);
+- elle ne lit que ses variables locales, des fonctions pures et les
+  primitives pures (`range`, `str`, `set`); `print` et les variables globales,
+  qui peuvent changer entre deux appels, la rendent impure;
+- elle n'appelle que des fonctions pures, désignées par leur nom.
+
+Les noms affectés plus d'une fois au niveau principal (fonction redéfinie,
+primitive masquée) ne sont jamais considérés comme purs. L'analyse se fait sur
+le programme résolu (voir pithon.resolver) : les lectures de variables locales
+y sont déjà distinguées des autres. Avec `--dynamic-operators`, les opérateurs
+deviennent des appels de variables globales redéfinissables : les fonctions
+qui les utilisent ne sont donc pas mémoïsées.
+
+Chaque fonction pure reçoit une table (`MemoTable`) attachée à sa définition.
+Un appel dont les arguments sont des valeurs immuables (nombres, chaînes,
+booléens, None et tuples de telles valeurs) est d'abord cherché dans la table;
+sinon, son résultat y est conservé s'il est lui-même immuable. La table est
+bornée : l'entrée utilisée le moins récemment est évincée.
+"""
+
+from collections import OrderedDict
+from typing import Callable
+
+from pithon.evaluator.envvalue import EnvValue, VNumber, VString, VRope, VStringView, VBool, VNone, VTuple, VTupleView
+from pithon.syntax import (
+    PiProgram, PiStatement, PiAssignment, PiFunctionDef, PiClassDef, PiFor, PiFunctionCall,
+    PiVariable, PiLocalVariable, PiGlobalVariable, PiAttributeAssignment, PiSubscriptAssignment, map_children
+)
+
+# Taille par défaut d'une table de mémoïsation.
+DEFAULT_MEMO_SIZE = 1024
+
+# Primitives sans effet dont le résultat ne dépend que des arguments.
+PURE_PRIMITIVES = frozenset({"range", "str", "set"})
+
+
+class MemoTable:
+    """Résultats mémorisés d'une fonction pure, avec éviction LRU."""
+    __slots__ = ("size", "entries", "hits", "misses")
+
+    def __init__(self, size: int = DEFAULT_MEMO_SIZE):
+        self.size = size
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, args: list[EnvValue]) -> tuple | None:
+        """Retourne la clé d'un appel, ou None si un argument n'est pas immuable."""
+        keys = tuple(_value_key(arg) for arg in args)
+        return None if None in keys else keys
+
+    def get(self, key: tuple) -> EnvValue | None:
+        """Retourne le résultat mémorisé d'un appel, ou None s'il est absent."""
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: tuple, result: EnvValue) -> None:
+        """Mémorise le résultat d'un appel s'il est immuable."""
+        if _value_key(result) is None:
+            return
+        self.entries[key] = result
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def call(self, args: list[EnvValue], compute: Callable[[], EnvValue]) -> EnvValue:
+        """Retourne le résultat d'un appel, mémorisé ou calculé par `compute()`."""
+        key = self.key(args)
+        if key is None:
+            return compute()
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+
+def _value_key(value: EnvValue):
+    """Retourne une clé hachable qui identifie une valeur immuable, ou None."""
+    cls = type(value)
+    if cls is VNumber:
+        number = value.value
+        # 2 et 2.0 (ou 0.0 et -0.0) ne s'affichent pas de la même façon.
+        return number if type(number) is int else ("float", number.hex())
+    if cls is VString or cls is VRope or cls is VStringView:
+        return ("str", value.value)
+    if cls is VBool:
+        return ("bool", value.value)
+    if cls is VNone:
+        return ("none",)
+    if cls is VTuple or cls is VTupleView:
+        keys = tuple(_value_key(v) for v in value.value)
+        return None if None in keys else ("tuple", keys)
+    return None
+
+
+def pure_functions(program: PiProgram) -> set[str]:
+    """Retourne les noms des fonctions pures définies au niveau principal d'un programme résolu."""
+    counts: dict[str, int] = {}
+    for stmt in program:
+        _count_bindings(stmt, counts)
+    candidates = {
+        stmt.name: stmt for stmt in program
+        if isinstance(stmt, PiFunctionDef) and stmt.layout is not None and counts[stmt.name] == 1
+    }
+    pure_primitives = {name for name in PURE_PRIMITIVES if name not in counts}
+    # Point fixe : on suppose toutes les candidates pures, puis on retire
+    # celles qui dépendent d'une fonction impure.
+    pure = set(candidates)
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure):
+            if not all(_is_pure(stmt, pure | pure_primitives) for stmt in candidates[name].body):
+                pure.discard(name)
+                changed = True
+    return pure
+
+def memoize(program: PiProgram, size: int = DEFAULT_MEMO_SIZE) -> dict[str, MemoTable]:
+    """Attache une table de mémoïsation aux fonctions pures; retourne les tables par nom."""
+    pure = pure_functions(program)
+    tables = {}
+    for stmt in program:
+        if isinstance(stmt, PiFunctionDef) and stmt.name in pure:
+            stmt.memo = tables[stmt.name] = MemoTable(size)
+    return tables
+
+def memo_report(tables: dict[str, MemoTable]) -> str:
+    """Retourne les compteurs des tables de mémoïsation."""
+    lines = [f"{'fonction mémoïsée':<30}{'succès':>10}{'échecs':>10}{'entrées':>10}"]
+    for name, table in sorted(tables.items()):
+        lines.append(f"{name:<30}{table.hits:>10}{table.misses:>10}{len(table.entries):>10}")
+    return "\n".join(lines)
+
+def _count_bindings(node, counts: dict[str, int]) -> None:
+    """Compte les liaisons de chaque nom au niveau principal."""
+    if isinstance(node, (PiAssignment, PiFor, PiFunctionDef, PiClassDef)):
+        name = node.var if isinstance(node, PiFor) else node.name
+        counts[name] = counts.get(name, 0) + 1
+        if isinstance(node, (PiFunctionDef, PiClassDef)):
+            return
+    map_children(node, lambda child: _count_bindings(child, counts))
+
+def _is_pure(node: PiStatement, pure: set[str]) -> bool:
+    """Indique si un nœud du corps d'une fonction est sans effet, étant donné les noms purs."""
+    if isinstance(node, (PiAttributeAssignment, PiSubscriptAssignment, PiFunctionDef, PiClassDef, PiVariable)):
+        return False
+    if isinstance(node, PiLocalVariable):
+        return node.depth == 0
+    if isinstance(node, PiGlobalVariable):
+        return node.name in pure
+    if isinstance(node, PiFunctionCall) and not isinstance(node.function, PiGlobalVariable):
+        # Appel d'une valeur calculée (méthode, variable locale...) : inconnu.
+        return False
+    result = True
+
+    def visit(child):
+        nonlocal result
+        result = result and _is_pure(child, pure)
+        return child
+    map_children(node, visit)
+    return result
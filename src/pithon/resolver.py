@@ -0,0 +1,124 @@
+"""
+Résolution statique des variables locales des fonctions Pithon.
+
+Chaque fonction reçoit une disposition de cadre (`PiFrameLayout`) qui attribue
+un emplacement fixe à chacune de ses variables locales : paramètres, variables
+affectées, variables de boucle, fonctions et classes définies dans son corps.
+Dans le corps des fonctions, chaque lecture de variable locale ou englobante
+devient un `PiLocalVariable(name, depth, slot)` et chaque affectation un
+`PiLocalAssignment(name, slot, value)`. Les autres variables deviennent des
+`PiGlobalVariable(name, depth)`, cherchées par nom directement dans le cadre
+dynamique qui englobe la fonction la plus externe. Les appels utilisent alors des cadres
+à emplacements (`SlotFrame`) au lieu de dictionnaires.
+
+Les variables du niveau principal (et de la REPL) ne sont pas résolues : elles
+restent dans un cadre dynamique.
+
+Avec `dynamic_operators=True`, chaque opération binaire est d'abord réécrite en
+appel de la variable qui porte le nom de l'opérateur (`a + b` devient `+(a, b)`),
+ce qui permet à un programme de redéfinir un opérateur dans l'environnement.
+Par défaut, les opérateurs sont appliqués directement par l'évaluateur.
+"""
+
+from dataclasses import replace
+from pithon.evaluator.envframe import BindingPlan
+from pithon.syntax import (
+    PiAssignment, PiLocalAssignment, PiVariable, PiLocalVariable, PiGlobalVariable, PiProgram, PiStatement,
+    PiFunctionDef, PiFrameLayout, PiClassDef, PiFor, PiBinaryOperation, PiFunctionCall, map_children, located
+)
+
+# Portées des fonctions englobantes, de la plus interne à la plus externe.
+Scopes = tuple[dict[str, int], ...]
+
+
+def resolve(program: PiProgram, dynamic_operators: bool = False) -> PiProgram:
+    """Retourne le programme avec les variables des fonctions résolues."""
+    if dynamic_operators:
+        program = _operators_as_calls(program)
+    return [_resolve(stmt, ()) for stmt in program]
+
+def _operators_as_calls(node):
+    """Réécrit les opérations binaires en appels de la variable de l'opérateur."""
+    if isinstance(node, list):
+        return [_operators_as_calls(n) for n in node]
+    if isinstance(node, PiBinaryOperation):
+        return located(PiFunctionCall(
+            function=located(PiVariable(name=node.operator), node),
+            args=[_operators_as_calls(node.left), _operators_as_calls(node.right)]
+        ), node)
+    return map_children(node, _operators_as_calls)
+
+def _resolve(node, scopes: Scopes):
+    """Résout un nœud dans les portées données."""
+    if isinstance(node, PiVariable):
+        for depth, scope in enumerate(scopes):
+            if node.name in scope:
+                return located(PiLocalVariable(name=node.name, depth=depth, slot=scope[node.name]), node)
+        if scopes:
+            return located(PiGlobalVariable(name=node.name, depth=len(scopes)), node)
+        return node
+
+    if isinstance(node, PiAssignment) and scopes:
+        value = _resolve(node.value, scopes)
+        return located(PiLocalAssignment(name=node.name, slot=scopes[0][node.name], value=value), node)
+
+    if isinstance(node, PiFunctionDef):
+        return _resolve_function(node, scopes)
+
+    if isinstance(node, PiClassDef):
+        methods = [_resolve_function(m, scopes) for m in node.methods]
+        return replace(node, methods=methods)
+
+    return map_children(node, lambda child: _resolve(child, scopes))
+
+def _resolve_function(funcdef: PiFunctionDef, scopes: Scopes) -> PiFunctionDef:
+    """Calcule la disposition du cadre d'une fonction et résout son corps."""
+    params = list(funcdef.arg_names)
+    if funcdef.vararg:
+        params.append(funcdef.vararg)
+    if len(set(params)) != len(params):
+        # Paramètres en double : on garde un cadre dynamique.
+        body = [_resolve(stmt, ()) for stmt in funcdef.body]
+        return replace(funcdef, body=body, layout=None)
+
+    names = list(params)
+    for name in _local_names(funcdef.body):
+        if name not in names:
+            names.append(name)
+
+    layout = PiFrameLayout(names=tuple(names))
+    body = [_resolve(stmt, (layout.slots,) + scopes) for stmt in funcdef.body]
+    plan = BindingPlan(layout, len(funcdef.arg_names), funcdef.vararg is not None, not _captures_frame(body))
+    return replace(funcdef, body=body, layout=layout, plan=plan)
+
+def _captures_frame(stmts: list[PiStatement]) -> bool:
+    """Indique si un corps définit une fonction ou une classe, qui garderait le cadre d'appel."""
+    found = False
+
+    def visit(node):
+        nonlocal found
+        if isinstance(node, (PiFunctionDef, PiClassDef)):
+            found = True
+        elif not found:
+            map_children(node, visit)
+        return node
+    for stmt in stmts:
+        visit(stmt)
+    return found
+
+def _local_names(stmts: list[PiStatement]) -> list[str]:
+    """Retourne, dans l'ordre d'apparition, les noms liés par un corps de fonction."""
+    names = []
+    for stmt in stmts:
+        _collect_bindings(stmt, names)
+    return names
+
+def _collect_bindings(node, names: list[str]) -> None:
+    if isinstance(node, (PiAssignment, PiFor, PiFunctionDef, PiClassDef)):
+        name = node.var if isinstance(node, PiFor) else node.name
+        if name not in names:
+            names.append(name)
+        if isinstance(node, (PiFunctionDef, PiClassDef)):
+            # Le corps d'une fonction imbriquée a sa propre portée.
+            return
+    map_children(node, lambda child: _collect_bindings(child, names))
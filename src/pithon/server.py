@@ -0,0 +1,263 @@
+"""
+Service d'exécution de programmes Pithon : `pithon serve`.
+
+Le processus serveur importe l'interpréteur et construit l'environnement
+initial une seule fois. Il reçoit ensuite des programmes sur son entrée
+standard, ou sur un socket Unix avec `--socket CHEMIN`. Chaque programme est
+exécuté dans un processus fils créé par `fork`, qui hérite de tout ce qui est
+déjà chargé. Le fils reçoit sa propre copie de l'environnement initial, si
+bien que les programmes sont isolés les uns des autres. Seul le coût du `fork`
+s'ajoute à celui de l'exécution.
+
+Le protocole est en lignes JSON. Chaque requête est un objet
+`{"id": ..., "source": "..."}`. Le serveur répond par zéro ou plusieurs
+objets `{"id": ..., "stdout": "..."}`, transmis au fur et à mesure que le
+programme écrit, puis par un objet final :
+
+    {"id": ..., "status": "ok" | "error" | "limit" | "timeout", "error": "...", "duration": 0.002}
+
+Le statut `limit` signale le dépassement d'une limite de ressources fixée avec
+`--fuel`, `--time-limit` ou `--max-size` (voir pithon.evaluator.limits).
+
+Les programmes sont exécutés l'un après l'autre, dans l'ordre des requêtes;
+les connexions au socket sont aussi servies l'une après l'autre. Les arbres
+analysés sont gardés en mémoire, par source, pour les programmes soumis
+plusieurs fois. Sans `fork` (Windows), les programmes sont exécutés dans le
+processus serveur, sans délai maximal.
+
+    pithon serve [--socket CHEMIN] [--timeout S]
+"""
+
+import argparse
+import codecs
+import contextlib
+import hashlib
+import io
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from collections import OrderedDict
+from typing import TextIO
+
+from pithon.evaluator.compiler import evaluate_compiled
+from pithon.evaluator.evaluator import initial_env
+from pithon.evaluator.limits import Limits, LimitExceeded, limited
+from pithon.optimizer import optimize
+from pithon.parser.simpleparser import SimpleParser
+from pithon.purity import memoize
+from pithon.resolver import resolve
+from pithon.vm.machine import evaluate_vm
+
+DEFAULT_TIMEOUT = 10.0
+
+# Nombre d'arbres analysés gardés en mémoire.
+PARSED_CACHE_SIZE = 256
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_LIMIT = "limit"
+STATUS_TIMEOUT = "timeout"
+
+# Codes de sortie du processus fils.
+_EXIT_OK = 0
+_EXIT_ERROR = 1
+_EXIT_LIMIT = 2
+
+
+class ProgramServer:
+    """Exécute des programmes avec un environnement initial construit une seule fois."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, use_vm=False, dynamic_operators=False,
+                 optimized=True, memo_size=0, limits: Limits | None = None, use_fork: bool | None = None):
+        self.timeout = timeout
+        self.use_vm = use_vm
+        self.dynamic_operators = dynamic_operators
+        self.optimized = optimized
+        self.memo_size = memo_size
+        self.limits = limits
+        self.use_fork = hasattr(os, "fork") if use_fork is None else use_fork
+        self.template = initial_env()
+        self.parsed: OrderedDict = OrderedDict()
+
+    def parse(self, source: str):
+        """Retourne le programme analysé et optimisé, depuis la mémoire s'il a déjà été vu."""
+        key = hashlib.sha256(source.encode("utf-8")).digest()
+        tree = self.parsed.get(key)
+        if tree is None:
+            tree = SimpleParser().parse(source)
+            if self.optimized:
+                tree = optimize(tree, self.dynamic_operators)
+            tree = resolve(tree, self.dynamic_operators)
+            self.parsed[key] = tree
+            if len(self.parsed) > PARSED_CACHE_SIZE:
+                self.parsed.popitem(last=False)
+        else:
+            self.parsed.move_to_end(key)
+        return tree
+
+    def evaluate(self, tree) -> None:
+        """Évalue un programme dans une copie de l'environnement initial."""
+        if self.memo_size:
+            memoize(tree, self.memo_size)
+        evaluate = evaluate_vm if self.use_vm else evaluate_compiled
+        with limited(self.limits):
+            evaluate(tree, self.template.copy_shallow())
+
+    def run(self, request_id, source: str, send) -> None:
+        """Exécute un programme; `send(message)` reçoit les messages de réponse."""
+        start = time.perf_counter()
+        try:
+            tree = self.parse(source)
+        except Exception as e:
+            send(_final(request_id, STATUS_ERROR, start, f"{type(e).__name__}: {e}"))
+            return
+        if self.use_fork:
+            status, error = self._run_forked(request_id, tree, send)
+        else:
+            status, error = self._run_inline(request_id, tree, send)
+        send(_final(request_id, status, start, error))
+
+    def _run_inline(self, request_id, tree, send) -> tuple[str, str]:
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                self.evaluate(tree)
+            status, error = STATUS_OK, ""
+        except LimitExceeded as e:
+            status, error = STATUS_LIMIT, f"{type(e).__name__}: {e}"
+        except Exception as e:
+            status, error = STATUS_ERROR, f"{type(e).__name__}: {e}"
+        if output.getvalue():
+            send({"id": request_id, "stdout": output.getvalue()})
+        return status, error
+
+    def _run_forked(self, request_id, tree, send) -> tuple[str, str]:
+        out_read, out_write = os.pipe()
+        err_read, err_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(out_read)
+            os.close(err_read)
+            _child(self, tree, out_write, err_write)
+        os.close(out_write)
+        os.close(err_write)
+
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        error = b""
+        # Un caractère UTF-8 peut être coupé entre deux lectures du tube.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        timed_out = False
+        open_fds = {out_read, err_read}
+        try:
+            while open_fds:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    os.kill(pid, signal.SIGKILL)
+                    break
+                ready, _, _ = select.select(list(open_fds), [], [], remaining)
+                for fd in ready:
+                    data = os.read(fd, 65536)
+                    if fd == out_read:
+                        text = decoder.decode(data, final=not data)
+                        if text:
+                            send({"id": request_id, "stdout": text})
+                    else:
+                        error += data
+                    if not data:
+                        open_fds.discard(fd)
+        finally:
+            os.close(out_read)
+            os.close(err_read)
+            _, wait_status = os.waitpid(pid, 0)
+
+        if timed_out:
+            return STATUS_TIMEOUT, f"plus de {self.timeout:g} s"
+        code = os.WEXITSTATUS(wait_status) if os.WIFEXITED(wait_status) else None
+        if code == _EXIT_OK:
+            return STATUS_OK, ""
+        message = error.decode("utf-8", errors="replace")
+        if code == _EXIT_LIMIT:
+            return STATUS_LIMIT, message
+        return STATUS_ERROR, message or f"processus terminé anormalement ({wait_status})"
+
+    # --- Transports ---
+
+    def serve_stream(self, reader: TextIO, writer: TextIO) -> None:
+        """Sert les requêtes lues ligne par ligne jusqu'à la fin de `reader`."""
+        def send(message):
+            writer.write(json.dumps(message, ensure_ascii=False) + "\n")
+            writer.flush()
+
+        for line in reader:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                request_id, source = request.get("id"), request["source"]
+            except (ValueError, KeyError, AttributeError) as e:
+                send({"id": None, "status": STATUS_ERROR, "error": f"Requête invalide : {e}", "duration": 0.0})
+                continue
+            self.run(request_id, source, send)
+
+    def serve_socket(self, path: str) -> None:
+        """Sert les connexions d'un socket Unix, l'une après l'autre."""
+        if os.path.exists(path):
+            os.unlink(path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen()
+            try:
+                while True:
+                    connection, _ = server.accept()
+                    with connection, connection.makefile("r", encoding="utf-8") as reader, \
+                            connection.makefile("w", encoding="utf-8") as writer:
+                        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                            self.serve_stream(reader, writer)
+            finally:
+                os.unlink(path)
+
+
+def _child(server: ProgramServer, tree, out_fd: int, err_fd: int) -> None:
+    """Exécute le programme dans le processus fils, puis le termine sans retour."""
+    code = _EXIT_ERROR
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        sys.stdout = os.fdopen(out_fd, "w", encoding="utf-8", buffering=1)
+        try:
+            server.evaluate(tree)
+            code = _EXIT_OK
+        except Exception as e:
+            if isinstance(e, LimitExceeded):
+                code = _EXIT_LIMIT
+            os.write(err_fd, f"{type(e).__name__}: {e}".encode("utf-8"))
+        sys.stdout.flush()
+    finally:
+        os._exit(code)
+
+def _final(request_id, status: str, start: float, error: str = "") -> dict:
+    message = {"id": request_id, "status": status, "duration": time.perf_counter() - start}
+    if error:
+        message["error"] = error
+    return message
+
+def serve_main(args: list[str], use_vm=False, dynamic_operators=False, optimized=True, memo_size=0,
+               limits: Limits | None = None) -> int:
+    """Point d'entrée de `pithon serve`; retourne le code de sortie."""
+    parser = argparse.ArgumentParser(prog="pithon serve")
+    parser.add_argument("--socket", help="chemin du socket Unix (entrée standard par défaut)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="délai par programme, en secondes")
+    ns = parser.parse_args(args)
+    server = ProgramServer(ns.timeout, use_vm, dynamic_operators, optimized, memo_size, limits)
+    try:
+        if ns.socket:
+            server.serve_socket(ns.socket)
+        else:
+            server.serve_stream(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+    return 0
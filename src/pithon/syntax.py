@@ -1,130 +1,223 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
+
+# Une position dans la source est compactée en un seul entier : la ligne dans
+# les bits de poids fort, la colonne dans les 16 bits de poids faible.
+_COLUMN_BITS = 16
+_COLUMN_MASK = (1 << _COLUMN_BITS) - 1
+
+def make_position(line: int, column: int) -> int:
+    """Compacte une position (ligne à partir de 1, colonne à partir de 0)."""
+    return (line << _COLUMN_BITS) | min(column, _COLUMN_MASK)
+
+def position(node: 'PiNode') -> tuple[int, int] | None:
+    """Retourne la position (ligne, colonne) d'un nœud, ou None si elle est inconnue."""
+    if not node.pos:
+        return None
+    return node.pos >> _COLUMN_BITS, node.pos & _COLUMN_MASK
+
+def located(node: 'PiNode', origin: 'PiNode') -> 'PiNode':
+    """Donne à un nœud créé par une transformation la position du nœud d'origine."""
+    node.pos = origin.pos
+    return node
 
 @dataclass
-class PiNone:
+class PiNode:
+    """Base des nœuds de l'arbre. `pos` est la position compactée dans la source, 0 si inconnue."""
+    pos: int = field(default=0, kw_only=True, compare=False, repr=False)
+
+@dataclass
+class PiNone(PiNode):
     value: None
 
 @dataclass
-class PiNumber:
+class PiNumber(PiNode):
     value: float
 
 @dataclass
-class PiBool:
+class PiBool(PiNode):
     value: bool
 
 @dataclass
-class PiVariable:
+class PiConstant(PiNode):
+    """Valeur d'exécution précalculée par l'optimiseur (par ex. un tuple de constantes)."""
+    value: object
+
+@dataclass
+class PiVariable(PiNode):
+    name: str
+
+@dataclass
+class PiLocalVariable(PiNode):
+    """Variable locale résolue : emplacement `slot` du cadre situé `depth` niveaux plus haut."""
+    name: str
+    depth: int
+    slot: int
+
+@dataclass
+class PiGlobalVariable(PiNode):
+    """Variable non locale d'une fonction : cherchée par nom à partir du cadre situé `depth` niveaux plus haut."""
     name: str
+    depth: int
 
 @dataclass
-class PiBinaryOperation:
+class PiBinaryOperation(PiNode):
     left: 'PiExpression'
     operator: str
     right: 'PiExpression'
 
 @dataclass
-class PiAssignment:
+class PiAssignment(PiNode):
+    name: str
+    value: 'PiExpression'
+
+@dataclass
+class PiLocalAssignment(PiNode):
+    """Affectation résolue dans l'emplacement `slot` du cadre courant."""
     name: str
+    slot: int
     value: 'PiExpression'
 
 @dataclass
-class PiIfThenElse:
+class PiIfThenElse(PiNode):
     condition: 'PiExpression'
     then_branch: list['PiStatement']
     else_branch: list['PiStatement']
 
 @dataclass
-class PiNot:
+class PiNot(PiNode):
     operand: 'PiExpression'
 
 @dataclass
-class PiAnd:
+class PiAnd(PiNode):
     left: 'PiExpression'
     right: 'PiExpression'
 
 @dataclass
-class PiOr:
+class PiOr(PiNode):
     left: 'PiExpression'
     right: 'PiExpression'
 
 @dataclass
-class PiWhile:
+class PiWhile(PiNode):
     condition: 'PiExpression'
     body: list['PiStatement']
 
 @dataclass
-class PiList:
+class PiList(PiNode):
     elements: list['PiExpression']
 
 @dataclass
-class PiTuple:
+class PiTuple(PiNode):
     elements: tuple['PiExpression', ...]
 
 @dataclass
-class PiString:
+class PiDict(PiNode):
+    keys: list['PiExpression']
+    values: list['PiExpression']
+
+@dataclass
+class PiSet(PiNode):
+    elements: list['PiExpression']
+
+@dataclass
+class PiString(PiNode):
     value: str
 
 @dataclass
-class PiFunctionDef:
+class PiFrameLayout:
+    """Emplacements des variables locales d'une fonction (voir pithon.resolver).
+
+    Les paramètres occupent les premiers emplacements, suivis du paramètre
+    variadique puis des autres variables locales.
+    """
+    names: tuple[str, ...]
+    slots: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.slots = {name: i for i, name in enumerate(self.names)}
+
+@dataclass
+class PiFunctionDef(PiNode):
     name: str
     arg_names: list[str]
     vararg: str | None
     body: list['PiStatement']
+    # Disposition du cadre d'appel, calculée par le résolveur (None : cadre dynamique).
+    layout: PiFrameLayout | None = field(default=None, repr=False, compare=False)
+    # Table de mémoïsation d'une fonction pure (voir pithon.purity), None sinon.
+    memo: object = field(default=None, kw_only=True, repr=False, compare=False)
+    # Plan de liaison des arguments (voir pithon.evaluator.envframe.BindingPlan), calculé avec `layout`.
+    plan: object = field(default=None, kw_only=True, repr=False, compare=False)
 
 @dataclass
-class PiFunctionCall:
+class PiFunctionCall(PiNode):
     function: 'PiExpression'
     args: list['PiExpression']
 
 @dataclass
-class PiFor:
+class PiFor(PiNode):
     var: str
     iterable: 'PiExpression'
     body: list['PiStatement']
 
 @dataclass
-class PiBreak:
+class PiBreak(PiNode):
     pass
 
 @dataclass
-class PiContinue:
+class PiContinue(PiNode):
     pass
 
 @dataclass
-class PiIn:
+class PiIn(PiNode):
     element: 'PiExpression'
     container: 'PiExpression'
 
 @dataclass
-class PiReturn:
+class PiReturn(PiNode):
     value: 'PiExpression'
 
 @dataclass
-class PiSubscript:
+class PiSubscript(PiNode):
     collection: 'PiExpression'
     index: 'PiExpression'
 
 @dataclass
-class PiClassDef:
+class PiSlice(PiNode):
+    """Bornes `a:b:c` d'une tranche, comme indice de PiSubscript; une borne absente est PiNone."""
+    lower: 'PiExpression'
+    upper: 'PiExpression'
+    step: 'PiExpression'
+
+@dataclass
+class PiSubscriptAssignment(PiNode):
+    collection: 'PiExpression'
+    index: 'PiExpression'
+    value: 'PiExpression'
+
+@dataclass
+class PiClassDef(PiNode):
     name: str
     methods: list['PiFunctionDef']
 
 @dataclass
-class PiAttribute:
+class PiAttribute(PiNode):
     object: 'PiExpression'
     attr: str
 
 @dataclass
-class PiAttributeAssignment:
+class PiAttributeAssignment(PiNode):
     object: 'PiExpression'
     attr: str
     value: 'PiExpression'
 
-PiValue = PiNumber | PiBool | PiNone | PiList | PiTuple | PiString
+PiValue = PiNumber | PiBool | PiNone | PiList | PiTuple | PiDict | PiSet | PiString | PiConstant
 
 PiExpression = (
     PiValue
     | PiVariable
+    | PiLocalVariable
+    | PiGlobalVariable
     | PiBinaryOperation
     | PiNot
     | PiAnd
@@ -132,13 +225,16 @@ PiExpression = (
     | PiFunctionCall
     | PiIn
     | PiSubscript
+    | PiSlice
     | PiAttribute
     | PiAttributeAssignment
 )
 
 PiStatement = (
     PiAssignment
+    | PiLocalAssignment
     | PiAttributeAssignment
+    | PiSubscriptAssignment
     | PiIfThenElse
     | PiWhile
     | PiFor
@@ -151,3 +247,23 @@ PiStatement = (
 )
 
 PiProgram = list[PiStatement]
+
+
+def map_children(node: PiStatement, fn) -> PiStatement:
+    """
+    Retourne une copie de `node` où chaque nœud enfant, direct ou contenu dans
+    une liste ou un tuple, est remplacé par `fn(enfant)`. Les autres champs
+    (noms, valeurs littérales) sont conservés tels quels.
+    """
+    changes = {}
+    for f in fields(node):  # type: ignore
+        child = getattr(node, f.name)
+        if isinstance(child, PiStatement):
+            changes[f.name] = fn(child)
+        elif isinstance(child, list):
+            changes[f.name] = [fn(c) if isinstance(c, PiStatement) else c for c in child]
+        elif isinstance(child, tuple):
+            changes[f.name] = tuple(fn(c) if isinstance(c, PiStatement) else c for c in child)
+    if not changes:
+        return node
+    return replace(node, **changes)  # type: ignore
@@ -0,0 +1,222 @@
+"""
+Exécution des programmes de test : `pithon --test`.
+
+Chaque programme `.py` du dossier de test (par défaut `tests/fixtures/programs`)
+est exécuté et sa sortie comparée au fichier `.out` correspondant, comme le
+fait `tests/test_cli.py`. Chaque programme est exécuté dans un nouveau
+processus (fork), et `jobs` processus (un par cœur par défaut) tournent en
+même temps : la durée totale est à peu près inversement proportionnelle au
+nombre de cœurs. Un programme ne voit pas l'état laissé par les précédents, et
+un programme qui plante l'interpréteur est compté en erreur sans interrompre
+la suite.
+
+Un programme qui dépasse le délai (10 s par défaut) est tué et compté comme
+hors délai. Sur les systèmes sans fork, les programmes sont exécutés l'un après
+l'autre dans le processus courant, interrompus par un minuteur (SIGALRM)
+lorsqu'il existe.
+
+    pithon --test [--jobs N] [--timeout S] [FICHIER_OU_DOSSIER ...]
+"""
+
+import argparse
+import contextlib
+import difflib
+import io
+import os
+import pickle
+import select
+import signal
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_TEST_DIR = Path("tests/fixtures/programs")
+DEFAULT_TIMEOUT = 10.0
+
+# Résultats possibles d'un programme.
+PASSED = "OK"
+FAILED = "ÉCHEC"
+ERROR = "ERREUR"
+TIMEOUT = "DÉLAI"
+
+
+@dataclass
+class ProgramResult:
+    """Résultat de l'exécution d'un programme de test."""
+    name: str
+    status: str
+    duration: float
+    # Différence de sortie, message d'erreur...
+    detail: str = ""
+
+
+class ProgramTimeout(BaseException):
+    """Levée quand un programme dépasse son délai. Dérive de BaseException pour
+    ne pas être interceptée par un `except Exception` de l'interpréteur."""
+
+
+@contextlib.contextmanager
+def _time_limit(seconds: float):
+    """Interrompt le bloc par ProgramTimeout après `seconds` secondes (0 : sans limite)."""
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ProgramTimeout()
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def run_program(path: str, timeout: float = DEFAULT_TIMEOUT, options: dict | None = None) -> ProgramResult:
+    """Exécute un programme de test et compare sa sortie au fichier .out."""
+    # Importé ici : pithon.cli importe ce module.
+    from pithon.cli import run_file
+
+    path = Path(path)
+    expected_path = path.with_suffix(".out")
+    if not expected_path.exists():
+        return ProgramResult(path.name, ERROR, 0.0, f"Fichier de sortie attendu manquant : {expected_path.name}")
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with _time_limit(timeout), contextlib.redirect_stdout(output):
+            run_file(path, **(options or {}))
+    except ProgramTimeout:
+        return ProgramResult(path.name, TIMEOUT, time.perf_counter() - start, f"plus de {timeout:g} s")
+    except Exception as e:
+        return ProgramResult(path.name, ERROR, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+    duration = time.perf_counter() - start
+
+    actual = output.getvalue()
+    expected = expected_path.read_text(encoding="utf-8")
+    if actual != expected:
+        diff = difflib.unified_diff(
+            expected.splitlines(keepends=True), actual.splitlines(keepends=True), "attendu", "obtenu"
+        )
+        return ProgramResult(path.name, FAILED, duration, "".join(diff))
+    return ProgramResult(path.name, PASSED, duration)
+
+def collect_programs(targets: list[str]) -> list[Path]:
+    """Retourne les programmes désignés : fichiers donnés et fichiers .py des dossiers donnés."""
+    programs = []
+    for target in targets:
+        target = Path(target)
+        if target.is_dir():
+            programs.extend(sorted(target.glob("*.py")))
+        else:
+            programs.append(target)
+    return programs
+
+
+@dataclass
+class _Child:
+    """Processus fils qui exécute un programme de test."""
+    index: int
+    path: str
+    pid: int
+    fd: int
+    start: float
+    # Résultat sérialisé, reçu par le tube.
+    output: bytes = b""
+
+
+def _start_child(index: int, path: str, options: dict) -> _Child:
+    """Lance un processus fils qui exécute le programme et transmet son résultat par un tube."""
+    read_fd, write_fd = os.pipe()
+    start = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            # Le délai est appliqué par le processus parent.
+            data = pickle.dumps(run_program(path, 0, options))
+            with os.fdopen(write_fd, "wb") as pipe:
+                pipe.write(data)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    return _Child(index, path, pid, read_fd, start)
+
+def _finish_child(child: _Child) -> ProgramResult:
+    """Attend la fin du processus fils; retourne son résultat, ou une erreur s'il n'en a pas transmis."""
+    os.close(child.fd)
+    _, wait_status = os.waitpid(child.pid, 0)
+    try:
+        return pickle.loads(child.output)
+    except Exception:
+        return ProgramResult(Path(child.path).name, ERROR, time.monotonic() - child.start,
+                             f"processus terminé anormalement ({wait_status})")
+
+def run_programs(programs: list[Path], jobs: int | None = None, timeout: float = DEFAULT_TIMEOUT,
+                 **options) -> list[ProgramResult]:
+    """Exécute les programmes, `jobs` processus à la fois; retourne les résultats dans l'ordre."""
+    jobs = min(jobs or os.cpu_count() or 1, len(programs))
+    paths = [str(p) for p in programs]
+    if not hasattr(os, "fork"):
+        return [run_program(path, timeout, options) for path in paths]
+
+    results: list[ProgramResult | None] = [None] * len(paths)
+    pending = list(enumerate(paths))
+    running: dict[int, _Child] = {}
+    while pending or running:
+        while pending and len(running) < jobs:
+            index, path = pending.pop(0)
+            child = _start_child(index, path, options)
+            running[child.fd] = child
+        now = time.monotonic()
+        wait = None if not timeout else max(0.0, min(c.start + timeout for c in running.values()) - now)
+        ready, _, _ = select.select(list(running), [], [], wait)
+        for fd in ready:
+            data = os.read(fd, 65536)
+            if data:
+                running[fd].output += data
+            else:
+                child = running.pop(fd)
+                results[child.index] = _finish_child(child)
+        now = time.monotonic()
+        for child in [c for c in running.values() if timeout and now - c.start >= timeout]:
+            del running[child.fd]
+            os.kill(child.pid, signal.SIGKILL)
+            _finish_child(child)
+            results[child.index] = ProgramResult(Path(child.path).name, TIMEOUT, now - child.start,
+                                                 f"plus de {timeout:g} s")
+    return results
+
+def format_results(results: list[ProgramResult], elapsed: float, jobs: int) -> str:
+    """Retourne le rapport : une ligne par programme, les détails des échecs, puis le résumé."""
+    lines = []
+    for result in results:
+        lines.append(f"{result.status:<8}{result.duration:>8.3f} s  {result.name}")
+        if result.status != PASSED and result.detail:
+            lines.extend("    " + line for line in result.detail.rstrip("\n").splitlines())
+    counts = {status: sum(r.status == status for r in results) for status in (PASSED, FAILED, ERROR, TIMEOUT)}
+    lines.append("")
+    lines.append(
+        f"{len(results)} programmes en {elapsed:.2f} s ({jobs} processus) : "
+        f"{counts[PASSED]} réussis, {counts[FAILED]} échoués, "
+        f"{counts[ERROR]} en erreur, {counts[TIMEOUT]} hors délai"
+    )
+    return "\n".join(lines)
+
+def runner_main(args: list[str], **options) -> int:
+    """Point d'entrée de `pithon --test`; retourne le code de sortie."""
+    parser = argparse.ArgumentParser(prog="pithon --test")
+    parser.add_argument("targets", nargs="*", help=f"fichiers ou dossiers (par défaut : {DEFAULT_TEST_DIR})")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="nombre de processus (un par cœur par défaut)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="délai par programme, en secondes")
+    ns = parser.parse_args(args)
+    programs = collect_programs(ns.targets or [str(DEFAULT_TEST_DIR)])
+    if not programs:
+        print("Aucun fichier de test trouvé.")
+        return 0
+    jobs = min(ns.jobs or os.cpu_count() or 1, len(programs))
+    start = time.perf_counter()
+    results = run_programs(programs, jobs, ns.timeout, **options)
+    print(format_results(results, time.perf_counter() - start, jobs))
+    return 0 if all(r.status == PASSED for r in results) else 1
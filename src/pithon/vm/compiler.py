@@ -0,0 +1,439 @@
+"""
+Compilateur de l'AST Pithon vers le bytecode de la machine virtuelle.
+
+Un programme (ou le corps d'une fonction) devient un `CodeObject` : un flot
+plat d'entiers (code d'opération, argument), une table de constantes et une
+table de noms. Les corps des fonctions et des méthodes sont compilés en même
+temps que le programme et rangés dans les constantes.
+
+La valeur d'une suite d'instructions (utilisée par une fonction sans `return`)
+est conservée dans un registre « dernière valeur » du cadre d'exécution.
+
+Dans une fonction, `return f(...)` devient TAIL_CALL suivi de RETURN_VALUE :
+l'appel terminal réutilise la place du cadre courant sur la pile des cadres.
+"""
+
+from dataclasses import dataclass, field
+from pithon.syntax import (
+    PiAssignment, PiBinaryOperation, PiNumber, PiBool, PiProgram, PiStatement, PiSubscript, PiSlice, PiVariable,
+    PiIfThenElse, PiNot, PiAnd, PiOr, PiWhile, PiNone, PiList, PiTuple, PiDict, PiSet, PiString,
+    PiFunctionDef, PiFunctionCall, PiFor, PiBreak, PiContinue, PiIn, PiReturn, PiClassDef, PiAttribute, PiAttributeAssignment,
+    PiSubscriptAssignment, PiLocalVariable, PiGlobalVariable, PiLocalAssignment, PiConstant
+)
+from pithon.evaluator.attributes import AttributeCache, AttributeStoreCache
+from pithon.evaluator.envvalue import VString, VNoneValue, make_bool, make_number
+from pithon.evaluator.evaluator import BINARY_OPERATORS
+from pithon.vm.opcodes import (
+    LOAD_CONST, POP_TOP, POP_LAST, RESET_LAST, SAVE_LAST, RESTORE_LAST,
+    LOAD_NAME, STORE_NAME, STORE_ITEM, LOAD_FAST, STORE_FAST, LOAD_DEREF, LOAD_GLOBAL, BINARY_OP, UNARY_NOT, CHECK_LOGIC, CONTAINS, SUBSCRIPT,
+    STORE_SUBSCR, BUILD_LIST, BUILD_TUPLE, BUILD_DICT, BUILD_SET, BUILD_SLICE, JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    GET_ITER, FOR_ITER, CALL, TAIL_CALL, RETURN_VALUE, RETURN_LAST, DEF_FUNCTION, DEF_CLASS,
+    LOAD_ATTR, STORE_ATTR, LOAD_METHOD, CALL_METHOD, TAIL_CALL_METHOD, RAISE_CONTROL, CONTROL_RETURN, CONTROL_BREAK,
+    CONTROL_CONTINUE, OPNAMES
+)
+
+@dataclass
+class CodeObject:
+    """Bytecode d'un programme ou d'un corps de fonction."""
+    name: str
+    instructions: tuple[int, ...]
+    constants: tuple
+    names: tuple[str, ...]
+    # Plan de liaison de la fonction compilée, qui recycle ses cadres (voir BindingPlan).
+    plan: object = field(default=None, repr=False)
+
+    def __str__(self) -> str:
+        return f"<code {self.name} at {id(self)}>"
+
+@dataclass
+class _Loop:
+    """Contexte de compilation d'une boucle (cibles de break et continue)."""
+    continue_target: int
+    breaks: list[int]
+    saves_last: bool
+
+
+def compile_program(program: PiProgram) -> CodeObject:
+    """Compile un programme Pithon en bytecode."""
+    compiler = _CodeCompiler("<module>", in_function=False)
+    compiler.compile_block(program)
+    compiler.emit(RETURN_LAST)
+    return compiler.assemble()
+
+def compile_function(funcdef: PiFunctionDef) -> CodeObject:
+    """Compile le corps d'une fonction ou d'une méthode."""
+    compiler = _CodeCompiler(funcdef.name, in_function=True)
+    compiler.compile_block(funcdef.body)
+    compiler.emit(RETURN_LAST)
+    code = compiler.assemble()
+    code.plan = funcdef.plan
+    return code
+
+def disassemble(code: CodeObject) -> str:
+    """Retourne une représentation lisible du bytecode (et des fonctions imbriquées)."""
+    lines = [f"Code {code.name}:"]
+    nested = []
+    instructions = code.instructions
+    for pc in range(0, len(instructions), 2):
+        op, arg = instructions[pc], instructions[pc + 1]
+        detail = ""
+        if op in (LOAD_NAME, STORE_NAME, STORE_ITEM):
+            detail = f"({code.names[arg]})"
+        elif op in (LOAD_ATTR, STORE_ATTR, LOAD_METHOD):
+            detail = f"({code.constants[arg].attr})"
+        elif op == LOAD_CONST:
+            detail = f"({code.constants[arg]!r})"
+        elif op == BINARY_OP:
+            detail = f"({code.constants[arg].__name__})"
+        elif op in (LOAD_FAST, STORE_FAST):
+            detail = f"(slot {arg})"
+        elif op == LOAD_DEREF:
+            detail = f"(depth {arg >> 16}, slot {arg & 0xFFFF})"
+        elif op == LOAD_GLOBAL:
+            detail = f"(depth {arg >> 16}, {code.names[arg & 0xFFFF]})"
+        elif op == DEF_FUNCTION:
+            funcdef, function_code = code.constants[arg]
+            detail = f"({funcdef.name})"
+            nested.append(function_code)
+        elif op == DEF_CLASS:
+            classdef, methods = code.constants[arg]
+            detail = f"({classdef.name})"
+            nested.extend(method_code for _, method_code in methods)
+        lines.append(f"{pc:6d} {OPNAMES[op]:<22}{arg:<6d}{detail}")
+    for function_code in nested:
+        lines.append("")
+        lines.append(disassemble(function_code))
+    return "\n".join(lines)
+
+
+class _CodeCompiler:
+    """Produit le bytecode d'un seul corps (programme, fonction ou méthode)."""
+
+    def __init__(self, name: str, in_function: bool):
+        self.name = name
+        self.in_function = in_function
+        self.instructions: list[int] = []
+        self.constants: list = []
+        self.constant_index: dict = {}
+        self.names: list[str] = []
+        self.name_index: dict[str, int] = {}
+        self.loops: list[_Loop] = []
+
+    def assemble(self) -> CodeObject:
+        return CodeObject(
+            name=self.name,
+            instructions=tuple(self.instructions),
+            constants=tuple(self.constants),
+            names=tuple(self.names),
+        )
+
+    # --- Émission ---
+
+    def emit(self, op: int, arg: int = 0) -> int:
+        """Ajoute une instruction et retourne sa position."""
+        self.instructions.append(op)
+        self.instructions.append(arg)
+        return len(self.instructions) - 2
+
+    def position(self) -> int:
+        return len(self.instructions)
+
+    def patch(self, at: int, target: int) -> None:
+        """Fixe la cible du saut émis à la position `at`."""
+        self.instructions[at + 1] = target
+
+    def constant(self, value, key=None) -> int:
+        """Retourne l'indice d'une constante; `key` permet de réutiliser les littéraux."""
+        if key is not None and key in self.constant_index:
+            return self.constant_index[key]
+        self.constants.append(value)
+        index = len(self.constants) - 1
+        if key is not None:
+            self.constant_index[key] = index
+        return index
+
+    def name_slot(self, name: str) -> int:
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    # --- Instructions ---
+
+    def compile_block(self, stmts: list[PiStatement]) -> None:
+        """Compile une suite d'instructions; la dernière valeur va dans le registre."""
+        if not stmts:
+            self.emit(RESET_LAST)
+        for stmt in stmts:
+            self.compile_stmt(stmt)
+
+    def compile_stmt(self, node: PiStatement) -> None:
+        if isinstance(node, PiAssignment):
+            self.compile_expr(node.value)
+            self.emit(STORE_NAME, self.name_slot(node.name))
+
+        elif isinstance(node, PiLocalAssignment):
+            self.compile_expr(node.value)
+            self.emit(STORE_FAST, node.slot)
+
+        elif isinstance(node, PiAttributeAssignment):
+            self.compile_expr(node.object)
+            self.compile_expr(node.value)
+            self.emit(STORE_ATTR, self.constant(AttributeStoreCache(node.attr)))
+
+        elif isinstance(node, PiSubscriptAssignment):
+            # Comme en Python : la valeur, puis la collection, puis l'indice.
+            self.compile_expr(node.value)
+            self.compile_expr(node.collection)
+            self.compile_expr(node.index)
+            self.emit(STORE_SUBSCR)
+
+        elif isinstance(node, PiIfThenElse):
+            self.compile_expr(node.condition)
+            jump_else = self.emit(POP_JUMP_IF_FALSE)
+            self.compile_block(node.then_branch)
+            jump_end = self.emit(JUMP)
+            self.patch(jump_else, self.position())
+            self.compile_block(node.else_branch)
+            self.patch(jump_end, self.position())
+
+        elif isinstance(node, PiWhile):
+            self._compile_while(node)
+
+        elif isinstance(node, PiFor):
+            self._compile_for(node)
+
+        elif isinstance(node, PiBreak):
+            if not self.loops:
+                self.emit(RAISE_CONTROL, CONTROL_BREAK)
+                return
+            loop = self.loops[-1]
+            if loop.saves_last:
+                self.emit(RESTORE_LAST)
+            loop.breaks.append(self.emit(JUMP))
+
+        elif isinstance(node, PiContinue):
+            if not self.loops:
+                self.emit(RAISE_CONTROL, CONTROL_CONTINUE)
+                return
+            loop = self.loops[-1]
+            if loop.saves_last:
+                self.emit(RESTORE_LAST)
+            self.emit(JUMP, loop.continue_target)
+
+        elif isinstance(node, PiReturn):
+            if self.in_function and isinstance(node.value, PiFunctionCall):
+                self._compile_call(node.value, TAIL_CALL)
+                self.emit(RETURN_VALUE)
+                return
+            self.compile_expr(node.value)
+            if self.in_function:
+                self.emit(RETURN_VALUE)
+            else:
+                self.emit(RAISE_CONTROL, CONTROL_RETURN)
+
+        elif isinstance(node, PiFunctionDef):
+            function = (node, compile_function(node))
+            self.emit(DEF_FUNCTION, self.constant(function))
+
+        elif isinstance(node, PiClassDef):
+            methods = tuple((method, compile_function(method)) for method in node.methods)
+            self.emit(DEF_CLASS, self.constant((node, methods)))
+
+        else:
+            self.compile_expr(node)
+            self.emit(POP_LAST)
+
+    def _compile_while(self, node: PiWhile) -> None:
+        # Comme dans l'évaluateur, un break ou un continue abandonne la valeur
+        # de l'itération en cours : le registre est sauvegardé puis restauré.
+        saves_last = _has_loop_jump(node.body)
+        self.emit(RESET_LAST)
+        head = self.position()
+        self.compile_expr(node.condition)
+        jump_exit = self.emit(POP_JUMP_IF_FALSE)
+        loop = _Loop(continue_target=head, breaks=[], saves_last=saves_last)
+        self.loops.append(loop)
+        if saves_last:
+            self.emit(SAVE_LAST)
+        self.compile_block(node.body)
+        if saves_last:
+            self.emit(POP_TOP)
+        self.emit(JUMP, head)
+        self.loops.pop()
+        exit_ = self.position()
+        self.patch(jump_exit, exit_)
+        for jump in loop.breaks:
+            self.patch(jump, exit_)
+
+    def _compile_for(self, node: PiFor) -> None:
+        saves_last = _has_loop_jump(node.body)
+        self.compile_expr(node.iterable)
+        self.emit(GET_ITER)
+        self.emit(RESET_LAST)
+        head = self.position()
+        jump_exit = self.emit(FOR_ITER)
+        self.emit(STORE_ITEM, self.name_slot(node.var))
+        loop = _Loop(continue_target=head, breaks=[], saves_last=saves_last)
+        self.loops.append(loop)
+        if saves_last:
+            self.emit(SAVE_LAST)
+        self.compile_block(node.body)
+        if saves_last:
+            self.emit(POP_TOP)
+        self.emit(JUMP, head)
+        self.loops.pop()
+        if loop.breaks:
+            # Un break quitte la boucle avec l'itérateur encore sur la pile.
+            break_target = self.emit(POP_TOP)
+            for jump in loop.breaks:
+                self.patch(jump, break_target)
+        self.patch(jump_exit, self.position())
+
+    # --- Expressions ---
+
+    def compile_expr(self, node: PiStatement) -> None:
+        if isinstance(node, PiNumber):
+            number = node.value
+            # 0.0 et -0.0 sont égaux mais ne s'affichent pas de la même façon.
+            key = (PiNumber, number) if type(number) is int else (PiNumber, "float", number.hex())
+            self.emit(LOAD_CONST, self.constant(make_number(node.value), key))
+
+        elif isinstance(node, PiBool):
+            self.emit(LOAD_CONST, self.constant(make_bool(node.value), (PiBool, node.value)))
+
+        elif isinstance(node, PiNone):
+            self.emit(LOAD_CONST, self.constant(VNoneValue, (PiNone, None)))
+
+        elif isinstance(node, PiString):
+            self.emit(LOAD_CONST, self.constant(VString(node.value), (PiString, node.value)))
+
+        elif isinstance(node, PiConstant):
+            self.emit(LOAD_CONST, self.constant(node.value))
+
+        elif isinstance(node, PiVariable):
+            self.emit(LOAD_NAME, self.name_slot(node.name))
+
+        elif isinstance(node, PiLocalVariable):
+            if node.depth == 0:
+                self.emit(LOAD_FAST, node.slot)
+            else:
+                self.emit(LOAD_DEREF, (node.depth << 16) | node.slot)
+
+        elif isinstance(node, PiGlobalVariable):
+            self.emit(LOAD_GLOBAL, (node.depth << 16) | self.name_slot(node.name))
+
+        elif isinstance(node, PiBinaryOperation):
+            operator = BINARY_OPERATORS.get(node.operator)
+            if operator is None:
+                # Opérateur inconnu : appel de la variable qui porte son nom.
+                self.emit(LOAD_NAME, self.name_slot(node.operator))
+                self.compile_expr(node.left)
+                self.compile_expr(node.right)
+                self.emit(CALL, 2)
+                return
+            self.compile_expr(node.left)
+            self.compile_expr(node.right)
+            self.emit(BINARY_OP, self.constant(operator, (PiBinaryOperation, node.operator)))
+
+        elif isinstance(node, PiFunctionCall):
+            self._compile_call(node, CALL)
+
+        elif isinstance(node, PiList):
+            for element in node.elements:
+                self.compile_expr(element)
+            self.emit(BUILD_LIST, len(node.elements))
+
+        elif isinstance(node, PiTuple):
+            for element in node.elements:
+                self.compile_expr(element)
+            self.emit(BUILD_TUPLE, len(node.elements))
+
+        elif isinstance(node, PiDict):
+            for key, value in zip(node.keys, node.values):
+                self.compile_expr(key)
+                self.compile_expr(value)
+            self.emit(BUILD_DICT, len(node.keys))
+
+        elif isinstance(node, PiSet):
+            for element in node.elements:
+                self.compile_expr(element)
+            self.emit(BUILD_SET, len(node.elements))
+
+        elif isinstance(node, PiNot):
+            self.compile_expr(node.operand)
+            self.emit(UNARY_NOT)
+
+        elif isinstance(node, (PiAnd, PiOr)):
+            self.compile_expr(node.left)
+            jump = self.emit(JUMP_IF_FALSE_OR_POP if isinstance(node, PiAnd) else JUMP_IF_TRUE_OR_POP)
+            self.compile_expr(node.right)
+            self.emit(CHECK_LOGIC)
+            self.patch(jump, self.position())
+
+        elif isinstance(node, PiIn):
+            # Même ordre d'évaluation que l'évaluateur : le conteneur d'abord.
+            self.compile_expr(node.container)
+            self.compile_expr(node.element)
+            self.emit(CONTAINS)
+
+        elif isinstance(node, PiSubscript):
+            self.compile_expr(node.collection)
+            self.compile_expr(node.index)
+            self.emit(SUBSCRIPT)
+
+        elif isinstance(node, PiSlice):
+            self.compile_expr(node.lower)
+            self.compile_expr(node.upper)
+            self.compile_expr(node.step)
+            self.emit(BUILD_SLICE)
+
+        elif isinstance(node, PiAttribute):
+            self.compile_expr(node.object)
+            self.emit(LOAD_ATTR, self.constant(AttributeCache(node.attr)))
+
+        elif isinstance(node, PiIfThenElse):
+            # Expression conditionnelle (x if cond else y)
+            self.compile_expr(node.condition)
+            jump_else = self.emit(POP_JUMP_IF_FALSE)
+            self._compile_expr_block(node.then_branch)
+            jump_end = self.emit(JUMP)
+            self.patch(jump_else, self.position())
+            self._compile_expr_block(node.else_branch)
+            self.patch(jump_end, self.position())
+
+        else:
+            raise TypeError(f"Type de nœud non supporté : {type(node)}")
+
+    def _compile_call(self, node: PiFunctionCall, op: int) -> None:
+        if isinstance(node.function, PiAttribute):
+            # Appel de méthode : pas de méthode liée (voir LOAD_METHOD).
+            self.compile_expr(node.function.object)
+            self.emit(LOAD_METHOD, self.constant(AttributeCache(node.function.attr)))
+            op = CALL_METHOD if op == CALL else TAIL_CALL_METHOD
+        else:
+            self.compile_expr(node.function)
+        for arg in node.args:
+            self.compile_expr(arg)
+        self.emit(op, len(node.args))
+
+    def _compile_expr_block(self, stmts: list[PiStatement]) -> None:
+        """Compile une branche d'expression conditionnelle; sa valeur reste sur la pile."""
+        if not stmts:
+            self.emit(LOAD_CONST, self.constant(VNoneValue, (PiNone, None)))
+            return
+        for stmt in stmts[:-1]:
+            self.compile_stmt(stmt)
+        self.compile_expr(stmts[-1])
+
+
+def _has_loop_jump(stmts: list[PiStatement]) -> bool:
+    """Indique si un corps de boucle contient un break ou un continue qui le concerne."""
+    for stmt in stmts:
+        if isinstance(stmt, (PiBreak, PiContinue)):
+            return True
+        if isinstance(stmt, PiIfThenElse):
+            if _has_loop_jump(stmt.then_branch) or _has_loop_jump(stmt.else_branch):
+                return True
+    return False
@@ -0,0 +1,436 @@
+"""
+Machine virtuelle à pile pour le bytecode Pithon.
+
+Une seule boucle de répartition exécute les instructions. Les appels de
+fonctions utilisateur n'utilisent pas la pile d'appels de Python : chaque appel
+empile un `Frame` sur une pile explicite, ce qui rend la profondeur de
+récursion Pithon indépendante de la limite de récursion de l'hôte.
+
+Les appels terminaux (`return f(...)`, instruction TAIL_CALL) n'empilent rien :
+le cadre appelé remplace celui de l'appelant, dont le résultat serait de toute
+façon celui de l'appel. Une récursion terminale (accumulateur, parcours de
+liste) s'exécute donc en mémoire constante, quelle que soit sa profondeur.
+Seuls `__init__`, qui retourne l'instance et non la valeur de son `return`, et
+les fonctions mémoïsées (voir pithon.purity), dont le résultat doit être
+mémorisé au retour, gardent leur cadre.
+"""
+
+from pithon.evaluator.envframe import EnvFrame, UNBOUND
+from pithon.evaluator.limits import step
+from pithon.evaluator.evaluator import (
+    _check_valid_piandor_type, bind_arguments, ReturnException, BreakException, ContinueException
+)
+from pithon.evaluator.primitive import (
+    check_type, range_contains, set_item, build_dict, build_set, contains_key, get_item, iterate, make_slice
+)
+from pithon.evaluator.envvalue import (
+    EnvValue, VFunctionClosure, VList, VTuple, VDict, VSet, VRange, VNumber, VBool, VString, VClassDef, VMethodClosure, VObject, VTrue, VFalse, VNoneValue
+)
+from pithon.syntax import PiProgram, PiStatement
+from pithon.vm.compiler import CodeObject, compile_program, compile_function
+from pithon.vm.opcodes import (
+    LOAD_CONST, POP_TOP, POP_LAST, RESET_LAST, SAVE_LAST, RESTORE_LAST,
+    LOAD_NAME, STORE_NAME, STORE_ITEM, LOAD_FAST, STORE_FAST, LOAD_DEREF, LOAD_GLOBAL, BINARY_OP, UNARY_NOT, CHECK_LOGIC, CONTAINS, SUBSCRIPT,
+    STORE_SUBSCR, BUILD_LIST, BUILD_TUPLE, BUILD_DICT, BUILD_SET, BUILD_SLICE, JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    GET_ITER, FOR_ITER, CALL, TAIL_CALL, RETURN_VALUE, RETURN_LAST, DEF_FUNCTION, DEF_CLASS,
+    LOAD_ATTR, STORE_ATTR, LOAD_METHOD, CALL_METHOD, TAIL_CALL_METHOD, RAISE_CONTROL, CONTROL_RETURN, CONTROL_BREAK
+)
+
+# Nature d'un cadre, qui détermine ce que retourne la fin de son code.
+FRAME_MODULE = 0        # programme : la dernière valeur
+FRAME_FUNCTION = 1      # fonction : la dernière valeur
+FRAME_METHOD = 2        # méthode : None
+FRAME_INIT = 3          # __init__ : l'instance créée, valeur retournée ignorée
+
+
+class Frame:
+    """Cadre d'exécution d'un CodeObject."""
+    __slots__ = ("code", "env", "kind", "instance", "pc", "stack", "last", "memo")
+
+    def __init__(self, code: CodeObject, env: EnvFrame, kind: int, instance: VObject | None = None):
+        self.code = code
+        self.env = env
+        self.kind = kind
+        self.instance = instance
+        self.pc = 0
+        self.stack: list = []
+        self.last: EnvValue = VNoneValue
+        # (table, clé) où mémoriser le résultat d'une fonction pure, sinon None.
+        self.memo: tuple | None = None
+
+
+def evaluate_vm(node: PiProgram, env: EnvFrame) -> EnvValue:
+    """Compile en bytecode puis exécute un programme ou une instruction."""
+    if isinstance(node, list):
+        code = compile_program(node)
+    elif isinstance(node, PiStatement):
+        code = compile_program([node])
+    else:
+        raise TypeError(f"Type de nœud non supporté : {type(node)}")
+    return run_code(code, env)
+
+def run_code(code: CodeObject, env: EnvFrame) -> EnvValue:
+    """Exécute le bytecode d'un programme dans l'environnement donné."""
+    frame = Frame(code, env, FRAME_MODULE)
+    callers: list[Frame] = []
+    instructions = code.instructions
+    constants = code.constants
+    names = code.names
+    stack = frame.stack
+    push = stack.append
+    pop = stack.pop
+    last = frame.last
+    pc = 0
+
+    while True:
+        op = instructions[pc]
+        arg = instructions[pc + 1]
+        pc += 2
+
+        if op == LOAD_FAST:
+            value = env.slots[arg]
+            if value is UNBOUND:
+                value = env.parent.lookup(env.layout.names[arg])
+            push(value)
+
+        elif op == LOAD_NAME:
+            push(env.lookup(names[arg]))
+
+        elif op == LOAD_GLOBAL:
+            outer = env
+            for _ in range(arg >> 16):
+                outer = outer.parent
+            push(outer.lookup(names[arg & 0xFFFF]))
+
+        elif op == LOAD_CONST:
+            push(constants[arg])
+
+        elif op == BINARY_OP:
+            right = pop()
+            stack[-1] = constants[arg](stack[-1], right)
+
+        elif op == STORE_FAST:
+            last = pop()
+            env.slots[arg] = last
+
+        elif op == STORE_NAME:
+            last = pop()
+            env.vars[names[arg]] = last
+
+        elif op == POP_JUMP_IF_FALSE:
+            cond = check_type(pop(), VBool)
+            if not cond.value:
+                pc = arg
+
+        elif op == JUMP:
+            if arg < pc:
+                # Retour au début d'une boucle : un pas d'exécution.
+                step()
+            pc = arg
+
+        elif op == POP_LAST:
+            last = pop()
+
+        elif op == CALL or op == TAIL_CALL or op == CALL_METHOD or op == TAIL_CALL_METHOD:
+            if arg:
+                args = stack[-arg:]
+                del stack[-arg:]
+            else:
+                args = []
+            func_val = pop()
+            if op == CALL or op == TAIL_CALL or func_val is _NO_INSTANCE:
+                if func_val is _NO_INSTANCE:
+                    func_val = pop()
+                if callable(func_val):
+                    push(func_val(args))
+                    continue
+                callee = _prepare_call(func_val, args)
+                if not isinstance(callee, Frame):
+                    push(callee)
+                    continue
+            else:
+                # Appel de méthode : sous les arguments, LOAD_METHOD a laissé la méthode et l'instance.
+                args.insert(0, func_val)
+                method = pop()
+                if callable(method):
+                    # Méthode native (voir STR_CLASS).
+                    push(method(args))
+                    continue
+                callee = _method_frame(method, args, FRAME_METHOD)
+            step()
+            if op == CALL or op == CALL_METHOD or frame.kind == FRAME_INIT or frame.memo is not None:
+                frame.pc, frame.last = pc, last
+                callers.append(frame)
+            elif frame.code.plan is not None:
+                # Appel terminal : le cadre remplacé a fini de s'exécuter.
+                frame.code.plan.release(env)
+            frame = callee
+            instructions, constants, names = frame.code.instructions, frame.code.constants, frame.code.names
+            env, stack, last, pc = frame.env, frame.stack, frame.last, 0
+            push, pop = stack.append, stack.pop
+
+        elif op == RETURN_VALUE or op == RETURN_LAST:
+            kind = frame.kind
+            if op == RETURN_VALUE:
+                result = pop()
+            elif kind == FRAME_METHOD:
+                result = VNoneValue
+            else:
+                result = last
+            if kind == FRAME_INIT:
+                result = frame.instance
+            elif frame.memo is not None:
+                table, key = frame.memo
+                table.put(key, result)
+            if frame.code.plan is not None:
+                frame.code.plan.release(env)
+            if not callers:
+                return result
+            frame = callers.pop()
+            instructions, constants, names = frame.code.instructions, frame.code.constants, frame.code.names
+            env, stack, last, pc = frame.env, frame.stack, frame.last, frame.pc
+            push, pop = stack.append, stack.pop
+            push(result)
+
+        elif op == FOR_ITER:
+            item = next(stack[-1], _EXHAUSTED)
+            if item is _EXHAUSTED:
+                pop()
+                pc = arg
+            else:
+                push(item)
+
+        elif op == STORE_ITEM:
+            env.insert(names[arg], pop())
+
+        elif op == LOAD_DEREF:
+            depth, slot = arg >> 16, arg & 0xFFFF
+            outer = env
+            for _ in range(depth):
+                outer = outer.parent
+            value = outer.slots[slot]
+            if value is UNBOUND:
+                value = outer.parent.lookup(outer.layout.names[slot])
+            push(value)
+
+        elif op == GET_ITER:
+            push(iter(iterate(pop())))
+
+        elif op == RESET_LAST:
+            last = VNoneValue
+
+        elif op == SAVE_LAST:
+            push(last)
+
+        elif op == RESTORE_LAST:
+            last = pop()
+
+        elif op == POP_TOP:
+            pop()
+
+        elif op == SUBSCRIPT:
+            index = pop()
+            collection = pop()
+            cls = type(collection)
+            if (cls is VList or cls is VTuple) and type(index) is VNumber:
+                push(collection.value[int(index.value)])
+            else:
+                push(get_item(collection, index))
+
+        elif op == STORE_SUBSCR:
+            index = pop()
+            collection = pop()
+            last = pop()
+            if type(collection) is VList and collection.views is None and type(index) is VNumber:
+                collection.value[int(index.value)] = last
+            else:
+                set_item(collection, index, last)
+
+        elif op == JUMP_IF_FALSE_OR_POP:
+            value = stack[-1]
+            _check_valid_piandor_type(value)
+            if not value.value:
+                pc = arg
+            else:
+                pop()
+
+        elif op == JUMP_IF_TRUE_OR_POP:
+            value = stack[-1]
+            _check_valid_piandor_type(value)
+            if value.value:
+                pc = arg
+            else:
+                pop()
+
+        elif op == CHECK_LOGIC:
+            _check_valid_piandor_type(stack[-1])
+
+        elif op == UNARY_NOT:
+            value = pop()
+            _check_valid_piandor_type(value)
+            push(VFalse if value.value else VTrue)
+
+        elif op == BUILD_LIST:
+            if arg:
+                elements = stack[-arg:]
+                del stack[-arg:]
+            else:
+                elements = []
+            push(VList(elements))
+
+        elif op == BUILD_TUPLE:
+            if arg:
+                elements = tuple(stack[-arg:])
+                del stack[-arg:]
+            else:
+                elements = ()
+            push(VTuple(elements))
+
+        elif op == BUILD_DICT:
+            if arg:
+                items = stack[-2 * arg:]
+                del stack[-2 * arg:]
+            else:
+                items = []
+            push(build_dict(zip(items[0::2], items[1::2])))
+
+        elif op == BUILD_SET:
+            if arg:
+                elements = stack[-arg:]
+                del stack[-arg:]
+            else:
+                elements = []
+            push(build_set(elements))
+
+        elif op == BUILD_SLICE:
+            step_ = pop()
+            upper = pop()
+            push(make_slice(pop(), upper, step_))
+
+        elif op == CONTAINS:
+            element = pop()
+            container = pop()
+            if isinstance(container, (VList, VTuple)):
+                push(VTrue if element in container.value else VFalse)
+            elif isinstance(container, VString):
+                if isinstance(element, VString):
+                    push(VTrue if element.value in container.value else VFalse)
+                else:
+                    push(VFalse)
+            elif isinstance(container, (VDict, VSet)):
+                push(VTrue if contains_key(container, element) else VFalse)
+            elif isinstance(container, VRange):
+                push(VTrue if range_contains(container, element) else VFalse)
+            else:
+                raise TypeError("'in' n'est supporté que pour les listes, chaînes, dictionnaires et ensembles.")
+
+        elif op == LOAD_ATTR:
+            obj_val = stack[-1]
+            cache = constants[arg]
+            if obj_val.shape is cache.shape:
+                stack[-1] = obj_val.slots[cache.index]
+            elif obj_val.shape is cache.method_shape:
+                stack[-1] = VMethodClosure(function=cache.method, instance=obj_val)
+            else:
+                stack[-1] = cache.load(obj_val)
+
+        elif op == LOAD_METHOD:
+            obj_val = stack[-1]
+            cache = constants[arg]
+            if obj_val.shape is cache.method_shape:
+                stack[-1] = cache.method
+                push(obj_val)
+            else:
+                method = cache.find_method(obj_val)
+                if method is None:
+                    stack[-1] = cache.load(obj_val)
+                    push(_NO_INSTANCE)
+                else:
+                    stack[-1] = method
+                    push(obj_val)
+
+        elif op == STORE_ATTR:
+            last = pop()
+            obj_val = pop()
+            cache = constants[arg]
+            if obj_val.shape is cache.shape:
+                obj_val.slots[cache.index] = last
+            elif obj_val.shape is cache.new_shape:
+                obj_val.shape = cache.next_shape
+                obj_val.slots.append(last)
+            else:
+                cache.store(obj_val, last)
+
+        elif op == DEF_FUNCTION:
+            funcdef, function_code = constants[arg]
+            env.insert(funcdef.name, VFunctionClosure(funcdef, env, code=function_code))
+            last = VNoneValue
+
+        elif op == DEF_CLASS:
+            classdef, methods = constants[arg]
+            class_methodes = {
+                method.name: VFunctionClosure(method, env, code=method_code)
+                for method, method_code in methods
+            }
+            env.insert(classdef.name, VClassDef(name=classdef.name, methods=class_methodes))
+            last = VNoneValue
+
+        elif op == RAISE_CONTROL:
+            if arg == CONTROL_RETURN:
+                raise ReturnException(pop())
+            if arg == CONTROL_BREAK:
+                raise BreakException()
+            raise ContinueException()
+
+        else:
+            raise RuntimeError(f"Code d'opération inconnu : {op}")
+
+
+_EXHAUSTED = object()
+# Marqueur laissé par LOAD_METHOD quand l'attribut appelé n'est pas une méthode.
+_NO_INSTANCE = object()
+
+def _function_code(function: VFunctionClosure) -> CodeObject:
+    """Retourne le bytecode d'une fermeture, en le compilant au besoin."""
+    code = function.code
+    if not isinstance(code, CodeObject):
+        code = function.code = compile_function(function.funcdef)
+    return code
+
+def _method_frame(method: VFunctionClosure, args: list[EnvValue], kind: int) -> Frame:
+    """Prépare le cadre d'un appel de méthode; `args` commence par l'instance."""
+    call_env = bind_arguments(method, args)
+    return Frame(_function_code(method), call_env, kind, args[0])
+
+def _prepare_call(func_val: EnvValue, args: list[EnvValue]) -> Frame | EnvValue:
+    """Prépare l'appel d'une valeur qui n'est pas une primitive.
+
+    Retourne le cadre à exécuter, ou directement le résultat si aucun code
+    Pithon n'est à exécuter.
+    """
+    if isinstance(func_val, VFunctionClosure):
+        memo = func_val.funcdef.memo
+        key = memo.key(args) if memo is not None else None
+        if key is not None:
+            result = memo.get(key)
+            if result is not None:
+                return result
+        call_env = bind_arguments(func_val, args)
+        frame = Frame(_function_code(func_val), call_env, FRAME_FUNCTION)
+        if key is not None:
+            frame.memo = (memo, key)
+        return frame
+
+    elif isinstance(func_val, VClassDef):
+        new_instance = VObject(func_val.shape)
+        init_closure = func_val.methods.get("__init__")
+        if init_closure:
+            return _method_frame(init_closure, [new_instance, *args], FRAME_INIT)
+        if args:
+            raise TypeError(f"La classe {func_val.name} ne prend pas d'arguments.")
+        return new_instance
+
+    elif isinstance(func_val, VMethodClosure):
+        if callable(func_val.function):
+            return func_val.function([func_val.instance, *args])
+        return _method_frame(func_val.function, [func_val.instance, *args], FRAME_METHOD)
@@ -0,0 +1,71 @@
+"""
+Codes d'opération de la machine virtuelle Pithon.
+
+Chaque instruction occupe deux entiers consécutifs dans le flot d'instructions :
+le code d'opération puis son argument (0 s'il n'est pas utilisé). Les cibles
+de saut sont des positions absolues dans ce flot.
+"""
+
+# Pile et constantes
+LOAD_CONST = 0          # empile constants[arg]
+POP_TOP = 1             # dépile et oublie le sommet
+POP_LAST = 2            # dépile le sommet dans le registre « dernière valeur »
+RESET_LAST = 3          # met None dans le registre « dernière valeur »
+SAVE_LAST = 4           # empile le registre « dernière valeur »
+RESTORE_LAST = 5        # dépile le sommet dans le registre (break/continue)
+
+# Variables
+LOAD_NAME = 10          # empile la variable names[arg]
+STORE_NAME = 11         # affectation : dépile dans names[arg], devient la dernière valeur
+STORE_ITEM = 12         # variable de boucle : dépile dans names[arg]
+LOAD_FAST = 13          # empile l'emplacement arg du cadre courant
+STORE_FAST = 14         # affectation dans l'emplacement arg, devient la dernière valeur
+LOAD_DEREF = 15         # empile l'emplacement (arg & 0xFFFF) du cadre situé (arg >> 16) niveaux plus haut
+LOAD_GLOBAL = 16        # names[arg & 0xFFFF], cherché à partir du cadre situé (arg >> 16) niveaux plus haut
+
+# Opérateurs
+BINARY_OP = 20          # opérateur constants[arg] (fonction à deux arguments) appliqué aux deux valeurs du sommet
+UNARY_NOT = 21
+CHECK_LOGIC = 22        # vérifie le type de l'opérande droite de and/or
+CONTAINS = 23           # element in container
+SUBSCRIPT = 24          # collection[index]
+STORE_SUBSCR = 25       # collection[index] = valeur : dépile indice, collection et valeur, qui devient la dernière valeur
+
+# Constructions
+BUILD_LIST = 30         # construit une liste avec les arg valeurs du sommet
+BUILD_TUPLE = 31
+BUILD_DICT = 32         # construit un dictionnaire avec les arg paires (clé, valeur) du sommet
+BUILD_SET = 33          # construit un ensemble avec les arg valeurs du sommet
+BUILD_SLICE = 34        # construit les bornes d'une tranche avec les 3 valeurs du sommet
+
+# Sauts
+JUMP = 40
+POP_JUMP_IF_FALSE = 41
+JUMP_IF_FALSE_OR_POP = 42
+JUMP_IF_TRUE_OR_POP = 43
+GET_ITER = 44
+FOR_ITER = 45           # empile l'élément suivant, ou dépile l'itérateur et saute à arg
+
+# Fonctions, classes et objets
+CALL = 50               # appelle la fonction sous les arg arguments du sommet
+RETURN_VALUE = 51
+RETURN_LAST = 52        # retourne le registre « dernière valeur »
+DEF_FUNCTION = 53       # constants[arg] = (PiFunctionDef, CodeObject)
+DEF_CLASS = 54          # constants[arg] = (PiClassDef, ((PiFunctionDef, CodeObject), ...))
+LOAD_ATTR = 55          # constants[arg] = cache du site (voir pithon.evaluator.attributes)
+STORE_ATTR = 56         # dépile valeur et objet, devient la dernière valeur; constants[arg] : idem
+RAISE_CONTROL = 57      # return/break/continue hors de leur contexte
+TAIL_CALL = 58          # `return f(...)` : comme CALL, mais le cadre appelé remplace le cadre courant
+LOAD_METHOD = 59        # `obj.m` appelé : remplace obj par la méthode et l'instance, ou par la valeur de l'attribut et un marqueur
+CALL_METHOD = 60        # appelle ce que LOAD_METHOD a laissé sous les arg arguments du sommet
+TAIL_CALL_METHOD = 61   # `return obj.m(...)` : CALL_METHOD en appel terminal
+
+# Arguments de RAISE_CONTROL
+CONTROL_RETURN = 0
+CONTROL_BREAK = 1
+CONTROL_CONTINUE = 2
+
+OPNAMES = {
+    value: name for name, value in list(globals().items())
+    if name.isupper() and not name.startswith("CONTROL_") and isinstance(value, int)
+}
@@ -0,0 +1,17 @@
+# Fermetures : fonctions imbriquées qui capturent des variables englobantes.
+def make_adder(n):
+    def add(x):
+        return x + n
+    return add
+
+def compose(f, g):
+    def h(x):
+        return f(g(x))
+    return h
+
+total = 0
+for i in range(5000):
+    inc = make_adder(i)
+    twice = compose(inc, inc)
+    total = total + twice(1)
+print(total)
@@ -0,0 +1,12 @@
+# Élimination des doublons avec un ensemble, et comptage dans un dictionnaire.
+seen = set()
+counts = {}
+unique = 0
+for i in range(20000):
+    key = (i * 7919) % 5000
+    if not (key in seen):
+        seen.add(key)
+        unique = unique + 1
+    counts[key % 10] = counts.get(key % 10, 0) + 1
+print(unique)
+print(counts[3])
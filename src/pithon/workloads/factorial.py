@@ -0,0 +1,10 @@
+# Factorielle récursive, calculée de nombreuses fois (grands entiers).
+def factorial(n):
+    if n == 0:
+        return 1
+    return n * factorial(n - 1)
+
+total = 0
+for i in range(300):
+    total = total + factorial(100) % 1000003
+print(total)
@@ -0,0 +1,8 @@
+# Construction d'une liste par ajouts en place (même calcul que list_concat).
+values = []
+for i in range(3000):
+    values.append(i * 2)
+total = 0
+for v in values:
+    total = total + v
+print(total)
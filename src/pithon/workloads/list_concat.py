@@ -0,0 +1,8 @@
+# Construction d'une liste par concaténations successives.
+values = []
+for i in range(3000):
+    values = values + [i * 2]
+total = 0
+for v in values:
+    total = total + v
+print(total)
@@ -0,0 +1,19 @@
+# Création d'objets et appels de méthodes.
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def incr(self):
+        self.count = self.count + 1
+
+    def value(self):
+        return self.count
+
+total = 0
+for i in range(2000):
+    c = Counter()
+    c.count = i
+    for j in range(10):
+        c.incr()
+    total = total + c.value()
+print(total)
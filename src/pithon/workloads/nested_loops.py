@@ -0,0 +1,7 @@
+# Boucles imbriquées avec conditions.
+count = 0
+for i in range(300):
+    for j in range(300):
+        if (i + j) % 3 == 0:
+            count = count + 1
+print(count)
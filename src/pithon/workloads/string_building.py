@@ -0,0 +1,7 @@
+# Construction d'une chaîne par concaténations successives.
+s = ""
+i = 0
+while i < 20000:
+    s = s + str(i % 10)
+    i = i + 1
+print(s[19999])
@@ -0,0 +1,17 @@
+# Fenêtres glissantes sur une liste et une chaîne : chaque tranche partage les éléments de l'original.
+values = []
+values.extend(range(100000))
+best = 0
+for start in range(0, 90000, 50):
+    window = values[start:start + 10000]
+    edge = window[0] + window[9999]
+    if edge > best:
+        best = edge
+text = "abcdefghij" * 10000
+same = 0
+for start in range(0, 90000, 50):
+    chunk = text[start:start + 10000]
+    if chunk[0] == chunk[9999]:
+        same = same + 1
+print(best)
+print(same)
@@ -0,0 +1,33 @@
+"""
+Fixtures communes des tests.
+
+Un test qui demande `engine`, ou `run`, est exécuté une fois par moteur :
+l'évaluateur d'arbre, le compilateur en fermetures et la machine virtuelle.
+"""
+
+import pytest
+
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.evaluator.compiler import evaluate_compiled
+from pithon.evaluator.envframe import EnvFrame
+from pithon.evaluator.evaluator import initial_env, evaluate
+from pithon.vm.machine import evaluate_vm
+
+ENGINES = {"evaluate": evaluate, "compiled": evaluate_compiled, "vm": evaluate_vm}
+
+
+@pytest.fixture(params=list(ENGINES.values()), ids=list(ENGINES))
+def engine(request):
+    """Moteur d'évaluation du test."""
+    return request.param
+
+
+@pytest.fixture
+def run(engine):
+    """Analyse, résout puis évalue un programme avec le moteur du test; retourne l'environnement."""
+    def run(source: str, env: EnvFrame | None = None, **options) -> EnvFrame:
+        env = env if env is not None else initial_env()
+        engine(resolve(SimpleParser().parse(source), **options), env)
+        return env
+    return run
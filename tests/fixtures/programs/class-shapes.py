@@ -0,0 +1,36 @@
+class Point:
+    def __init__(self):
+        self.x = 1
+        self.y = 2
+
+    def norm1(self):
+        return self.x + self.y
+
+class Named:
+    def __init__(self):
+        self.name = "n"
+        self.x = 10
+
+    def norm1(self):
+        return self.x
+
+def get_x(obj):
+    return obj.x
+
+def total(objs):
+    s = 0
+    for o in objs:
+        s = s + get_x(o) + o.norm1()
+    return s
+
+p = Point()
+q = Point()
+q.z = 3
+r = Named()
+print(total([p, q, r, p, r]))
+q.x = 5
+print(get_x(q))
+print(q.z)
+p.norm1 = 7
+print(p.norm1)
+print(q.norm1())
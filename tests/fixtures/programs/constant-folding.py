@@ -0,0 +1,22 @@
+x = 2 * 3 + 1
+t = (1, (2, "a"), None)
+"doc"
+5
+if True:
+    y = 1
+else:
+    y = 2
+if False:
+    z = 1
+while False:
+    z = 2
+def f(a):
+    "docstring"
+    if 1 < 2:
+        return a + 10 * 2
+    return 0
+print(f(x))
+print(t + (3,))
+print(1 / 0 if False else 4)
+print(not (1, 2) or "z")
+print(True and "yes")
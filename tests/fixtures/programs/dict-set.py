@@ -0,0 +1,49 @@
+ages = {"alice": 31, "bob": 27}
+print(ages)
+print(ages["bob"])
+ages["chloé"] = 40
+ages["alice"] = 32
+print(ages)
+print("bob" in ages)
+print("zoé" in ages)
+print({})
+
+for name in ages:
+    print(name + " : " + str(ages[name]))
+
+print(ages.get("bob"))
+print(ages.get("zoé"))
+print(ages.get("zoé", 0))
+for pair in ages.items():
+    print(pair)
+total = 0
+for age in ages.values():
+    total = total + age
+print(total)
+
+counts = {}
+for word in ["a", "b", "a", "c", "b", "a"]:
+    counts[word] = counts.get(word, 0) + 1
+print(counts)
+
+points = {(0, 0): "origine", (1, 2): "p"}
+print(points[(1, 2)])
+print((0, 0) in points)
+
+seen = set()
+unique = []
+for x in [3, 1, 3, 2, 1, 5]:
+    if not (x in seen):
+        seen.add(x)
+        unique.append(x)
+print(unique)
+print(seen)
+print({1, 2, 2, 3})
+print(set([4, 4, 5]))
+print(set())
+print(2 in {1, 2})
+print({1: "un"} == {1: "un"})
+print({1, 2} == {2, 1})
+copy = ages
+copy["zoé"] = 5
+print(ages["zoé"])
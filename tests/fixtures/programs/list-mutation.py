@@ -0,0 +1,59 @@
+xs = []
+for i in range(5):
+    xs.append(i * i)
+print(xs)
+
+ys = xs
+ys.append(25)
+print(xs)
+print(xs == ys)
+
+zs = xs + []
+zs.append(36)
+print(xs)
+print(zs)
+
+xs[0] = 100
+xs[5] = "fin"
+print(ys)
+
+last = xs.pop()
+print(last)
+print(xs.pop(0))
+print(xs)
+
+xs.insert(0, "début")
+xs.insert(100, "après")
+print(xs)
+
+xs.extend([7, 8])
+xs.extend((9,))
+xs.extend(range(2))
+xs.extend("ab")
+print(xs)
+
+grid = [[0, 0], [0, 0]]
+row = grid[1]
+row[0] = 1
+grid[0][1] = 2
+print(grid)
+
+def fill(target, n):
+    for i in range(n):
+        target.append(i)
+
+acc = []
+fill(acc, 3)
+fill(acc, 2)
+print(acc)
+
+stack = [1, 2, 3]
+total = 0
+while stack != []:
+    total = total + stack.pop()
+print(total)
+print(stack)
+
+push = stack.append
+push("x")
+print(stack)
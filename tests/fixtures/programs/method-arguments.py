@@ -0,0 +1,31 @@
+class Account:
+    def __init__(self, owner, balance):
+        self.owner = owner
+        self.balance = balance
+
+    def deposit(self, amount):
+        self.balance = self.balance + amount
+        return self.balance
+
+    def deposit_all(self, *amounts):
+        for amount in amounts:
+            self.deposit(amount)
+        return self.balance
+
+    def describe(this, prefix):
+        return prefix + this.owner
+
+acc = Account("ana", 10)
+print(acc.deposit(5))
+print(acc.deposit_all(1, 2, 3))
+print(acc.deposit_all())
+print(acc.describe("compte de "))
+
+def double(x):
+    return x * 2
+
+acc.helper = double
+print(acc.helper(21))
+m = acc.deposit
+print(m(100))
+print(Account("bo", 1).deposit(1))
@@ -0,0 +1,6 @@
+# 0.0 et -0.0 sont des constantes distinctes, même une fois repliées.
+x = 0.0
+y = 0.0 * (0 - 1)
+print(x)
+print(y)
+print(x == y)
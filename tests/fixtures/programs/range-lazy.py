@@ -0,0 +1,25 @@
+r = range(10)
+print(r)
+print(range(2, 12, 3))
+print(range(10, 0, 0 - 2))
+print(str(range(3)))
+print(r[4])
+print(r[0 - 1])
+print(5 in r)
+print(10 in r)
+print(2.0 in range(0, 10, 2))
+print(2.5 in r)
+print("a" in r)
+print(99999999 in range(1000000000))
+print(range(3) == [0, 1, 2])
+print(range(3) + [3])
+print(range(2) * 2)
+total = 0
+for i in range(0, 100, 7):
+    total = total + i
+print(total)
+for i in range(1000000000):
+    if i == 3:
+        break
+print(i)
+print(not range(0))
@@ -0,0 +1,61 @@
+# Tranches de listes, tuples et chaînes.
+xs = []
+xs.extend(range(100))
+print(xs[:3])
+print(xs[97:])
+print(xs[5:0:0 - 2])
+
+# Une grande tranche partage les éléments de la liste d'origine.
+w = xs[10:60]
+print(w[0])
+print(w[49])
+print(w[2:5])
+v = w[::2]
+print(v[0:3])
+
+# La tranche ne voit pas les modifications de la liste d'origine, ni l'inverse.
+xs[10] = 999
+print(w[0])
+print(v[0])
+print(xs[10:12])
+y = xs[0:50]
+y.append(7)
+print(y[50])
+print(xs[50])
+
+r = xs[::0 - 1]
+print(r[0:3])
+print(xs[0:40] == xs[0:40])
+print(w == xs[10:60])
+print(str(xs[95:]))
+
+# Parcours d'une tranche pendant que la liste d'origine change.
+n = 0
+for x in xs[0:50]:
+    xs[n + 1] = 0
+    xs.insert(0, 5)
+    n = n + 1
+print(n)
+print(xs[0:3])
+
+# Fenêtres glissantes.
+total = 0
+for k in range(0, 90, 10):
+    window = xs[k:k + 40]
+    for x in window:
+        total = total + x
+print(total)
+
+s = "abcdefghijklmnopqrstuvwxyz" * 3
+t = s[3:70]
+print(t[0])
+print(t[1:4])
+print(s[::0 - 1][0:5])
+print(s[5:40] + "!")
+print("-".join([s[0:2], s[24:26]]))
+
+p = (1, 2, 3, 4, 5, 6)
+print(p[1:3])
+print(p[::2])
+big = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9) * 5
+print(big[40:][3:6])
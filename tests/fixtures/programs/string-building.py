@@ -0,0 +1,21 @@
+def report(rows):
+    lines = []
+    for row in rows:
+        lines = lines + ["{:<8}{:>6.1f}".format(row[0], row[1])]
+    return "\n".join(lines)
+
+print(report([("alice", 12.5), ("bob", 9), ("chloé", 17.25)]))
+
+digits = ""
+for i in range(500):
+    digits = digits + str(i % 10)
+print(digits[0] + digits[499])
+copy = digits + ""
+print(copy == digits)
+left = digits + "a"
+right = digits + "b"
+print(left[500] + right[500])
+print(left < right)
+print(", ".join(("un", "deux", "trois")))
+print("{} + {} = {}".format(1, 2, 1 + 2))
+print("{1}{0}".format("a", "b"))
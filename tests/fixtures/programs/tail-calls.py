@@ -0,0 +1,39 @@
+# Appels en position terminale : return f(...)
+def total(n, acc):
+    if n == 0:
+        return acc
+    return total(n - 1, acc + n)
+
+def even(n):
+    if n == 0:
+        return True
+    return odd(n - 1)
+
+def odd(n):
+    if n == 0:
+        return False
+    return even(n - 1)
+
+def find(l, i, x):
+    if l[i] == x:
+        return i
+    return find(l, i + 1, x)
+
+class Point:
+    def __init__(self):
+        self.x = 1
+        return total(3, 0)
+
+    def name(self):
+        return str(self.x)
+
+def make():
+    return Point()
+
+print(total(50, 0))
+print(even(41))
+print(odd(41))
+print(find([5, 6, 7, 8], 0, 7))
+p = make()
+print(p.x)
+print(p.name())
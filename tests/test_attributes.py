@@ -0,0 +1,131 @@
+import pytest
+
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.evaluator.attributes import AttributeCache, AttributeStoreCache, get_attribute, set_attribute
+from pithon.evaluator.envvalue import VClassDef, VObject, VMethodClosure, VNumber
+from pithon.vm.compiler import compile_program, disassemble
+
+POINT = """
+class Point:
+    def __init__(self):
+        self.x = 1
+        self.y = 2
+
+    def total(self):
+        return self.x + self.y
+"""
+
+
+def test_instances_share_shapes(run):
+    env = run(POINT + "a = Point()\nb = Point()\nc = Point()\nc.z = 3\n")
+    a, b, c = (env.lookup(name) for name in "abc")
+    assert a.shape is b.shape
+    assert a.shape.names == ("x", "y")
+    assert c.shape.names == ("x", "y", "z")
+    assert c.shape is a.shape.with_attribute("z")
+    assert a.attributes == {"x": VNumber(1), "y": VNumber(2)}
+
+
+def test_shapes_belong_to_their_class():
+    first, second = VClassDef("A", {}), VClassDef("B", {})
+    assert first.shape.with_attribute("x") is not second.shape.with_attribute("x")
+    assert first.shape.with_attribute("x").class_def is first
+
+
+def test_load_cache_follows_shape_changes():
+    point = VClassDef("Point", {})
+    obj = VObject(point.shape)
+    set_attribute(obj, "x", VNumber(1))
+    cache = AttributeCache("x")
+    assert cache.load(obj) == VNumber(1)
+    assert cache.shape is obj.shape and cache.index == 0
+
+    other = VObject(point.shape)
+    set_attribute(other, "y", VNumber(2))
+    set_attribute(other, "x", VNumber(3))
+    assert cache.load(other) == VNumber(3)
+    assert cache.shape is other.shape and cache.index == 1
+
+
+def test_load_cache_remembers_methods():
+    method = object()
+    cls = VClassDef("C", {"m": method})
+    obj = VObject(cls.shape)
+    cache = AttributeCache("m")
+    bound = cache.load(obj)
+    assert isinstance(bound, VMethodClosure) and bound.function is method
+    assert cache.method_shape is obj.shape and cache.method is method
+    # Un attribut de l'instance masque la méthode.
+    set_attribute(obj, "m", VNumber(1))
+    assert get_attribute(obj, "m") == VNumber(1)
+
+
+def test_store_cache_records_transitions():
+    cls = VClassDef("C", {})
+    cache = AttributeStoreCache("x")
+    obj = VObject(cls.shape)
+    cache.store(obj, VNumber(1))
+    assert cache.new_shape is cls.shape and cache.next_shape is obj.shape
+    cache.store(obj, VNumber(2))
+    assert cache.shape is obj.shape and cache.index == 0 and obj.slots == [VNumber(2)]
+
+
+def test_missing_attribute():
+    obj = VObject(VClassDef("C", {}).shape)
+    with pytest.raises(AttributeError, match="toto"):
+        get_attribute(obj, "toto")
+
+
+def test_equality_ignores_attribute_order():
+    cls = VClassDef("C", {})
+    a, b = VObject(cls.shape), VObject(cls.shape)
+    set_attribute(a, "x", VNumber(1))
+    set_attribute(a, "y", VNumber(2))
+    set_attribute(b, "y", VNumber(2))
+    set_attribute(b, "x", VNumber(1))
+    assert a.shape is not b.shape
+    assert a == b
+
+
+def test_disassemble_shows_attribute_names():
+    code = compile_program(resolve(SimpleParser().parse("p.x = p.y")))
+    text = disassemble(code)
+    assert "LOAD_ATTR" in text and "(y)" in text and "(x)" in text
+
+
+def test_method_calls_bind_arguments(run):
+    env = run(POINT + "p = Point()\nclass Pair:\n    def __init__(self, a, *rest):\n"
+                      "        self.a = a\n        self.rest = rest\n"
+                      "q = Pair(1, 2, 3)\n")
+    q = env.lookup("q")
+    assert get_attribute(q, "a") == VNumber(1)
+    assert get_attribute(q, "rest").value == [VNumber(2), VNumber(3)]
+
+
+@pytest.mark.parametrize("source, message", [
+    (POINT + "Point().total(1)", "Trop d'arguments"),
+    (POINT + "Point(1)", "Trop d'arguments"),
+    ("class Empty:\n    def m(self):\n        return 1\nEmpty(1)", "ne prend pas d'arguments"),
+])
+def test_method_call_arity_errors(run, source, message):
+    with pytest.raises(TypeError, match=message):
+        run(source)
+
+
+def test_method_calls_do_not_bind_methods(run, monkeypatch):
+    """Un appel obj.m(...) n'alloue pas de VMethodClosure."""
+    import pithon.evaluator.attributes as attributes
+    import pithon.evaluator.compiler as compiler
+    import pithon.vm.machine as machine
+    created = []
+    for module in (attributes, compiler, machine):
+        monkeypatch.setattr(module, "VMethodClosure", lambda **kw: created.append(kw))
+    run(POINT + "p = Point()\nfor i in range(3):\n    p.total()\n")
+    assert created == []
+
+
+def test_disassemble_method_call():
+    code = compile_program(resolve(SimpleParser().parse("p.m(1)\nreturn_value = p.m(2)")))
+    text = disassemble(code)
+    assert "LOAD_METHOD" in text and "CALL_METHOD" in text and "(m)" in text
@@ -0,0 +1,52 @@
+import json
+
+from pithon.bench import bench_main, compare_reports, list_workloads, run_benchmarks
+
+
+def test_workloads_are_shipped():
+    assert {"fib", "factorial", "nested_loops", "string_building", "list_concat", "list_append", "dedup", "windows", "methods", "closures"} <= set(list_workloads())
+
+
+def test_report_contains_measures():
+    report = run_benchmarks(["fib"], warmup=0, repeat=2)
+    fib = report["workloads"]["fib"]
+    assert fib["output"] == "6765\n"
+    assert len(fib["wall_time"]["runs"]) == 2
+    assert fib["peak_memory"] > 0
+    assert fib["allocations"] == sum(fib["allocations_by_type"].values()) > 0
+
+
+def test_call_frames_are_counted():
+    for use_vm in (False, True):
+        report = run_benchmarks(["fib", "closures"], warmup=0, repeat=1, use_vm=use_vm)
+        for result in report["workloads"].values():
+            assert result["allocations_by_type"].get("SlotFrame", 0) > 0
+
+
+def test_vm_gives_same_output():
+    report = run_benchmarks(["closures"], warmup=0, repeat=1, use_vm=True)
+    assert report["engine"] == "vm"
+    assert report["workloads"]["closures"]["output"] == "25000000\n"
+
+
+def _report(median, output="1\n"):
+    result = {"output": output, "wall_time": {"median": median}, "peak_memory": 100, "allocations": 10}
+    return {"workloads": {"w": result}}
+
+
+def test_compare_flags_regressions():
+    _, regressions = compare_reports(_report(1.0), _report(1.5), threshold=0.1)
+    assert regressions == ["w : temps x1.50"]
+    _, regressions = compare_reports(_report(1.0), _report(1.05), threshold=0.1)
+    assert regressions == []
+    _, regressions = compare_reports(_report(1.0), _report(1.0, output="2\n"))
+    assert regressions == ["w : sortie différente"]
+
+
+def test_compare_exit_code(tmp_path, capsys):
+    before, after = tmp_path / "before.json", tmp_path / "after.json"
+    before.write_text(json.dumps(_report(1.0)))
+    after.write_text(json.dumps(_report(2.0)))
+    assert bench_main(["compare", str(before), str(before)]) == 0
+    assert bench_main(["compare", str(before), str(after)]) == 1
+    assert "RÉGRESSION w : temps x2.00" in capsys.readouterr().out
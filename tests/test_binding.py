@@ -0,0 +1,72 @@
+import pytest
+
+from pithon.evaluator.envframe import FRAME_POOL_SIZE, UNBOUND
+from pithon.evaluator.envvalue import VNumber
+
+
+def plan_of(env, name):
+    return env.lookup(name).funcdef.plan
+
+
+def test_plan_records_parameters(run):
+    env = run("def f(a, b, *rest):\n    x = a\n    return x\n0")
+    plan = plan_of(env, "f")
+    assert (plan.arity, plan.vararg) == (2, True)
+    assert plan.padding == [UNBOUND]
+
+
+def test_functions_defining_closures_keep_their_frames(run):
+    env = run("def adder(n):\n    def add(x):\n        return x + n\n    return add\n"
+              "def leaf(n):\n    return n\n0")
+    assert plan_of(env, "adder").pool is None
+    assert plan_of(env, "leaf").pool is not None
+
+
+def test_frames_are_recycled(run):
+    source = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)\nr = fib(15)"
+    env = run(source)
+    assert env.lookup("r") == VNumber(610)
+    pool = plan_of(env, "fib").pool
+    # Un cadre par niveau de récursion, libéré puis réutilisé.
+    assert 0 < len(pool) <= 15
+    assert all(frame.slots is None and frame.parent is None for frame in pool)
+
+
+def test_pool_is_bounded(run):
+    source = "def count(n):\n    if n == 0:\n        return 0\n    return 1 + count(n - 1)\nr = count(100)"
+    env = run(source)
+    assert env.lookup("r") == VNumber(100)
+    assert len(plan_of(env, "count").pool) == FRAME_POOL_SIZE
+
+
+def test_recycled_frames_start_unbound(run):
+    """Une variable locale pas encore affectée est cherchée dans les cadres englobants."""
+    source = ("x = 'global'\n"
+              "def f(first):\n"
+              "    if first:\n"
+              "        x = 'local'\n"
+              "    return x\n"
+              "r = f(True) + f(False)")
+    assert run(source).lookup("r").value == "localglobal"
+
+
+def test_closures_keep_their_environment(run):
+    source = ("def adder(n):\n    def add(x):\n        return x + n\n    return add\n"
+              "a = adder(1)\nb = adder(10)\nr = a(0) + b(0)")
+    assert run(source).lookup("r") == VNumber(11)
+
+
+@pytest.mark.parametrize("source, message", [
+    ("def f(a, b):\n    return a\nf(1)", "Argument manquant"),
+    ("def f(a):\n    return a\nf(1, 2)", "Trop d'arguments"),
+    ("def f(a, *rest):\n    return a\nf()", "Argument manquant"),
+])
+def test_arity_errors(run, source, message):
+    with pytest.raises(TypeError, match=message):
+        run(source)
+
+
+def test_varargs(run):
+    env = run("def f(a, *rest):\n    return rest\nr = f(1, 2, 3)\ns = f(1)")
+    assert env.lookup("r").value == [VNumber(2), VNumber(3)]
+    assert env.lookup("s").value == []
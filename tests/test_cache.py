@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from pithon.cache import cached_parse, cache_path, encode, decode
+from pithon.cli import parse_program
+from pithon.syntax import position
+
+PROGRAMS = sorted((Path(__file__).parent / "fixtures" / "programs").glob("*.py"))
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, source):
+        self.calls += 1
+        return parse_program(source)
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "script.py"
+    path.write_text("x = (1, 2)\nprint(x)\n", encoding="utf-8")
+    return path
+
+
+def test_second_load_uses_cache(script):
+    parse = CountingParser()
+    first = cached_parse(str(script), script.read_text(), parse, "opt")
+    second = cached_parse(str(script), script.read_text(), parse, "opt")
+    assert parse.calls == 1
+    assert first == second
+
+
+def test_changed_source_is_parsed_again(script):
+    parse = CountingParser()
+    cached_parse(str(script), script.read_text(), parse, "opt")
+    script.write_text("print(3)\n", encoding="utf-8")
+    cached_parse(str(script), script.read_text(), parse, "opt")
+    assert parse.calls == 2
+
+
+def test_variants_have_separate_entries(script):
+    parse = CountingParser()
+    cached_parse(str(script), script.read_text(), parse, "opt")
+    cached_parse(str(script), script.read_text(), parse, "noopt")
+    assert parse.calls == 2
+    assert cache_path(str(script), "opt") != cache_path(str(script), "noopt")
+
+
+@pytest.mark.parametrize("content", [b"", b"not marshal data", b"\xe9\x03\x00\x00"])
+def test_corrupted_entry_is_replaced(script, content):
+    parse = CountingParser()
+    cached_parse(str(script), script.read_text(), parse, "opt")
+    Path(cache_path(str(script), "opt")).write_bytes(content)
+    assert cached_parse(str(script), script.read_text(), parse, "opt") == parse_program(script.read_text())
+    assert parse.calls == 2
+    cached_parse(str(script), script.read_text(), parse, "opt")
+    assert parse.calls == 2
+
+
+@pytest.mark.parametrize("path", PROGRAMS, ids=[p.name for p in PROGRAMS])
+def test_roundtrip(path):
+    program = parse_program(path.read_text(encoding="utf-8"))
+    assert decode(encode(program)) == program
+
+
+def test_roundtrip_keeps_positions():
+    program = parse_program("x = 1\nif x:\n    print(x)\n")
+    decoded = decode(encode(program))
+    assert [position(s) for s in decoded] == [(1, 0), (2, 0)]
+    assert position(decoded[1].then_branch[0]) == (3, 4)
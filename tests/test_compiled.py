@@ -0,0 +1,32 @@
+import pytest
+from pathlib import Path
+
+from pithon.cli import run_file
+
+cases_dir = Path(__file__).parent / "fixtures" / "programs"
+# Seuls les programmes avec une sortie attendue sont comparés
+test_cases = [(p, p.with_suffix(".out")) for p in sorted(cases_dir.glob("*.py"))
+              if p.with_suffix(".out").exists()]
+id_list = [x[0].name for x in test_cases]
+
+@pytest.mark.parametrize("source_path, expected_path",
+                         test_cases,
+                         ids=id_list)
+@pytest.mark.parametrize("optimized", [True, False], ids=["optimized", "not-optimized"])
+def test_compiled_outputs_match(source_path: Path,
+                                expected_path: Path,
+                                optimized: bool,
+                                capfd):
+    """
+    Exécute chaque programme avec le compilateur en fermetures (moteur par
+    défaut), avec et sans optimiseur, et compare la sortie avec le fichier
+    .out correspondant.
+    """
+    run_file(source_path, optimized=optimized, use_cache=False)
+    captured = capfd.readouterr()
+    expected_stdout = expected_path.read_text(encoding="utf-8")
+    assert captured.out == expected_stdout, (
+        f"\nDifférence de sortie (compilé) pour {source_path.name}:\n"
+        f"--- obtenu ---\n{captured.out!r}\n"
+        f"--- attendu ---\n{expected_stdout!r}\n"
+    )
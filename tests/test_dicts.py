@@ -0,0 +1,67 @@
+import pytest
+
+from pithon.evaluator.envvalue import VDict, VSet, VList, VNumber, VString, VTuple, VTrue, VNoneValue, make_number
+from pithon.evaluator.limits import Limits, SizeLimitExceeded, limited
+
+def test_immutable_values_hash_like_python_values():
+    assert hash(make_number(3)) == hash(VNumber(3.0)) == hash(3)
+    assert hash(VString("ab")) == hash("ab")
+    assert {VString("ab"): 1}[VString("ab")] == 1
+
+
+def test_tuple_hash_is_computed_once():
+    key = VTuple((make_number(1), VString("a")))
+    assert key.cached_hash is None
+    h = hash(key)
+    assert key.cached_hash == h == hash((make_number(1), VString("a")))
+    assert key == VTuple((make_number(1), VString("a")))
+
+
+def test_dict_literal_subscript_and_membership(run):
+    env = run('d = {"a": 1, (1, 2): "t", "a": 3}\n'
+              'alias = d\n'
+              'd["b"] = 2\n'
+              'x = d[(1, 2)]\n'
+              'found = "b" in alias\n'
+              'keys = []\n'
+              'for k in d:\n    keys.append(k)\n')
+    d = env.lookup("d")
+    assert isinstance(d, VDict) and d is env.lookup("alias")
+    assert d.value[VString("a")] == VNumber(3)
+    assert env.lookup("x") == VString("t")
+    assert env.lookup("found") is VTrue
+    assert env.lookup("keys") == VList([VString("a"), VTuple((make_number(1), make_number(2))), VString("b")])
+
+
+def test_set_literal_and_methods(run):
+    env = run('s = {1, 2, 2}\ns.add(3)\nr = s.add(1)\nt = set(range(3))\nu = set()\n')
+    assert env.lookup("s") == VSet({make_number(1), make_number(2), make_number(3)})
+    assert env.lookup("r") is VNoneValue
+    assert env.lookup("t") == VSet({make_number(0), make_number(1), make_number(2)})
+    assert env.lookup("u") == VSet(set())
+
+
+@pytest.mark.parametrize("source, error", [
+    ('d = {}\nd["x"]', KeyError),
+    ("d = {[1]: 2}", TypeError),
+    ("d = {}\nd[[1]] = 2", TypeError),
+    ("[1] in {1}", TypeError),
+    ("s = {(1, [2])}", TypeError),
+    ("s = set(1)", TypeError),
+    ("{1}[0]", TypeError),
+])
+def test_errors(run, source, error):
+    with pytest.raises(error):
+        run(source)
+
+
+def test_growth_is_limited(run):
+    with limited(Limits(max_size=100)):
+        with pytest.raises(SizeLimitExceeded):
+            run("d = {}\nfor i in range(200):\n    d[i] = i\n")
+        with pytest.raises(SizeLimitExceeded):
+            run("s = set()\nfor i in range(200):\n    s.add(i)\n")
+        with pytest.raises(SizeLimitExceeded):
+            run("s = set(range(1000000000))")
+        # Remplacer une valeur ou ajouter un élément présent ne fait pas grandir.
+        run("d = {}\ns = set()\nfor i in range(200):\n    d[i % 10] = i\n    s.add(i % 10)\n")
@@ -0,0 +1,31 @@
+from pithon.evaluator.evaluator import initial_env
+from pithon.evaluator.envvalue import VNumber, VTrue, VNoneValue, make_number
+
+
+def test_operators_are_not_looked_up_by_default(run):
+    """Par défaut, redéfinir '+' dans l'environnement ne change pas l'addition."""
+    env = initial_env()
+    env.insert('+', lambda args: VNumber(42))
+    run("def f(a):\n    return a + 1\nr = f(1)", env)
+    assert env.lookup("r") == VNumber(2)
+
+
+def test_dynamic_operators_can_be_shadowed(run):
+    """Avec dynamic_operators, les opérateurs sont des variables de l'environnement."""
+    env = initial_env()
+    env.insert('+', lambda args: VNumber(42))
+    run("def f(a):\n    return a + 1\nr = f(1)", env, dynamic_operators=True)
+    assert env.lookup("r") == VNumber(42)
+
+
+def test_shared_values(run):
+    """Les booléens, None et les petits entiers sont des valeurs partagées."""
+    assert run("x = 1\nr = x < 2").lookup("r") is VTrue
+    assert run("def f():\n    return None\nr = f()").lookup("r") is VNoneValue
+    assert run("x = 40\nr = x + 2").lookup("r") is make_number(42)
+
+
+def test_number_cache_keeps_printing_and_equality():
+    assert make_number(3) == VNumber(3)
+    assert str(make_number(2.0)) == "2.0"
+    assert make_number(10**9) == VNumber(10**9)
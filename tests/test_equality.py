@@ -0,0 +1,65 @@
+import pytest
+
+from pithon.evaluator.envvalue import (
+    VList, VTuple, VRange, VString, VNumber, VTrue, VFalse, VNoneValue, ROPE_MIN_LENGTH,
+    concat_strings, make_number, values_equal
+)
+from pithon.evaluator.primitive import binary_eq, binary_neq
+
+
+def nested(depth, leaf):
+    value = VList([leaf])
+    for _ in range(depth):
+        value = VList([make_number(1), VTuple((value,))])
+    return value
+
+
+def test_scalar_equality():
+    assert values_equal(VNumber(2), make_number(2))
+    assert values_equal(VNumber(2.0), VNumber(2))
+    assert not values_equal(VNumber(1), VTrue)
+    assert not values_equal(VTrue, VNumber(1))
+    assert values_equal(VNoneValue, VNoneValue)
+    assert not values_equal(VNumber(float("nan")), VNumber(float("nan")))
+
+
+def test_ropes_equal_flat_strings():
+    rope = concat_strings(VString("x" * ROPE_MIN_LENGTH), VString("y"))
+    assert values_equal(rope, VString("x" * ROPE_MIN_LENGTH + "y"))
+    assert values_equal(VList([rope]), VList([VString(rope.value)]))
+
+
+def test_lists_and_ranges():
+    assert values_equal(VList([make_number(0), make_number(1)]), VRange(range(2)))
+    assert values_equal(VRange(range(2)), VList([make_number(0), make_number(1)]))
+    assert not values_equal(VList([]), VTuple(()))
+
+
+def test_range_list_comparison_does_not_build_the_range():
+    assert not values_equal(VRange(range(10**9)), VList([make_number(1)]))
+    assert not values_equal(VList([make_number(1)]), VRange(range(10**9)))
+    assert not values_equal(VRange(range(2)), VList([make_number(0), VTrue]))
+
+
+def test_deep_nesting_does_not_overflow():
+    assert binary_eq(nested(100_000, make_number(1)), nested(100_000, make_number(1))) is VTrue
+    assert binary_neq(nested(100_000, make_number(1)), nested(100_000, make_number(2))) is VTrue
+
+
+def test_values_that_contain_themselves():
+    a = VList([make_number(1)])
+    a.value.append(a)
+    assert values_equal(a, a)
+    b = VList([make_number(1)])
+    b.value.append(b)
+    with pytest.raises(RecursionError):
+        values_equal(a, b)
+
+
+def test_deeply_nested_lists_in_programs(run):
+    source = ("a = []\nb = []\nfor i in range(20000):\n    a = [i, a]\n    b = [i, b]\n"
+              "same = a == b\nb = [0, b]\ndiffer = a != b\n")
+    env = run(source)
+    assert env.lookup("same") is VTrue
+    assert env.lookup("differ") is VTrue
+    assert binary_eq(make_number(1), VTrue) is VFalse
@@ -0,0 +1,78 @@
+import pytest
+
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.optimizer import optimize
+from pithon.evaluator.evaluator import initial_env
+from pithon.evaluator.compiler import evaluate_compiled
+from pithon.evaluator.envvalue import VNumber
+from pithon.evaluator.limits import (
+    Limits, LimitExceeded, FuelExhausted, DeadlineExceeded, SizeLimitExceeded, limited, step
+)
+from pithon.syntax import PiBinaryOperation
+
+
+def run_limited(engine, source, **limits):
+    with limited(Limits(**limits)):
+        return engine(resolve(SimpleParser().parse(source)), initial_env())
+
+
+def test_fuel_counts_steps_exactly():
+    with limited(Limits(fuel=3)):
+        step()
+        step()
+        step()
+        with pytest.raises(FuelExhausted):
+            step()
+
+
+def test_limits_are_restored():
+    with limited(Limits(fuel=1)):
+        step()
+    for _ in range(10000):
+        step()
+
+
+def test_fuel_stops_infinite_loop(engine):
+    with pytest.raises(FuelExhausted):
+        run_limited(engine, "while True:\n    x = 1\n", fuel=5000)
+
+
+def test_fuel_counts_loop_iterations_and_calls(engine):
+    source = "def f(n):\n    return n\nfor i in range(10):\n    f(i)\n"
+    assert run_limited(engine, source, fuel=20) == VNumber(9)
+    with pytest.raises(FuelExhausted):
+        run_limited(engine, source, fuel=19)
+
+
+def test_deadline(engine):
+    with pytest.raises(DeadlineExceeded):
+        run_limited(engine, "def f(n):\n    return f(n)\nwhile True:\n    x = 1\n", time_limit=0.05)
+
+
+@pytest.mark.parametrize("source", [
+    "[0] * 1000000000",
+    "3 * (1, 2)",
+    "x = 'abc'\nx + x",
+    "range(1000000000) + [1]",
+    "str(range(1000000000))",
+    "print(range(1000000000))",
+    "'{}'.format(range(1000000000))",
+    "str([range(1000000000)])",
+])
+def test_size_limit(engine, source):
+    with pytest.raises(SizeLimitExceeded):
+        run_limited(engine, source, max_size=5)
+
+
+def test_limit_errors_share_a_base_class():
+    assert all(issubclass(cls, LimitExceeded) for cls in (FuelExhausted, DeadlineExceeded, SizeLimitExceeded))
+
+
+def test_no_limits_by_default():
+    assert run_limited(evaluate_compiled, "x = [0] * 100000\n0") == VNumber(0)
+
+
+def test_optimizer_does_not_build_huge_constants():
+    program = optimize(SimpleParser().parse("'a' * 1000000000"))
+    assert isinstance(program[0], PiBinaryOperation)
@@ -0,0 +1,82 @@
+import pytest
+
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.evaluator.envvalue import VList, VNumber, VString, VNoneValue, make_number
+from pithon.evaluator.limits import Limits, SizeLimitExceeded, limited
+from pithon.syntax import PiSubscriptAssignment
+from pithon.vm.compiler import compile_program, disassemble
+
+def numbers(*values):
+    return VList([make_number(v) for v in values])
+
+
+def test_item_assignment_is_parsed():
+    stmt, = SimpleParser().parse("xs[i + 1] = 2")
+    assert isinstance(stmt, PiSubscriptAssignment)
+    assert "STORE_SUBSCR" in disassemble(compile_program(resolve([stmt])))
+
+
+def test_append_mutates_in_place(run):
+    env = run("xs = []\nys = xs\nfor i in range(1000):\n    xs.append(i)\n")
+    xs = env.lookup("xs")
+    assert xs is env.lookup("ys")
+    assert xs.value == [make_number(i) for i in range(1000)]
+
+
+def test_list_methods(run):
+    env = run("xs = [1, 2]\n"
+              "xs.extend((3, 4))\n"
+              "xs.insert(0, 0)\n"
+              "a = xs.pop()\n"
+              "b = xs.pop(0)\n"
+              "c = xs.append(5)\n")
+    assert env.lookup("xs") == numbers(1, 2, 3, 5)
+    assert env.lookup("a") == VNumber(4)
+    assert env.lookup("b") == VNumber(0)
+    assert env.lookup("c") is VNoneValue
+
+
+def test_item_assignment_is_seen_through_aliases(run):
+    env = run("grid = [[0, 0], [0, 0]]\nrow = grid[1]\nrow[0] = 1\ngrid[0][1] = 2\n")
+    assert env.lookup("grid") == VList([numbers(0, 2), numbers(1, 0)])
+
+
+def test_item_assignment_evaluates_value_first(run):
+    env = run("log = []\n"
+              "def note(x):\n    log.append(x)\n    return x\n"
+              "xs = [0]\n"
+              "note(xs)[note(0)] = note(\"v\")\n")
+    log = env.lookup("log").value
+    assert log[0] == VString("v") and log[2] == VNumber(0)
+    assert env.lookup("xs") == VList([VString("v")])
+
+
+@pytest.mark.parametrize("source, error", [
+    ("t = (1, 2)\nt[0] = 3", TypeError),
+    ("s = 'ab'\ns[0] = 'c'", TypeError),
+    ("xs = [1]\nxs[3] = 2", IndexError),
+    ("xs = []\nxs.pop()", IndexError),
+    ("xs = []\nxs.append(1, 2)", TypeError),
+    ("xs = []\nxs.extend(1)", TypeError),
+])
+def test_errors(run, source, error):
+    with pytest.raises(error):
+        run(source)
+
+
+def test_list_growth_is_limited(run):
+    with limited(Limits(max_size=100)):
+        with pytest.raises(SizeLimitExceeded):
+            run("xs = []\nfor i in range(200):\n    xs.append(i)\n")
+        with pytest.raises(SizeLimitExceeded):
+            run("xs = [0]\nfor i in range(10):\n    xs.extend(xs)\n")
+
+
+def test_list_that_contains_itself_is_printed(run):
+    env = run('l = [1]\nl.append(l)\ns = str(l)\nt = "{}".format([l])\n')
+    assert env.lookup("s") == VString("[1, [...]]")
+    assert env.lookup("t") == VString("[[1, [...]]]")
+    xs = numbers(1)
+    xs.value.append(xs)
+    assert str(xs) == repr(xs) == "[1, [...]]"
@@ -0,0 +1,63 @@
+import pytest
+
+from pithon.parser.simpleparser import SimpleParser
+from pithon.optimizer import optimize
+from pithon.resolver import resolve
+from pithon.syntax import PiAssignment, PiBinaryOperation, PiConstant, PiNumber, PiBool, PiString, PiNone, position
+from pithon.evaluator.envvalue import VTuple, VNumber
+
+
+def optimized(source, **options):
+    return optimize(SimpleParser().parse(source), **options)
+
+
+def test_constant_arithmetic_is_folded():
+    assert optimized("x = 2 * 3 + 1") == [PiAssignment(name="x", value=PiNumber(value=7))]
+
+
+def test_comparisons_are_folded():
+    assert optimized("1 < 2") == [PiBool(value=True)]
+
+
+def test_failing_operation_is_kept():
+    """L'erreur doit survenir à l'exécution."""
+    [stmt] = optimized("1 / 0")
+    assert isinstance(stmt, PiBinaryOperation)
+
+
+def test_dynamic_operators_disable_folding():
+    [stmt] = optimized("2 * 3", dynamic_operators=True)
+    assert isinstance(stmt, PiBinaryOperation)
+
+
+def test_constant_tuple_is_shared():
+    [stmt] = optimized("(1, (2, 3))")
+    assert stmt == PiConstant(value=VTuple((VNumber(1), VTuple((VNumber(2), VNumber(3))))))
+
+
+def test_dead_branches_are_pruned():
+    assert optimized("if False:\n    x = 1\nelse:\n    x = 2") == [PiAssignment(name="x", value=PiNumber(value=2))]
+
+
+def test_pruned_empty_branch_keeps_none_value():
+    assert optimized("x = 1\nif False:\n    x = 2") == [
+        PiAssignment(name="x", value=PiNumber(value=1)), PiNone(value=None)
+    ]
+
+
+@pytest.mark.parametrize("source", ['"doc"\nx = 1', '5\nx = 1', '(1, 2)\nx = 1'])
+def test_unused_pure_expressions_are_dropped(source):
+    assert optimized(source) == [PiAssignment(name="x", value=PiNumber(value=1))]
+
+
+def test_last_statement_is_kept():
+    assert optimized('x = 1\n"fin"') == [PiAssignment(name="x", value=PiNumber(value=1)), PiString(value="fin")]
+
+
+def test_positions_are_kept():
+    program = SimpleParser().parse("y = 1\ndef f(x):\n    return x + 2 * 3\n")
+    assert position(program[1]) == (2, 0)
+    body = resolve(optimize(program))[1].body[0]
+    assert position(body) == (3, 4)
+    assert position(body.value) == (3, 11)
+    assert position(body.value.right) == (3, 15)
@@ -0,0 +1,75 @@
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.evaluator.evaluator import initial_env
+from pithon.evaluator.compiler import compile_program, evaluate_compiled
+from pithon.profiler import Profiler, LineSampler, MODULE
+
+SOURCE = """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+class Counter:
+    def incr(self):
+        self.count = self.count + 1
+
+c = Counter()
+c.count = 0
+c.incr()
+c.incr()
+fib(10)
+"""
+
+
+def profile(source):
+    profiler = Profiler()
+    evaluate_compiled(resolve(SimpleParser().parse(source)), initial_env(), profiler)
+    return profiler
+
+
+def test_function_and_method_calls_are_counted():
+    profiler = profile(SOURCE)
+    assert profiler.functions["fib"][0] == 177
+    assert profiler.functions["Counter.incr"][0] == 2
+    assert profiler.functions[MODULE][0] == 1
+
+
+def test_recursive_total_time_is_not_counted_twice():
+    profiler = profile(SOURCE)
+    calls, total, own = profiler.functions["fib"]
+    assert own <= total <= profiler.total_time
+
+
+def test_node_types_are_counted():
+    profiler = profile(SOURCE)
+    assert profiler.nodes["PiReturn"][0] == 177
+    assert profiler.nodes["PiClassDef"][0] == 1
+
+
+def test_collapsed_stacks():
+    stacks = profile(SOURCE).collapsed_stacks().splitlines()
+    paths = {line.rsplit(" ", 1)[0] for line in stacks}
+    assert f"{MODULE};fib;fib" in paths
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+
+
+def test_report_is_sorted_by_own_time():
+    report = profile(SOURCE).report("test")
+    assert report.startswith("Profil de test")
+    assert "Counter.incr" in report and "PiFunctionCall" in report
+
+
+def test_no_instrumentation_without_profiler():
+    code = compile_program(resolve(SimpleParser().parse("x = 1 + 2\nx")))
+    assert "profiled" not in code.__qualname__
+    assert "profiled" in compile_program(SimpleParser().parse("x = 1"), Profiler()).__qualname__
+
+
+def test_line_sampler_finds_hot_line():
+    source = "n = 0\nfor i in range(200000):\n    n = n + i * 2\nprint(n)\n"
+    sampler = LineSampler(interval=0.0005)
+    evaluate_compiled(resolve(SimpleParser().parse(source)), initial_env(), sampler)
+    assert sampler.total > 0
+    assert sampler.samples.most_common(1)[0][0] in (2, 3)
+    assert "n = n + i * 2" in sampler.report(source, "boucle")
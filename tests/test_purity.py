@@ -0,0 +1,90 @@
+import pytest
+
+from pithon.cli import run_file
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.purity import MemoTable, pure_functions, memoize
+from pithon.evaluator.envvalue import VNumber, VString, VList, VTuple, make_number
+from pithon.evaluator.evaluator import initial_env
+
+FIB = """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+"""
+
+
+def resolved(source, dynamic_operators=False):
+    return resolve(SimpleParser().parse(source), dynamic_operators)
+
+
+def test_recursive_function_is_pure():
+    assert pure_functions(resolved(FIB)) == {"fib"}
+
+
+@pytest.mark.parametrize("body", [
+    "print(n)\n    return n",
+    "return n + k",
+    "n.x = 1\n    return n",
+    "return n.f()",
+    "n[0] = 1\n    return n",
+    "n.append(1)\n    return n",
+    "return impure(n)",
+    "def g():\n        return 1\n    return g()",
+])
+def test_impure_functions(body):
+    source = f"k = 1\ndef impure(n):\n    print(n)\ndef f(n):\n    {body}\n"
+    assert "f" not in pure_functions(resolved(source))
+
+
+def test_redefined_names_are_not_pure():
+    assert pure_functions(resolved(FIB + FIB)) == set()
+    assert pure_functions(resolved("str = 1\ndef f(n):\n    return str(n)\n")) == set()
+
+
+def test_dynamic_operators_disable_memoization():
+    assert pure_functions(resolved(FIB, dynamic_operators=True)) == set()
+
+
+def test_memo_table_is_bounded_lru():
+    table = MemoTable(size=2)
+    for n in (1, 2):
+        table.put(table.key([make_number(n)]), make_number(n * 10))
+    assert table.get(table.key([make_number(1)])) == VNumber(10)
+    table.put(table.key([make_number(3)]), make_number(30))
+    assert table.get(table.key([make_number(2)])) is None
+    assert table.get(table.key([make_number(1)])) == VNumber(10)
+    assert (table.hits, table.misses) == (2, 1)
+
+
+def test_memo_keys():
+    table = MemoTable()
+    assert table.key([VNumber(2)]) != table.key([VNumber(2.0)])
+    assert table.key([VNumber(1)]) != table.key([VString("1")])
+    assert table.key([VTuple((VNumber(1), VString("a")))]) is not None
+    assert table.key([VList([])]) is None
+    assert table.key([VTuple((VList([]),))]) is None
+
+
+def test_mutable_results_are_not_stored():
+    table = MemoTable()
+    table.put(table.key([VNumber(1)]), VList([]))
+    assert not table.entries
+
+
+def test_memoized_calls(engine):
+    program = resolved(FIB + "fib(30)\n")
+    tables = memoize(program, size=100)
+    assert engine(program, initial_env()) == VNumber(832040)
+    assert tables["fib"].misses == 31
+    assert tables["fib"].hits == 28
+
+
+def test_memo_report_is_printed_on_stderr(tmp_path, capsys):
+    path = tmp_path / "fib.py"
+    path.write_text(FIB + "print(fib(20))\n", encoding="utf-8")
+    run_file(path, use_cache=False, memo_size=100, memo_stats=True)
+    out, err = capsys.readouterr()
+    assert out == "6765\n"
+    assert err.splitlines()[1].split() == ["fib", "18", "21", "21"]
@@ -0,0 +1,90 @@
+from pithon.parser.simpleparser import SimpleParser
+from pithon.resolver import resolve
+from pithon.syntax import (
+    PiAssignment, PiBinaryOperation, PiFunctionDef, PiGlobalVariable, PiLocalAssignment, PiLocalVariable,
+    PiNumber, PiReturn, PiVariable
+)
+from pithon.evaluator.envvalue import VNumber, VString
+
+
+def resolved(source, **options):
+    return resolve(SimpleParser().parse(source), **options)
+
+
+def test_top_level_variables_are_not_resolved():
+    assert resolved("x = 1\nx") == [PiAssignment(name="x", value=PiNumber(value=1)), PiVariable(name="x")]
+
+
+def test_parameters_come_before_other_locals():
+    [f] = resolved("def f(a, *rest):\n    b = a\n    for i in rest:\n        b = i\n    return b\n")
+    assert f.layout.names == ("a", "rest", "b", "i")
+    assert f.body[0] == PiLocalAssignment(name="b", slot=2, value=PiLocalVariable(name="a", depth=0, slot=0))
+    assert f.body[-1] == PiReturn(value=PiLocalVariable(name="b", depth=0, slot=2))
+
+
+def test_free_variables_are_global_from_the_outermost_function():
+    [f] = resolved("def f(a):\n    def g():\n        return a + x\n    return g\n")
+    g = f.body[0]
+    assert f.layout.names == ("a", "g") and g.layout.names == ()
+    assert g.body == [PiReturn(value=PiBinaryOperation(
+        left=PiLocalVariable(name="a", depth=1, slot=0),
+        operator="+",
+        right=PiGlobalVariable(name="x", depth=2)
+    ))]
+
+
+def test_inner_locals_shadow_enclosing_ones():
+    [f] = resolved("def f(a):\n    def g(b):\n        a = b\n        return a\n    return g\n")
+    g = f.body[0]
+    assert g.layout.names == ("b", "a")
+    assert g.body == [
+        PiLocalAssignment(name="a", slot=1, value=PiLocalVariable(name="b", depth=0, slot=0)),
+        PiReturn(value=PiLocalVariable(name="a", depth=0, slot=1)),
+    ]
+
+
+def test_duplicate_parameters_keep_a_dynamic_frame():
+    [f] = resolved("def f(a, a):\n    b = a\n    return b\n")
+    assert isinstance(f, PiFunctionDef)
+    assert f.layout is None and f.plan is None
+    assert f.body == [PiAssignment(name="b", value=PiVariable(name="a")), PiReturn(value=PiVariable(name="b"))]
+
+
+def test_closures_read_enclosing_slots(run):
+    env = run("def counter(start):\n"
+              "    n = start\n"
+              "    def next(step):\n"
+              "        return n + step\n"
+              "    return next\n"
+              "inc = counter(10)\n"
+              "r = inc(1) + inc(2)\n")
+    assert env.lookup("r") == VNumber(23)
+
+
+def test_globals_are_found_from_nested_functions(run):
+    env = run("x = 1\n"
+              "def f():\n"
+              "    def g():\n"
+              "        return x\n"
+              "    return g\n"
+              "h = f()\n"
+              "x = 2\n"
+              "r = h()\n")
+    assert env.lookup("r") == VNumber(2)
+
+
+def test_unbound_slot_falls_back_to_the_enclosing_frame(run):
+    env = run("x = 'global'\n"
+              "def f(assign):\n"
+              "    if assign:\n"
+              "        x = 'local'\n"
+              "    def g():\n"
+              "        return x\n"
+              "    return g()\n"
+              "r = f(False) + f(True) + f(False)\n")
+    assert env.lookup("r") == VString("globallocalglobal")
+
+
+def test_duplicate_parameters_bind_the_last_argument(run):
+    env = run("def f(a, a):\n    b = a\n    return b\nr = f(1, 2)\n")
+    assert env.lookup("r") == VNumber(2)
@@ -0,0 +1,109 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pithon.evaluator.limits import Limits
+from pithon.server import ProgramServer, STATUS_OK, STATUS_ERROR, STATUS_LIMIT, STATUS_TIMEOUT
+
+fork_modes = [pytest.param(True, id="fork"), pytest.param(False, id="inline")]
+
+
+def serve(requests, **options):
+    """Sert les requêtes avec un ProgramServer; retourne (sorties, statuts) par id."""
+    server = ProgramServer(**options)
+    reader = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    writer = io.StringIO()
+    server.serve_stream(reader, writer)
+    outputs, finals = {}, {}
+    for line in writer.getvalue().splitlines():
+        message = json.loads(line)
+        if "stdout" in message:
+            outputs[message["id"]] = outputs.get(message["id"], "") + message["stdout"]
+        else:
+            finals[message["id"]] = message
+    return outputs, finals
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork non disponible")
+@pytest.mark.parametrize("use_fork", fork_modes)
+def test_programs_run_in_isolated_environments(use_fork):
+    outputs, finals = serve([
+        {"id": 1, "source": "x = 5\nprint(x * 2)"},
+        {"id": 2, "source": "print(x)"},
+        {"id": 3, "source": "def f(:"},
+    ], use_fork=use_fork)
+    assert outputs == {1: "10\n"}
+    assert finals[1]["status"] == STATUS_OK
+    assert finals[2]["status"] == STATUS_ERROR and "NameError" in finals[2]["error"]
+    assert finals[3]["status"] == STATUS_ERROR and "SyntaxError" in finals[3]["error"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork non disponible")
+def test_multibyte_characters_split_across_reads():
+    outputs, finals = serve([{"id": 1, "source": 'print("a" + "é" * 40000)'}], use_fork=True)
+    assert finals[1]["status"] == STATUS_OK
+    assert outputs == {1: "a" + "é" * 40000 + "\n"}
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork non disponible")
+def test_timeout_kills_program():
+    outputs, finals = serve([
+        {"id": "boucle", "source": "print(1)\nwhile True:\n    x = 1"},
+        {"id": "après", "source": "print(2)"},
+    ], timeout=0.3)
+    assert finals["boucle"]["status"] == STATUS_TIMEOUT
+    assert outputs == {"boucle": "1\n", "après": "2\n"}
+
+
+def test_invalid_request():
+    server = ProgramServer(use_fork=False)
+    writer = io.StringIO()
+    server.serve_stream(io.StringIO('{"id": 1}\nnot json\n'), writer)
+    messages = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [m["status"] for m in messages] == [STATUS_ERROR, STATUS_ERROR]
+
+
+def test_parsed_programs_are_reused():
+    server = ProgramServer(use_fork=False)
+    source = "print(1)"
+    assert server.parse(source) is server.parse(source)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="socket Unix non disponible")
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "pithon.sock")
+    process = subprocess.Popen(
+        [sys.executable, "-c", "from pithon.cli import main; main()", "serve", "--socket", path]
+    )
+    try:
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.05)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            with client.makefile("rw", encoding="utf-8") as stream:
+                stream.write(json.dumps({"id": 7, "source": "print(6 * 7)"}) + "\n")
+                stream.flush()
+                assert json.loads(stream.readline()) == {"id": 7, "stdout": "42\n"}
+                assert json.loads(stream.readline())["status"] == STATUS_OK
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork non disponible")
+@pytest.mark.parametrize("use_fork", fork_modes)
+def test_resource_limits(use_fork):
+    _, finals = serve([
+        {"id": 1, "source": "while True:\n    x = 1"},
+        {"id": 2, "source": "x = [0] * 1000"},
+    ], use_fork=use_fork, limits=Limits(fuel=1000, max_size=100))
+    assert finals[1]["status"] == STATUS_LIMIT and "FuelExhausted" in finals[1]["error"]
+    assert finals[2]["status"] == STATUS_LIMIT and "SizeLimitExceeded" in finals[2]["error"]
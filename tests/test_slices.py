@@ -0,0 +1,97 @@
+import gc
+
+import pytest
+
+from pithon.parser.simpleparser import SimpleParser
+from pithon.syntax import PiNone, PiNumber, PiSlice, PiSubscript
+from pithon.evaluator.envvalue import (
+    VList, VListView, VNumber, VString, VStringView, VTuple, VTupleView, VIEW_MIN_LENGTH,
+    is_view, share_list, slice_sequence, string_length
+)
+
+BUILD = """
+xs = []
+xs.extend(range(100))
+"""
+
+
+def numbers(n):
+    return VList([VNumber(i) for i in range(n)])
+
+
+def test_slice_syntax_is_parsed():
+    node = SimpleParser().parse("xs[1:]")[0]
+    assert isinstance(node, PiSubscript)
+    assert isinstance(node.index, PiSlice)
+    assert isinstance(node.index.lower, PiNumber)
+    assert isinstance(node.index.upper, PiNone) and isinstance(node.index.step, PiNone)
+
+
+def test_small_slices_are_copied():
+    xs = numbers(100)
+    part = slice_sequence(xs, slice(0, VIEW_MIN_LENGTH - 1))
+    assert type(part) is VList
+    assert xs.views is None
+
+
+def test_large_slices_share_storage():
+    xs = numbers(100)
+    view = slice_sequence(xs, slice(10, 90))
+    inner = slice_sequence(view, slice(None, None, 2))
+    assert type(view) is VListView and type(inner) is VListView
+    assert view.items is xs.value and inner.items is xs.value
+    assert inner.base is xs and len(xs.views) == 2
+    assert inner.value == [VNumber(i) for i in range(10, 90, 2)]
+
+
+def test_dead_views_are_pruned():
+    xs = numbers(100)
+    for _ in range(1000):
+        share_list(xs, VListView(xs.value, range(50), xs))
+    gc.collect()
+    assert len(xs.views) <= 64
+
+
+def test_views_are_copied_before_the_list_changes(run):
+    env = run(BUILD + "w = xs[10:60]\nxs[10] = 0\nxs.append(1)\nfirst = w[0]\n")
+    w = env.lookup("w")
+    assert not is_view(w)
+    assert env.lookup("first") == VNumber(10)
+    assert w.value == [VNumber(i) for i in range(10, 60)]
+
+
+def test_changing_a_view_leaves_the_list_alone(run):
+    env = run(BUILD + "w = xs[0:50]\nw[0] = 7\nw.append(8)\n")
+    assert env.lookup("xs").value == [VNumber(i) for i in range(100)]
+    assert env.lookup("w").value[0] == VNumber(7)
+    assert env.lookup("w").value[50] == VNumber(8)
+
+
+def test_iterating_a_window_does_not_copy_it(run):
+    env = run(BUILD + "w = xs[50:]\ntotal = 0\nfor x in w:\n    total = total + x\n")
+    assert is_view(env.lookup("w"))
+    assert env.lookup("total") == VNumber(sum(range(50, 100)))
+
+
+def test_string_and_tuple_views(run):
+    env = run('s = "0123456789" * 10\n'
+              't = s[10:90]\n'
+              'c = t[5]\n'
+              'p = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10) * 10\n'
+              'q = p[::2]\n'
+              'd = {q: 1}\n')
+    t, q = env.lookup("t"), env.lookup("q")
+    assert type(t) is VStringView and string_length(t) == 80 and t.items is not None
+    assert env.lookup("c") == VString("5")
+    assert t == VString("0123456789" * 8)
+    assert type(q) is VTupleView
+    assert q == VTuple(tuple(VNumber(i) for i in (1, 3, 5, 7, 9) * 10))
+
+
+def test_slice_errors(run):
+    with pytest.raises(ValueError):
+        run(BUILD + "xs[::0]")
+    with pytest.raises(TypeError):
+        run(BUILD + 'xs["a":]')
+    with pytest.raises(TypeError):
+        run("{1: 2}[0:1]")
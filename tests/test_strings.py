@@ -0,0 +1,71 @@
+import pytest
+
+from pithon.evaluator.envvalue import VRope, VString, ROPE_MIN_LENGTH, concat_strings, string_length
+from pithon.evaluator.limits import Limits, SizeLimitExceeded, limited
+
+BUILD = """
+s = ""
+for i in range(1000):
+    s = s + str(i % 10)
+"""
+
+
+def test_short_concatenations_stay_flat():
+    assert type(concat_strings(VString("ab"), VString("cd"))) is VString
+
+
+def test_rope_is_flattened_once_on_read():
+    a = VString("x" * ROPE_MIN_LENGTH)
+    rope = concat_strings(concat_strings(a, VString("y")), VString("z"))
+    assert type(rope) is VRope
+    assert string_length(rope) == ROPE_MIN_LENGTH + 2
+    assert rope.pieces is not None
+    assert rope.value == "x" * ROPE_MIN_LENGTH + "yz"
+    assert rope.pieces is None
+    assert rope == VString(rope.value) and VString(rope.value) == rope
+
+
+def test_ropes_sharing_pieces_keep_their_own_text():
+    base = concat_strings(VString("x" * ROPE_MIN_LENGTH), VString("-"))
+    left = concat_strings(base, VString("a"))
+    right = concat_strings(base, VString("b"))
+    assert left.value.endswith("-a")
+    assert right.value.endswith("-b")
+    assert base.value.endswith("x-")
+
+
+def test_concatenation_loop_builds_a_rope(run):
+    env = run(BUILD + "c = s[999]\nlonger = s + \"!\"\n")
+    assert type(env.lookup("s")) is VRope
+    assert env.lookup("c") == VString("9")
+    assert env.lookup("longer").value == "0123456789" * 100 + "!"
+
+
+def test_join_and_format(run):
+    env = run('a = ", ".join(["x", "y", "z"])\n'
+              'b = "{} = {:.2f}".format("pi", 3.14159)\n'
+              'f = "-".join\n'
+              'c = f(("u", "v"))\n')
+    assert env.lookup("a") == VString("x, y, z")
+    assert env.lookup("b") == VString("pi = 3.14")
+    assert env.lookup("c") == VString("u-v")
+
+
+def test_join_rejects_non_strings(run):
+    with pytest.raises(TypeError):
+        run('", ".join([1, 2])')
+
+
+def test_format_rejects_attribute_fields(run):
+    with pytest.raises(ValueError):
+        run('"{0.value}".format(1)')
+
+
+def test_string_sizes_are_limited(run):
+    with limited(Limits(max_size=500)):
+        with pytest.raises(SizeLimitExceeded):
+            run(BUILD)
+        with pytest.raises(SizeLimitExceeded):
+            run('"{:>1000}".format(1)')
+        with pytest.raises(SizeLimitExceeded):
+            run('"ab".join(["x" * 300, "z" * 300])')
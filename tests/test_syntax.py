@@ -0,0 +1,48 @@
+from dataclasses import fields, replace
+from pathlib import Path
+
+import pytest
+
+from pithon.cache import encode, decode
+from pithon.parser.simpleparser import SimpleParser
+from pithon.optimizer import optimize
+from pithon.resolver import resolve
+from pithon.syntax import PiNode, PiNumber, make_position, position
+
+PROGRAMS = sorted((Path(__file__).parent / "fixtures" / "programs").glob("*.py"))
+
+
+def nodes(tree):
+    """Énumère les nœuds d'un programme ou d'un nœud, en profondeur."""
+    if isinstance(tree, (list, tuple)):
+        for item in tree:
+            yield from nodes(item)
+    elif isinstance(tree, PiNode):
+        yield tree
+        for f in fields(tree):
+            yield from nodes(getattr(tree, f.name))
+
+
+def test_position_is_packed_and_ignored_by_comparisons():
+    node = PiNumber(value=1, pos=make_position(3, 7))
+    assert position(node) == (3, 7)
+    assert position(PiNumber(value=1)) is None
+    assert node == PiNumber(value=1) and repr(node) == "PiNumber(value=1)"
+
+
+def test_replace_keeps_position():
+    [stmt] = SimpleParser().parse("\nx = 1 + 2")
+    assert position(replace(stmt, name="y")) == (2, 0)
+    assert position(replace(stmt.value, operator="-")) == (2, 4)
+
+
+@pytest.mark.parametrize("path", PROGRAMS, ids=[p.name for p in PROGRAMS])
+def test_every_node_keeps_its_position(path):
+    program = SimpleParser().parse(path.read_text(encoding="utf-8"))
+    assert all(node.pos for node in nodes(program))
+    optimized = optimize(program)
+    assert all(node.pos for node in nodes(optimized))
+    assert all(node.pos for node in nodes(resolve(optimized)))
+    # Le cache conserve les arbres optimisés, avant résolution.
+    decoded = decode(encode(optimized))
+    assert [node.pos for node in nodes(decoded)] == [node.pos for node in nodes(optimized)]
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+import pithon.cli
+
+from pithon.testrunner import (
+    PASSED, FAILED, ERROR, TIMEOUT, collect_programs, run_programs, format_results, runner_main
+)
+
+
+@pytest.fixture
+def programs(tmp_path):
+    def add(name, source, expected=None):
+        (tmp_path / f"{name}.py").write_text(source, encoding="utf-8")
+        if expected is not None:
+            (tmp_path / f"{name}.out").write_text(expected, encoding="utf-8")
+    add("a_pass", "print(1 + 1)\n", "2\n")
+    add("b_fail", "print(3)\n", "4\n")
+    add("c_error", "print(x)\n", "")
+    add("d_timeout", "while True:\n    x = 1\n", "")
+    add("e_missing", "print(1)\n")
+    return tmp_path
+
+
+def statuses(results):
+    return {r.name: r.status for r in results}
+
+
+EXPECTED = {
+    "a_pass.py": PASSED,
+    "b_fail.py": FAILED,
+    "c_error.py": ERROR,
+    "d_timeout.py": TIMEOUT,
+    "e_missing.py": ERROR,
+}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_statuses(programs, jobs):
+    results = run_programs(collect_programs([str(programs)]), jobs=jobs, timeout=0.5, use_cache=False)
+    assert statuses(results) == EXPECTED
+    assert [r.name for r in results] == sorted(EXPECTED)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork non disponible")
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_crash_fails_only_its_program(programs, monkeypatch, jobs):
+    run_file = pithon.cli.run_file
+
+    def crash(path, **options):
+        if path.name == "b_fail.py":
+            os._exit(3)
+        run_file(path, **options)
+    monkeypatch.setattr(pithon.cli, "run_file", crash)
+    results = run_programs([programs / "a_pass.py", programs / "b_fail.py", programs / "a_pass.py"],
+                           jobs=jobs, use_cache=False)
+    assert [r.status for r in results] == [PASSED, ERROR, PASSED]
+    assert "anormalement" in results[1].detail
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork non disponible")
+def test_each_program_gets_a_fresh_process(programs, monkeypatch):
+    run_file = pithon.cli.run_file
+    seen = []
+
+    def leaky(path, **options):
+        assert not seen, "état laissé par le programme précédent"
+        seen.append(path)
+        run_file(path, **options)
+    monkeypatch.setattr(pithon.cli, "run_file", leaky)
+    results = run_programs([programs / "a_pass.py"] * 3, jobs=1, use_cache=False)
+    assert [r.status for r in results] == [PASSED] * 3
+
+
+def test_failure_shows_diff(programs):
+    [result] = run_programs([programs / "b_fail.py"], jobs=1, use_cache=False)
+    assert "-4" in result.detail and "+3" in result.detail
+    report = format_results([result], 0.1, 1)
+    assert "1 programmes en 0.10 s (1 processus) : 0 réussis, 1 échoués" in report
+
+
+def test_engine_options_are_passed(programs):
+    [result] = run_programs([programs / "a_pass.py"], jobs=1, use_vm=True, use_cache=False)
+    assert result.status == PASSED
+
+
+def test_exit_code(programs, capsys):
+    assert runner_main([str(programs / "a_pass.py")]) == 0
+    assert runner_main([str(programs), "--timeout", "0.5", "-j", "2"]) == 1
+    assert "hors délai" in capsys.readouterr().out
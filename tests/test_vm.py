@@ -0,0 +1,88 @@
+import tracemalloc
+import pytest
+from pathlib import Path
+
+from pithon.cli import run_file
+
+cases_dir = Path(__file__).parent / "fixtures" / "programs"
+# Seuls les programmes avec une sortie attendue sont comparés
+test_cases = [(p, p.with_suffix(".out")) for p in sorted(cases_dir.glob("*.py"))
+              if p.with_suffix(".out").exists()]
+id_list = [x[0].name for x in test_cases]
+
+@pytest.mark.parametrize("source_path, expected_path",
+                         test_cases,
+                         ids=id_list)
+def test_vm_outputs_match(source_path: Path,
+                          expected_path: Path,
+                          capfd):
+    """
+    Exécute chaque programme avec la machine virtuelle (--vm) et compare
+    la sortie avec le fichier .out correspondant.
+    """
+    run_file(source_path, use_vm=True)
+    captured = capfd.readouterr()
+    expected_stdout = expected_path.read_text(encoding="utf-8")
+    assert captured.out == expected_stdout, (
+        f"\nDifférence de sortie (VM) pour {source_path.name}:\n"
+        f"--- obtenu ---\n{captured.out!r}\n"
+        f"--- attendu ---\n{expected_stdout!r}\n"
+    )
+
+
+def test_vm_deep_recursion(tmp_path: Path, capfd):
+    """La profondeur de récursion Pithon ne dépend pas de la pile de Python."""
+    source = tmp_path / "deep.py"
+    source.write_text(
+        "def count(n):\n"
+        "    if n == 0:\n"
+        "        return 0\n"
+        "    return 1 + count(n - 1)\n"
+        "print(count(20000))\n",
+        encoding="utf-8",
+    )
+    run_file(source, use_vm=True)
+    assert capfd.readouterr().out == "20000\n"
+
+
+def test_vm_tail_calls_run_in_constant_space(tmp_path: Path, capfd):
+    """`return f(...)` remplace le cadre courant au lieu d'en empiler un autre."""
+    source = tmp_path / "tail.py"
+    source.write_text(
+        "def total(n, acc):\n"
+        "    if n == 0:\n"
+        "        return acc\n"
+        "    return total(n - 1, acc + n)\n"
+        "print(total(200000, 0))\n",
+        encoding="utf-8",
+    )
+    tracemalloc.start()
+    try:
+        run_file(source, use_vm=True, use_cache=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert capfd.readouterr().out == "20000100000\n"
+    assert peak < 2_000_000
+
+
+def test_vm_method_tail_calls_run_in_constant_space(tmp_path: Path, capfd):
+    """`return self.m(...)` est aussi un appel terminal, avec ses arguments liés."""
+    source = tmp_path / "tail_method.py"
+    source.write_text(
+        "class Summer:\n"
+        "    def total(self, n, acc):\n"
+        "        if n == 0:\n"
+        "            return acc\n"
+        "        return self.total(n - 1, acc + n)\n"
+        "print(Summer().total(200000, 0))\n",
+        encoding="utf-8",
+    )
+    tracemalloc.start()
+    try:
+        run_file(source, use_vm=True, use_cache=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert capfd.readouterr().out == "20000100000\n"
+    assert peak < 2_000_000